@@ -0,0 +1,66 @@
+"""CPU 작업(타임라인 분석)용 프로세스 풀.
+
+분석은 순수 파이썬/NumPy 연산이라 스레드 풀에서는 GIL 때문에 코어 하나만 쓰게 됩니다.
+여러 매치를 한꺼번에 분석할 때 모든 코어를 쓰도록 프로세스 풀에서 실행하고,
+이벤트 루프는 I/O만 처리하도록 둡니다. 풀은 기동 준비(warmup) 또는 처음 사용할 때 만들고 앱 종료 시(shutdown) 정리합니다.
+
+워커마다 NumPy와 분석 모듈을 따로 올리므로 기본 워커 수는 min(2, CPU 코어 수)입니다 (작은 인스턴스에서
+코어 수만큼 띄우면 메모리가 모자랄 수 있음). 메모리가 넉넉하면 ANALYSIS_WORKERS로 늘리고,
+ANALYSIS_WORKERS=0이면 프로세스 풀 대신 스레드 풀(asyncio.to_thread)에서 실행합니다.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+# 워커 프로세스 수 (기본: 2와 CPU 코어 수 중 작은 값)
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", min(2, os.cpu_count() or 1)))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """공용 프로세스 풀 (ANALYSIS_WORKERS=0이면 None)"""
+    global _executor
+    if ANALYSIS_WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                # 이벤트 루프/커넥션 풀 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+                _executor = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def run(fn: Callable[..., Any], *args: Any) -> Any:
+    """fn(*args)를 프로세스 풀에서 실행. fn과 인자는 pickle 가능해야 함 (모듈 최상위 함수)"""
+    executor = get_executor()
+    if executor is None:
+        return await asyncio.to_thread(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+def _warm_worker() -> int:
+    import analyzer  # noqa: F401  워커에서 분석 모듈(NumPy, 지역 격자)을 미리 임포트
+    return os.getpid()
+
+
+async def warmup() -> bool:
+    """워커 프로세스를 미리 띄워 둠 (첫 분석 요청이 프로세스 기동/임포트를 기다리지 않도록)"""
+    if get_executor() is None:
+        return True
+    await asyncio.gather(*(run(_warm_worker) for _ in range(ANALYSIS_WORKERS)))
+    return True
+
+
+def shutdown():
+    """앱 종료 시 워커 프로세스 정리"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
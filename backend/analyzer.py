@@ -1,4 +1,249 @@
 import numpy as np
+import map_zones
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# 분석 결과 형식/계산 방식을 바꾸면 올림 (캐시된 분석 결과 키에 포함)
+# v2: 지역/오브젝트/포탑 지표 추가 (macro_score 계산은 v1과 같음)
+ANALYZER_VERSION = 2
+
+N_PARTICIPANTS = 10
+
+# 드래곤 둥지 좌표 대략 (9800, 4400), 이 반경 안에 있으면 오브젝트 근처로 봄 (macro_score)
+DRAGON_POS = np.array(map_zones.OBJECTIVES["dragon"], dtype=np.float64)
+OBJECTIVE_RADIUS = map_zones.OBJECTIVE_RADIUS
+
+# 틸트 지수(데스 간격 표준 편차, 초) 분포 구간 경계. 마지막 구간은 상한 없음
+TILT_HISTOGRAM_EDGES = [0, 60, 120, 180, 240, 300, 600]
+
+# 이벤트 표의 type 코드
+EVENT_TYPES = {"CHAMPION_KILL": 1, "CHAMPION_SPECIAL_KILL": 2, "ELITE_MONSTER_KILL": 3, "BUILDING_KILL": 4}
+KILL_EVENT_CODES = (EVENT_TYPES["CHAMPION_KILL"], EVENT_TYPES["CHAMPION_SPECIAL_KILL"])
+
+
+class EventTable(NamedTuple):
+    """타임라인 이벤트를 열 단위 배열로 모은 표 (EVENT_TYPES에 있는 이벤트만, 발생 순서대로)"""
+    type: np.ndarray  # (E,) int8, EVENT_TYPES 코드
+    timestamp: np.ndarray  # (E,) int64, ms
+    killer: np.ndarray  # (E,) int16, 없으면 0
+    victim: np.ndarray  # (E,) int16, 없으면 0
+    position: np.ndarray  # (E, 2) float64, 없으면 NaN
+
+
+class TimelineArrays(NamedTuple):
+    """타임라인 전체를 한 번 파싱한 열 단위 배열"""
+    timestamps: np.ndarray  # (F,) int64
+    positions: np.ndarray  # (F, 10, 2) float64, 참가자 프레임이 없으면 NaN
+    present: np.ndarray  # (F, 10) bool, 참가자 프레임 존재 여부
+    events: EventTable
+
+
+def timeline_to_arrays(timeline_data: Dict[str, Any]) -> TimelineArrays:
+    """타임라인(원본 또는 축약본)을 프레임 x 참가자 x 좌표 배열과 이벤트 표로 변환"""
+    frames = timeline_data['info']['frames']
+    participant_keys = [str(i) for i in range(1, N_PARTICIPANTS + 1)]
+    missing = (np.nan, np.nan)
+
+    # 파이썬 리스트로 한 번에 모은 뒤 배열로 변환 (원소 단위 배열 대입은 느림)
+    coords = []
+    present = []
+    event_rows = []
+    for frame in frames:
+        participant_frames = frame['participantFrames']
+        for key in participant_keys:
+            p_frame = participant_frames.get(key)
+            position = p_frame.get('position') if p_frame else None
+            present.append(bool(p_frame))
+            coords.append((position['x'], position['y']) if position else missing)
+
+        for event in frame['events']:
+            code = EVENT_TYPES.get(event.get('type'))
+            if code is None:
+                continue
+            position = event.get('position')
+            event_rows.append((
+                code, event.get('timestamp', 0), event.get('killerId') or 0, event.get('victimId') or 0,
+                position['x'] if position else np.nan, position['y'] if position else np.nan,
+            ))
+
+    n_frames = len(frames)
+    positions = np.array(coords, dtype=np.float64).reshape(n_frames, N_PARTICIPANTS, 2)
+    present = np.array(present, dtype=bool).reshape(n_frames, N_PARTICIPANTS)
+    table = np.array(event_rows, dtype=np.float64).reshape(-1, 6)
+    events = EventTable(
+        type=table[:, 0].astype(np.int8),
+        timestamp=table[:, 1].astype(np.int64),
+        killer=table[:, 2].astype(np.int16),
+        victim=table[:, 3].astype(np.int16),
+        position=table[:, 4:6],
+    )
+    timestamps = np.array([frame.get('timestamp', 0) for frame in frames], dtype=np.int64)
+    return TimelineArrays(timestamps=timestamps, positions=positions, present=present, events=events)
+
+
+def _tilt_scores(events: EventTable) -> np.ndarray:
+    """참가자별 데스 간격 표준 편차(초). 데스가 3번 미만이면 0. (11,) 배열, 인덱스 = participantId"""
+    is_death = np.isin(events.type, KILL_EVENT_CODES) & (events.victim >= 1) & (events.victim <= N_PARTICIPANTS)
+    victims = events.victim[is_death].astype(np.intp)
+    times = events.timestamp[is_death].astype(np.float64)
+
+    # 피해자별로 묶되 같은 피해자 안에서는 발생 순서 유지
+    order = np.argsort(victims, kind="stable")
+    victims, times = victims[order], times[order]
+    same_victim = victims[1:] == victims[:-1]
+    intervals = np.diff(times)[same_victim]
+    interval_owner = victims[1:][same_victim]
+
+    n_deaths = np.bincount(victims, minlength=N_PARTICIPANTS + 1)
+    n_intervals = np.bincount(interval_owner, minlength=N_PARTICIPANTS + 1)
+    safe_n = np.maximum(n_intervals, 1)
+    mean = np.bincount(interval_owner, weights=intervals, minlength=N_PARTICIPANTS + 1) / safe_n
+    variance = np.bincount(interval_owner, weights=(intervals - mean[interval_owner]) ** 2,
+                           minlength=N_PARTICIPANTS + 1) / safe_n
+    return np.where(n_deaths > 2, np.sqrt(variance) / 1000, 0.0)  # 초 단위 변환
+
+
+def analyze_arrays(arrays: TimelineArrays) -> Dict[str, Dict[str, Any]]:
+    """10명 전원의 지표를 한 번에 계산. {participantId(str): analyze_game과 같은 형식의 결과}
+
+    위치는 map_zones의 격자로 (프레임 x 참가자) 전체를 한 번에 지역/오브젝트/포탑으로 분류합니다.
+    """
+    n_frames = len(arrays.timestamps)
+    zones = map_zones.zone_ids(arrays.positions)  # (F, 10)
+    objectives = map_zones.objective_ids(arrays.positions)
+    towers = map_zones.tower_ids(arrays.positions)
+
+    # 1. 매크로 분석 (드래곤 둥지 근처 체류 프레임 비율, 격자가 아니라 거리로 계산해 이전 점수와 같음), (F, 10)
+    offsets = arrays.positions - DRAGON_POS
+    with np.errstate(invalid="ignore"):
+        near_objective = np.einsum("fpc,fpc->fp", offsets, offsets) < OBJECTIVE_RADIUS ** 2
+    at_objective = near_objective.sum(axis=0)
+
+    # 에픽 오브젝트별 관여 프레임 수
+    baron_pit = objectives == map_zones.OBJECTIVE_IDS["baron"]
+    before_baron = (arrays.timestamps < map_zones.BARON_SPAWN_MS)[:, None]
+    objective_frames = {
+        "dragon": (objectives == map_zones.OBJECTIVE_IDS["dragon"]).sum(axis=0),
+        "herald": (baron_pit & before_baron).sum(axis=0),  # 20분 전 바론 둥지 = 전령/공허 유충
+        "baron": (baron_pit & ~before_baron).sum(axis=0),
+    }
+
+    # 지역별 체류 프레임 수 (10, 지역 수)와 지역 이동(로테이션) 횟수
+    zone_frames = (zones[..., None] == np.arange(len(map_zones.ZONE_NAMES))).sum(axis=0)
+    known = zones >= 0
+    rotations = ((zones[1:] != zones[:-1]) & known[1:] & known[:-1]).sum(axis=0)
+
+    # 상대 포탑 사거리 안에 있었던 프레임 수 (1~5번 파랑 팀, 6~10번 빨강 팀)
+    teams = np.where(np.arange(1, N_PARTICIPANTS + 1) <= 5, 100, 200)
+    tower_teams = map_zones.TOWER_TEAMS[towers]
+    enemy_tower = ((towers > 0) & (tower_teams != teams[None, :])).sum(axis=0)
+
+    # 2. 멘탈 분석 (데스 간격 표준 편차)
+    tilt = _tilt_scores(arrays.events)
+
+    # 3. 시각화용 샘플 데이터 (참가자별 앞 20개 위치)
+    has_position = arrays.present & ~np.isnan(arrays.positions[..., 0])
+    sample_coords = np.nan_to_num(arrays.positions).astype(np.int64).tolist()
+
+    def share(frames) -> float:
+        return round(frames / n_frames * 100, 1) if n_frames else 0.0
+
+    zone_frames_list = zone_frames.tolist()
+    objective_lists = {name: frames.tolist() for name, frames in objective_frames.items()}
+    results = {}
+    for p, (near_frames, tilt_index) in enumerate(zip(at_objective.tolist(), tilt[1:].tolist())):
+        rows = np.flatnonzero(has_position[:, p])[:20].tolist()
+        results[str(p + 1)] = {
+            "macro_score": (near_frames / n_frames) * 100 if n_frames else 0,
+            "tilt_index": tilt_index if tilt_index else 0,
+            "positions": [{"x": sample_coords[f][p][0], "y": sample_coords[f][p][1]} for f in rows],
+            # 지역별 체류 비율(%), 오브젝트별 관여 비율(%), 지역 이동 횟수, 상대 포탑 사거리 체류 비율(%)
+            "zones": {name: share(frames) for name, frames in zip(map_zones.ZONE_NAMES, zone_frames_list[p]) if frames},
+            "objective_presence": {name: share(frames[p]) for name, frames in objective_lists.items()},
+            "rotations": int(rotations[p]),
+            "enemy_tower_presence": share(int(enemy_tower[p])),
+        }
+    return results
+
+
+def analyze_all(timeline_data) -> Dict[str, Dict[str, Any]]:
+    """타임라인을 한 번 파싱해 모든 참가자를 분석. 데이터가 없으면 빈 dict"""
+    if not timeline_data or 'info' not in timeline_data or not timeline_data['info'].get('frames'):
+        return {}
+    return analyze_arrays(timeline_to_arrays(timeline_data))
+
+
+def participant_ids_by_puuid(timeline_data) -> Dict[str, str]:
+    """타임라인의 info.participants(없으면 metadata.participants 순서)로 {puuid: participantId} 매핑"""
+    info_participants = timeline_data.get('info', {}).get('participants') or []
+    mapping = {p['puuid']: str(p['participantId']) for p in info_participants
+               if p.get('puuid') and p.get('participantId')}
+    if not mapping:
+        metadata_participants = timeline_data.get('metadata', {}).get('participants') or []
+        mapping = {puuid: str(i + 1) for i, puuid in enumerate(metadata_participants)}
+    return mapping
+
+
+def analyze_match(timeline_data) -> Dict[str, Any]:
+    """매치 하나를 분석한 캐시용 결과. 참가자 10명을 한 번에 계산해 누가 조회하든 다시 계산하지 않음
+
+    {"version", "participants": {puuid: participantId}, "results": {participantId: analyze_game 형식}}
+    """
+    return {
+        "version": ANALYZER_VERSION,
+        "participants": participant_ids_by_puuid(timeline_data) if timeline_data else {},
+        "results": analyze_all(timeline_data),
+    }
+
+
+def player_analysis(match_analysis: Optional[Dict[str, Any]], puuid: str) -> Dict[str, Any]:
+    """analyze_match 결과에서 puuid 플레이어의 분석 결과를 꺼냄"""
+    participant_id = (match_analysis or {}).get("participants", {}).get(puuid)
+    result = (match_analysis or {}).get("results", {}).get(participant_id) if participant_id else None
+    if result is None:
+        return {
+            "macro_score": 0,
+            "tilt_index": 0,
+            "positions": [],
+            "error": "매치에서 플레이어를 찾을 수 없음"
+        }
+    return result
+
+
+def aggregate_trends(match_results: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """여러 매치의 플레이어 분석 결과로 추세 요약
+
+    match_results는 [(matchId, player_analysis 결과)] 최신순 목록이며, 오류가 난 매치는 제외합니다.
+    매크로 점수는 오래된 매치부터의 시계열과 경기당 기울기, 틸트 지수는 분포로 요약합니다.
+    """
+    chronological = [(match_id, result) for match_id, result in reversed(match_results) if "error" not in result]
+    macro = np.array([result["macro_score"] for _, result in chronological], dtype=np.float64)
+    tilt = np.array([result["tilt_index"] for _, result in chronological], dtype=np.float64)
+    if not chronological:
+        return {"matches_analyzed": 0, "macro_score": None, "tilt_index": None}
+
+    edges = np.array(TILT_HISTOGRAM_EDGES + [np.inf], dtype=np.float64)
+    counts, _ = np.histogram(tilt, bins=edges)
+    return {
+        "matches_analyzed": len(chronological),
+        "macro_score": {
+            "series": [{"matchId": match_id, "macro_score": result["macro_score"]} for match_id, result in chronological],
+            "mean": float(macro.mean()),
+            # 경기당 변화량 (양수면 최근으로 올수록 오브젝트 근처 체류가 늘어남)
+            "slope_per_match": float(np.polyfit(np.arange(len(macro)), macro, 1)[0]) if len(macro) > 1 else 0.0,
+        },
+        "tilt_index": {
+            "mean": float(tilt.mean()),
+            "median": float(np.median(tilt)),
+            "p90": float(np.percentile(tilt, 90)),
+            "max": float(tilt.max()),
+            "histogram": [
+                {"min": TILT_HISTOGRAM_EDGES[i], "max": TILT_HISTOGRAM_EDGES[i + 1] if i + 1 < len(TILT_HISTOGRAM_EDGES) else None,
+                 "count": int(count)}
+                for i, count in enumerate(counts)
+            ],
+        },
+    }
+
 
 def analyze_game(timeline_data, participant_id="1"):
     """게임 타임라인 데이터 분석"""
@@ -11,7 +256,7 @@ def analyze_game(timeline_data, participant_id="1"):
                 "positions": [],
                 "error": "타임라인 데이터 없음"
             }
-        
+
         frames = timeline_data['info']['frames']
         if not frames:
             print("프레임 데이터가 없음")
@@ -21,46 +266,14 @@ def analyze_game(timeline_data, participant_id="1"):
                 "positions": [],
                 "error": "프레임 데이터 없음"
             }
-        
-        positions = []
-        death_timestamps = []
-
-        # 1. 데이터 파싱
-        for frame in frames:
-            p_frame = frame['participantFrames'].get(participant_id)
-            if p_frame:
-                positions.append(p_frame['position'])
-            
-            # 데스 이벤트 수집 (멘탈 분석용)
-            for event in frame['events']:
-                if event.get('type') == 'CHAMPION_SPECIAL_KILL' or event.get('type') == 'CHAMPION_KILL':
-                    if event.get('victimId') == int(participant_id):
-                        death_timestamps.append(event['timestamp'])
-
-        # 2. 매크로 분석 (예: 오브젝트 근처 체류 시간)
-        # 드래곤 둥지 좌표 대략 (9800, 4400)
-        dragon_pos = np.array([9800, 4400])
-        at_objective = 0
-        for pos in positions:
-            p = np.array([pos['x'], pos['y']])
-            if np.linalg.norm(p - dragon_pos) < 2000:
-                at_objective += 1
-
-        # 3. 멘탈 분석 (데스 간격 표준 편차)
-        tilt_score = 0
-        if len(death_timestamps) > 2:
-            intervals = np.diff(death_timestamps)
-            tilt_score = np.std(intervals) / 1000 # 초 단위 변환
-
-        result = {
-            "macro_score": (at_objective / len(frames)) * 100 if frames else 0,
-            "tilt_index": tilt_score,
-            "positions": positions[:20] # 시각화용 샘플 데이터
-        }
-        
+
+        # 타임라인을 열 단위 배열로 한 번 변환해 10명 지표를 함께 계산
+        result = analyze_arrays(timeline_to_arrays(timeline_data)).get(
+            str(participant_id), {"macro_score": 0, "tilt_index": 0, "positions": []})
+
         print(f"분석 결과: {result}")
         return result
-        
+
     except Exception as e:
         print(f"분석 중 오류 발생: {e}")
         return {
@@ -68,4 +281,4 @@ def analyze_game(timeline_data, participant_id="1"):
             "tilt_index": 0,
             "positions": [],
             "error": str(e)
-        }
\ No newline at end of file
+        }
@@ -1,154 +1,362 @@
 import asyncio
+import os
 import aiohttp
-import numpy
-import time
-from typing import List, Dict, Optional
-from cache_manager import CacheManager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
+from cache_manager import AsyncCacheManager
+import analysis_pool
+import match_index
+from analyzer import analyze_match
+from match_projection import project_match, project_timeline_stream
+from rate_limiter import Priority, RateLimitScheduler, default_scheduler, priority, region_of
+from single_flight import RedisSingleFlight
+
+# 429 응답 재시도 횟수
+MAX_RETRIES = 3
 
 class AsyncRiotAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url=None, platform_url=None, scheduler: Optional[RateLimitScheduler] = None,
+                 cache: Optional[AsyncCacheManager] = None):
         self.api_key = api_key
-        self.base_url = "https://asia.api.riotgames.com"
+        self.base_url = base_url or "https://asia.api.riotgames.com"  # account, match (대륙 라우팅)
+        self.platform_url = platform_url or "https://kr.api.riotgames.com"  # league, summoner, spectator (플랫폼 라우팅)
         self.headers = {"X-Riot-Token": self.api_key}
-        self.cache = CacheManager()
-        self.rate_limiter = asyncio.Semaphore(10)  # 동시 요청 제한
-    
-    async def get_all_match_ids_async(self, session: aiohttp.ClientSession, puuid: str, n_wins: int, n_losses: int):
-        """비동기로 모든 랭크 게임 Match ID 수집"""
-        # 캐시 확인
-        cached_ids = self.cache.get_cached_match_ids(puuid)
-        if cached_ids:
-            return cached_ids
-        
-        n_total = n_wins + n_losses
-        r = n_total // 100
-        other = n_total % 100
-        
-        tasks = []
-        
-        # 비동기 작업 생성
-        for i in range(r + 1):
-            start = i * 100
-            count = 100 if i != r else other
-            
-            if count == 0:
-                continue
-                
-            task = self._fetch_match_ids_page(session, puuid, start, count)
-            tasks.append(task)
-        
-        # 병렬 실행
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        all_games_id = []
-        for result in results:
-            if isinstance(result, list):
-                all_games_id.extend(result)
-            else:
-                print(f"매치 ID 수집 오류: {result}")
-        
-        # 캐시 저장
-        self.cache.cache_match_ids(puuid, all_games_id)
-        return all_games_id
-    
-    async def _fetch_match_ids_page(self, session: aiohttp.ClientSession, puuid: str, start: int, count: int):
-        """단일 페이지 매치 ID 비동기 조회"""
-        async with self.rate_limiter:
-            url = f"{self.base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
-            params = {"type": "", "start": start, "count": count}
-            
+        # RiotAPI와 같은 환경 변수로 설정한 비동기 캐시 (첫 사용 시 연결)
+        self.cache = cache or AsyncCacheManager.from_env()
+        self.rate_limiter = scheduler or default_scheduler  # 리전/메서드별 Rate Limit 스케줄러
+        self.flight = RedisSingleFlight(self.cache)  # 같은 캐시 키의 동시 조회를 한 번의 호출로 병합
+        # 배치 조회로 새로 가져온 매치 상세를 캐시에 되돌려 쓸지 여부
+        self.write_back = os.environ.get("MATCH_DETAIL_WRITE_BACK", "1") != "0"
+
+    async def _get_json(self, session: aiohttp.ClientSession, url: str, method: str, params: Optional[Dict] = None,
+                        reader: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None):
+        """공통 GET 요청. (상태 코드, JSON 데이터)를 반환하며 네트워크 오류 시 (None, None)
+
+        method는 Riot 엔드포인트 이름(예: match-v5.getMatch)으로, 메서드별 Rate Limit 버킷 키로 쓰입니다.
+        429 응답은 Retry-After(없으면 지수 백오프)만큼 기다린 뒤 최대 MAX_RETRIES회 재시도합니다.
+        reader를 주면 200 응답 본문을 response.json() 대신 reader(response)로 읽습니다 (스트리밍 파싱용).
+        """
+        region = region_of(url)
+        for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(region, method)
             try:
-                async with session.get(url, headers=self.headers, params=params) as response:
+                async with session.get(url, headers=self.headers, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    self.rate_limiter.update_from_headers(region, method, response.headers)
+                    if response.status == 429 and attempt < MAX_RETRIES:
+                        delay = self.rate_limiter.penalize(region, method, response.headers, attempt)
+                        print(f"Rate Limit 초과 ({method}), {delay:.1f}초 후 재시도")
+                        await asyncio.sleep(delay)
+                        continue
                     if response.status == 200:
-                        data = await response.json()
-                        await asyncio.sleep(0.05)  # Rate Limit 준수
-                        return data
-                    else:
-                        print(f"API 오류: {response.status}")
-                        return []
+                        return response.status, await (reader(response) if reader else response.json())
+                    return response.status, None
             except Exception as e:
                 print(f"요청 실패: {e}")
-                return []
+                return None, None
+        return 429, None
+
+    async def get_puuid_by_riot_id_async(self, session: aiohttp.ClientSession, game_name: str, tag_line: str) -> Optional[str]:
+        """계정명#태그로 PUUID 비동기 조회"""
+        cached_puuid = await self.cache.get_cached_puuid(game_name, tag_line)
+        if cached_puuid:
+            return cached_puuid
+
+        async def fetch():
+            url = f"{self.base_url}/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
+            status, data = await self._get_json(session, url, "account-v1.getByRiotId")
+            if status == 200 and data:
+                puuid = data['puuid']
+                await self.cache.cache_puuid(game_name, tag_line, puuid)
+                return puuid
+            return None
+
+        return await self.flight.do(self.cache.generate_key("puuid", game_name, tag_line), fetch)
+
+    async def get_league_info_async(self, session: aiohttp.ClientSession, puuid: str) -> List[Dict]:
+        """PUUID로 티어, 랭크, 승률 정보 비동기 조회"""
+        cached_league = await self.cache.get_cached_league_info(puuid)
+        if cached_league:
+            return cached_league
+
+        async def fetch():
+            url = f"{self.platform_url}/lol/league/v4/entries/by-puuid/{puuid}"
+            status, data = await self._get_json(session, url, "league-v4.getLeagueEntriesByPUUID")
+            if status == 200 and data is not None:
+                await self.cache.cache_league_info(puuid, data)
+                return data
+            return []
+
+        return await self.flight.do(self.cache.generate_key("league", puuid), fetch)
+
+    async def get_summoner_id_by_puuid_async(self, session: aiohttp.ClientSession, puuid: str) -> Optional[str]:
+        """PUUID로 Summoner ID(encryptedSummonerId) 비동기 조회 (캐시에 영구 보관)"""
+        cached_summoner_id = await self.cache.get_cached_summoner_id(puuid)
+        if cached_summoner_id:
+            return cached_summoner_id
+
+        async def fetch():
+            url = f"{self.platform_url}/lol/summoner/v4/summoners/by-puuid/{puuid}"
+            status, data = await self._get_json(session, url, "summoner-v4.getByPUUID")
+            if status == 200 and data:
+                await self.cache.cache_summoner_id(puuid, data['id'])
+                return data['id']
+            return None
+
+        return await self.flight.do(self.cache.generate_key("summoner_id", puuid), fetch)
+
+    async def get_active_game_async(self, session: aiohttp.ClientSession, encrypted_summoner_id: str,
+                                    puuid: Optional[str] = None) -> Optional[Dict]:
+        """Summoner ID로 현재 진행 중인 게임 정보 비동기 조회 (게임 중이 아니면 None)
+
+        puuid를 주면 캐시된 현재 게임 포인터를 먼저 봅니다. 같은 게임의 다른 참가자가 조회해 둔 스냅샷(gameId별)이나
+        "게임 중 아님" 결과가 있으면 spectator를 호출하지 않고, 스냅샷이 만료됐으면 참가자들의 동시 재조회를
+        gameId 하나로 모아 spectator를 한 번만 호출합니다.
+        """
+        async def fetch():
+            url = f"{self.platform_url}/lol/spectator/v5/active-games/by-summoner/{encrypted_summoner_id}"
+            status, data = await self._get_json(session, url, "spectator-v5.getCurrentGameInfoBySummoner")
+            if status == 200 and data:
+                await self.cache.cache_active_game(data)
+                await self.cache.cache_active_game_pointers(data)
+                # 참가자 전원의 Summoner ID도 캐시 (다른 참가자 조회 시 summoner-v4 호출 생략)
+                await self.cache.cache_summoner_ids({p["puuid"]: p["summonerId"] for p in data.get("participants", [])
+                                                     if p.get("puuid") and p.get("summonerId")})
+                return data
+            if status == 404 and puuid:
+                await self.cache.cache_not_in_game(puuid)
+            return None
+
+        if puuid:
+            pointer = await self.cache.get_cached_active_game_pointer(puuid)
+            if pointer is not None:
+                if pointer["game_id"] is None:
+                    return None
+                cached_game = await self.cache.get_cached_active_game(pointer["game_id"])
+                if cached_game:
+                    return cached_game
+                game = await self.flight.do(self.cache.generate_key("active_game", pointer["game_id"]), fetch)
+                # 대표로 조회한 참가자가 게임 중이 아니면(404) 게임이 끝난 것이므로 다시 조회하지 않음.
+                # 결과가 내 게임이 아닐 때만(그 사이 대표 참가자가 다른 게임을 시작) 직접 조회
+                if game is None or any(p.get("puuid") == puuid for p in game.get("participants", [])):
+                    return game
+
+        return await self.flight.do(self.cache.generate_key("active_game_by_summoner", encrypted_summoner_id), fetch)
+
+    async def get_recent_match_ids_async(self, session: aiohttp.ClientSession, puuid: str, count: int = 1) -> List[str]:
+        """PUUID로 최근 Match ID 리스트 비동기 조회"""
+        cached_ids = await self.cache.get_cached_recent_match_ids(puuid, count)
+        if cached_ids:
+            return cached_ids
+
+        async def fetch():
+            url = f"{self.base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+            status, data = await self._get_json(session, url, "match-v5.getMatchIdsByPUUID", params={"start": 0, "count": count})
+            if status == 200 and data is not None:
+                await self.cache.cache_recent_match_ids(puuid, count, data)
+                return data
+            if status == 403:
+                print("API 키 만료 또는 권한 없음")
+            elif status == 429:
+                print("Rate Limit 초과")
+            else:
+                print(f"API 오류: {status}")
+            return []
+
+        return await self.flight.do(self.cache.generate_key("recent_matches", puuid, count), fetch)
+
+    async def get_match_timeline_async(self, session: aiohttp.ClientSession, match_id: str) -> Optional[Dict]:
+        """Match ID로 타임라인 데이터(분석용 축약본) 비동기 조회"""
+        cached_timeline = await self.cache.get_cached_match_timeline(match_id)
+        if cached_timeline:
+            return cached_timeline
+
+        async def fetch():
+            url = f"{self.base_url}/lol/match/v5/matches/{match_id}/timeline"
+            # 수 MB짜리 원본을 통째로 파싱하지 않고 받는 대로 축약본 필드만 추출
+            status, timeline = await self._get_json(session, url, "match-v5.getTimeline", reader=project_timeline_stream)
+            if status == 200:
+                if timeline:
+                    await self.cache.cache_match_timeline(match_id, timeline)
+                return timeline
+            print(f"Timeline API 오류: {status}")
+            return None
+
+        return await self.flight.do(self.cache.match_timeline_key(match_id), fetch)
+
+    async def get_match_analysis_async(self, session: aiohttp.ClientSession, match_id: str) -> Optional[Dict]:
+        """매치 분석 결과(참가자 10명 전원, analyzer.analyze_match 형식) 조회
+
+        분석 결과가 캐시에 있으면 타임라인도 받지 않고, 없으면 타임라인을 받아 프로세스 풀에서 한 번 분석해 캐시합니다.
+        """
+        cached_analysis = await self.cache.get_cached_match_analysis(match_id)
+        if cached_analysis:
+            return cached_analysis
+
+        async def fetch():
+            timeline = await self.get_match_timeline_async(session, match_id)
+            if not timeline:
+                return None
+            # 분석은 CPU 작업이므로 프로세스 풀에서 실행 (여러 매치를 여러 코어에서 동시에 분석)
+            analysis = await analysis_pool.run(analyze_match, timeline)
+            await self.cache.cache_match_analysis(match_id, analysis)
+            return analysis
+
+        return await self.flight.do(self.cache.match_analysis_key(match_id), fetch)
+
+    async def get_match_detail_async(self, session: aiohttp.ClientSession, match_id: str) -> Optional[Dict]:
+        """개별 매치의 상세 정보(축약본) 비동기 조회"""
+        return await self._fetch_match_detail_async(session, match_id)
     
-    async def get_match_details_batch_async(self, session: aiohttp.ClientSession, match_ids: List[str], limit: int = 20):
-        """비동기로 매치 상세 정보 배치 처리"""
-        tasks = []
-        for i, match_id in enumerate(match_ids[:limit]):
-            task = self._fetch_match_detail_async(session, match_id)
-            tasks.append(task)
-        
-        # 병렬 실행
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        details = []
-        for result in results:
-            if isinstance(result, dict) and result:
-                info = result.get('info', {})
-                participants_data = []
-                for participant in info.get("participants", []):
-                    participants_data.append({
-                        "puuid": participant.get("puuid"),
-                        "teamId": participant.get("teamId"),
-                        "win": participant.get("win"),
-                        "championName": participant.get("championName"),
-                        "teamPosition": participant.get("teamPosition"),
-                        "summonerName": participant.get("summonerName"),
-                        "riotIdGameName": participant.get("riotIdGameName"),
-                        "riotIdTagline": participant.get("riotIdTagline"),
-                        "kills": participant.get("kills"),
-                        "deaths": participant.get("deaths"),
-                        "assists": participant.get("assists"),
-                        "challenges": participant.get("challenges", {}),
-                        "visionScore": participant.get("visionScore"),
-                        "wardsKilled": participant.get("wardsKilled"),
-                        "wardsPlaced": participant.get("wardsPlaced"),
-                        "totalMinionsKilled": participant.get("totalMinionsKilled"),
-                        "neutralMinionsKilled": participant.get("neutralMinionsKilled", 0),
-                        "totalDamageDealtToChampions": participant.get("totalDamageDealtToChampions"),
-                        "goldEarned": participant.get("goldEarned"),
-                        "summoner1Id": participant.get("summoner1Id"), # Add summoner spell 1 ID
-                        "summoner2Id": participant.get("summoner2Id"), # Add summoner spell 2 ID
-                        "item0": participant.get("item0"),
-                        "item1": participant.get("item1"),
-                        "item2": participant.get("item2"),
-                        "item3": participant.get("item3"),
-                        "item4": participant.get("item4"),
-                        "item5": participant.get("item5"),
-                        "item6": participant.get("item6"), # Trinket slot
-                    })
-
-                details.append({
-                    "matchId": result.get("metadata", {}).get("matchId"),
-                    "gameMode": info.get("gameMode"),
-                    "queueId": info.get("queueId"),
-                    "gameDuration": info.get("gameDuration"),
-                    "participants": participants_data, # Use the processed participant data
-                    "teams": info.get("teams", []) # Add teams data here
-                })
-        
-        return details
+    async def get_match_ids_async(self, session: aiohttp.ClientSession, puuid: str, start: int = 0, count: int = 20,
+                                  after: Optional[str] = None) -> Optional[Dict]:
+        """매치 ID를 최신순으로 start부터 count개 조회. {"match_ids", "start", "count", "has_more", "next_cursor"}를 반환
+
+        puuid별 매치 ID 인덱스를 캐시에 두고 마지막 동기화 이후의 새 매치만 받아오며,
+        인덱스보다 오래된 페이지를 요청할 때만 이전 매치를 이어서 받습니다.
+        after(커서: 이전 페이지의 next_cursor)를 주면 start 대신 그 매치 다음부터 조회하고,
+        커서가 인덱스에 없으면 None을 반환합니다.
+        """
+        if after is not None:
+            start = match_index.start_after(await self._match_index(session, puuid, 0, 0), after)
+            if start is None:
+                return None
+        return match_index.page_of(await self._match_index(session, puuid, start, count), start, count)
+
+    async def _match_index(self, session: aiohttp.ClientSession, puuid: str, start: int, count: int) -> Dict:
+        """start부터 count개를 덮도록 동기화된 매치 ID 인덱스"""
+        index = None
+        # 같은 소환사의 동기화가 진행 중이면 그 결과를 보고, 요청 범위가 모자라면 한 번 더 동기화
+        for _ in range(2):
+            index = await self.cache.get_cached_match_index(puuid)
+            if index is not None and not match_index.needs_sync(index) and not match_index.needs_older(index, start, count):
+                break
+
+            async def fetch():
+                return await self._sync_match_index(session, puuid, start, count)
+
+            index = await self.flight.do(self.cache.generate_key("match_index_sync", puuid), fetch)
+            if not match_index.needs_older(index, start, count):
+                break
+        return index or match_index.empty_index()
+
+    async def _sync_match_index(self, session: aiohttp.ClientSession, puuid: str, start: int, count: int) -> Dict:
+        """매치 ID 인덱스에 새 매치를 앞에 붙이고, 요청 범위까지 이전 매치를 뒤에 붙여 저장"""
+        # 다른 워커가 방금 동기화했을 수 있으므로 캐시를 다시 확인
+        index = await self.cache.get_cached_match_index(puuid) or match_index.empty_index()
+        original = index
+
+        if match_index.needs_sync(index):
+            new_ids: List[str] = []
+            for page in range(match_index.MAX_SYNC_PAGES):
+                data = await self._fetch_match_ids_page(session, puuid, match_index.newer_page_params(index, page))
+                if data is None:
+                    break
+                fresh, more = match_index.take_newer(index, data)
+                new_ids.extend(fresh)
+                if not more:
+                    index = match_index.merge_newer(index, new_ids)
+                    break
+            else:
+                index = match_index.merge_newer(index, new_ids, connected=False)
+
+        # 이전 매치 페이지는 과거 기록 조회 우선순위로 (새 매치 확인보다 뒤)
+        with priority(Priority.BACKFILL):
+            while match_index.needs_older(index, start, count):
+                data = await self._fetch_match_ids_page(session, puuid, match_index.older_page_params(index))
+                if data is None:
+                    break
+                older = match_index.merge_older(index, data)
+                if len(older["ids"]) == len(index["ids"]) and not older["complete"]:
+                    break
+                index = older
+
+        if index is not original:
+            await self.cache.cache_match_index(puuid, index)
+        return index
+    
+    async def _fetch_match_ids_page(self, session: aiohttp.ClientSession, puuid: str, params: Dict) -> Optional[List[str]]:
+        """단일 페이지 매치 ID 비동기 조회 (실패 시 None)"""
+        url = f"{self.base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        status, data = await self._get_json(session, url, "match-v5.getMatchIdsByPUUID", params=params)
+        if status == 200 and data is not None:
+            return data
+        print(f"API 오류: {status}")
+        return None
+    
+    async def get_match_details_batch_async(self, session: aiohttp.ClientSession, match_ids: List[str], limit: int = 20,
+                                            write_back: Optional[bool] = None):
+        """비동기로 매치 상세 정보 배치 처리
+
+        캐시 적중분은 한 번의 왕복(MGET)으로 모두 가져오고, 나머지만 Riot API에 병렬로 요청합니다.
+        write_back이면(기본값: self.write_back) 새로 가져온 매치를 파이프라인 한 번으로 캐시에 저장합니다.
+        """
+        found = {}
+        async for index, detail in self.iter_match_details_async(session, match_ids, limit, write_back):
+            found[index] = detail
+        # 요청한 순서(최신순) 유지
+        return [found[index] for index in sorted(found)]
+
+    async def iter_match_details_async(self, session: aiohttp.ClientSession, match_ids: List[str], limit: int = 20,
+                                       write_back: Optional[bool] = None) -> AsyncIterator[Tuple[int, Dict]]:
+        """매치 상세(축약본)를 준비되는 대로 (요청 순서의 index, 상세)로 내보냄
+
+        캐시 적중분을 먼저(MGET 한 번) 내보내고, 나머지는 Riot API에 병렬로 요청해 도착하는 순서대로 내보냅니다.
+        가져오지 못한 매치는 건너뛰며, 새로 가져온 매치는 끝날 때 파이프라인 한 번으로 캐시에 저장합니다.
+        """
+        match_ids = match_ids[:limit]
+        if write_back is None:
+            write_back = self.write_back
+
+        # 캐시 일괄 조회 (축약본)
+        cached = await self.cache.get_cached_match_details(match_ids)
+        misses = [(index, match_id) for index, match_id in enumerate(match_ids) if match_id not in cached]
+
+        async def fetch(index: int, match_id: str):
+            try:
+                return index, match_id, await self._fetch_match_detail_async(session, match_id, use_cache=False)
+            except Exception:
+                return index, match_id, None
+
+        # 병렬 실행 (캐시 미스만). 한 응답의 다건 조회이므로 단건 조회보다 뒤에 보냄 (Task가 우선순위를 이어받음)
+        with priority(Priority.FANOUT):
+            tasks = [asyncio.ensure_future(fetch(index, match_id)) for index, match_id in misses]
+        fetched: Dict[str, Dict] = {}
+        try:
+            for index, match_id in enumerate(match_ids):
+                if match_id in cached:
+                    yield index, cached[match_id]
+            for next_done in asyncio.as_completed(tasks):
+                index, match_id, detail = await next_done
+                if detail:
+                    fetched[match_id] = detail
+                    yield index, detail
+        finally:
+            # 소비자가 중간에 멈추면(클라이언트 연결 끊김 등) 남은 요청 취소
+            for task in tasks:
+                task.cancel()
+            if write_back and fetched:
+                await self.cache.cache_match_details(fetched)
     
-    async def _fetch_match_detail_async(self, session: aiohttp.ClientSession, match_id: str):
-        """개별 매치 상세 정보 비동기 조회"""
+    async def _fetch_match_detail_async(self, session: aiohttp.ClientSession, match_id: str, use_cache: bool = True):
+        """개별 매치 상세 정보 비동기 조회 (축약본으로 변환해 캐시)
+
+        use_cache=False이면 캐시 조회/저장을 호출자(배치 처리)가 일괄로 하도록 건너뜁니다.
+        """
         # 캐시 확인
-        cached_detail = self.cache.get_cached_match_detail(match_id)
-        if cached_detail:
-            return cached_detail
+        if use_cache:
+            cached_detail = await self.cache.get_cached_match_detail(match_id)
+            if cached_detail:
+                return cached_detail
         
-        async with self.rate_limiter:
+        async def fetch():
             url = f"{self.base_url}/lol/match/v5/matches/{match_id}"
-            
-            try:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # 캐시 저장
-                        self.cache.cache_match_detail(match_id, data)
-                        await asyncio.sleep(0.05)  # Rate Limit 준수
-                        return data
-                    else:
-                        print(f"매치 상세 정보 오류: {response.status}")
-                        return None
-            except Exception as e:
-                print(f"매치 상세 정보 요청 실패: {e}")
-                return None
+            status, data = await self._get_json(session, url, "match-v5.getMatch")
+            if status == 200 and data:
+                detail = project_match(data)
+                # 캐시 저장
+                if use_cache:
+                    await self.cache.cache_match_detail(match_id, detail)
+                return detail
+            print(f"매치 상세 정보 오류: {status}")
+            return None
+
+        return await self.flight.do(self.cache.match_detail_key(match_id), fetch)
@@ -0,0 +1,128 @@
+"""캐시 값 직렬화/압축 코덱.
+
+Redis에 저장하는 값의 형식:
+    [헤더 1바이트][본문]
+헤더는 0xC0 | (압축 방식 << 2) | 직렬화 방식 으로, 0x80 이상이므로 JSON 텍스트의 첫 글자와
+겹치지 않습니다. 따라서 헤더가 없는 값은 이전 버전이 저장한 JSON 문자열로 보고 그대로 읽습니다.
+
+직렬화: JSON(orjson, 없으면 표준 json) 또는 msgpack
+압축: 본문이 임계값보다 클 때만 zstd(없으면 zlib) 적용
+msgpack/orjson/zstandard는 선택 의존성이며, 설치되어 있지 않으면 표준 라이브러리로 대체합니다.
+"""
+import json
+import os
+import zlib
+from typing import Any, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+HEADER_MAGIC = 0xC0
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+SERIALIZERS = {"json": SERIALIZER_JSON, "msgpack": SERIALIZER_MSGPACK}
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSIONS = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+# 이보다 작은 값은 압축해도 이득이 거의 없으므로 그대로 저장
+DEFAULT_COMPRESS_THRESHOLD = 1024
+
+
+def _default_serializer() -> str:
+    # orjson이 있으면 JSON이 가장 빠르고(scripts/bench_cache_codec.py), 없으면 msgpack이 표준 json보다 빠름
+    if orjson is not None or msgpack is None:
+        return "json"
+    return "msgpack"
+
+
+def _default_compression() -> str:
+    return "zstd" if zstandard is not None else "zlib"
+
+
+class CacheCodec:
+    def __init__(self, serializer: str = "", compression: str = "", compress_threshold: int = -1, level: int = 3):
+        serializer = serializer or os.environ.get("CACHE_SERIALIZER") or _default_serializer()
+        compression = compression or os.environ.get("CACHE_COMPRESSION") or _default_compression()
+        if serializer == "msgpack" and msgpack is None:
+            serializer = "json"
+        if compression == "zstd" and zstandard is None:
+            compression = "zlib"
+        self.serializer = SERIALIZERS[serializer]
+        self.compression = COMPRESSIONS[compression]
+        self.compress_threshold = (compress_threshold if compress_threshold >= 0
+                                   else int(os.environ.get("CACHE_COMPRESS_THRESHOLD", DEFAULT_COMPRESS_THRESHOLD)))
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level) if zstandard is not None else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    # 직렬화
+    def serialize(self, value: Any) -> bytes:
+        if self.serializer == SERIALIZER_MSGPACK:
+            return msgpack.packb(value, default=str, use_bin_type=True)
+        if orjson is not None:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, default=str).encode("utf-8")
+
+    @staticmethod
+    def deserialize(serializer: int, body: bytes) -> Any:
+        if serializer == SERIALIZER_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack 형식의 캐시 값이지만 msgpack이 설치되어 있지 않습니다.")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+
+    # 압축
+    def _compress(self, body: bytes) -> Tuple[int, bytes]:
+        if len(body) < self.compress_threshold or self.compression == COMPRESSION_NONE:
+            return COMPRESSION_NONE, body
+        if self.compression == COMPRESSION_ZSTD and self._zstd_compressor is not None:
+            return COMPRESSION_ZSTD, self._zstd_compressor.compress(body)
+        return COMPRESSION_ZLIB, zlib.compress(body, min(self.level * 2, 9))
+
+    def _decompress(self, compression: int, body: bytes) -> bytes:
+        if compression == COMPRESSION_NONE:
+            return body
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(body)
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("zstd로 압축된 캐시 값이지만 zstandard가 설치되어 있지 않습니다.")
+            return self._zstd_decompressor.decompress(body)
+        raise ValueError(f"알 수 없는 압축 방식: {compression}")
+
+    def frame(self, body: bytes) -> bytes:
+        """직렬화된 본문에 (필요하면) 압축을 적용하고 헤더를 붙임"""
+        compression, payload = self._compress(body)
+        return bytes((HEADER_MAGIC | (compression << 2) | self.serializer,)) + payload
+
+    def encode(self, value: Any) -> bytes:
+        return self.frame(self.serialize(value))
+
+    def decode_with_size(self, data: Union[bytes, bytearray, str]) -> Tuple[Any, int]:
+        """(값, 압축 해제된 본문 크기)를 반환. 헤더가 없으면 이전 JSON 형식으로 읽음"""
+        if isinstance(data, str):
+            return json.loads(data), len(data)
+        if not data or data[0] & 0xF0 != HEADER_MAGIC:
+            return json.loads(data), len(data)
+        header = data[0]
+        body = self._decompress((header >> 2) & 0x03, bytes(data[1:]))
+        return self.deserialize(header & 0x03, body), len(body)
+
+    def decode(self, data: Union[bytes, bytearray, str]) -> Any:
+        return self.decode_with_size(data)[0]
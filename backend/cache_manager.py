@@ -1,65 +1,387 @@
 try:
     import redis
+    import redis.asyncio as aioredis
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 except ImportError:
     redis = None
-import json
-from typing import Optional, List, Dict, Any
+    aioredis = None  # type: ignore[assignment]
+    RedisConnectionError = RedisTimeoutError = OSError  # type: ignore[misc, assignment]
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
 import os # os 임포트 추가
+from cache_codec import CacheCodec
+from analyzer import ANALYZER_VERSION
+from match_projection import MATCH_PROJECTION_VERSION, TIMELINE_PROJECTION_VERSION
 
 # Redis 연결 실패 메시지는 프로세스당 한 번만 출력
 _redis_connection_failed_logged = False
 
+# 자신이 건 락일 때만 삭제 (다른 워커가 TTL 만료 후 다시 건 락을 지우지 않도록)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 인메모리 캐시 최대 크기 (저장된 바이트: Redis에 쓰는 것과 같은 인코딩된 값). 512MB 인스턴스 기준 기본 32MB
+LOCAL_CACHE_MAX_BYTES = int(os.environ.get("LOCAL_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+_MISSING = object()
+
+# Redis 클라이언트 설정: (비동기) 연결 풀 크기, 연결/명령 타임아웃(초), 연결 실패 후 재시도 간격(초)
+REDIS_POOL_MAX_CONNECTIONS = int(os.environ.get("REDIS_POOL_MAX_CONNECTIONS", 50))
+REDIS_CONNECT_TIMEOUT = float(os.environ.get("REDIS_CONNECT_TIMEOUT", 1.0))
+REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 2.0))
+REDIS_RETRY_INTERVAL = 30.0
+
+# spectator 캐시: 현재 게임 스냅샷/참가자 포인터, "게임 중 아님" 결과, puuid -> Summoner ID (사실상 바뀌지 않음)
+ACTIVE_GAME_TTL = int(os.environ.get("ACTIVE_GAME_TTL", 30))
+NOT_IN_GAME_TTL = int(os.environ.get("NOT_IN_GAME_TTL", 15))
+ACTIVE_GAME_POINTER_TTL = 3600  # 게임 한 판보다 길게
+SUMMONER_ID_TTL = 365 * 86400
+
+
+def redis_settings_from_env() -> Dict[str, Any]:
+    """REDIS_URL이 있으면 {'url': ...}, 없으면 REDIS_HOST/PORT/DB/PASSWORD로 연결 인자를 만듦"""
+    redis_url = os.environ.get("REDIS_URL")
+    if redis_url:
+        return {"url": redis_url}
+    return {
+        "host": os.environ.get("REDIS_HOST", "localhost"),
+        "port": int(os.environ.get("REDIS_PORT", 6379)),
+        "db": int(os.environ.get("REDIS_DB", 0)),
+        "password": os.environ.get("REDIS_PASSWORD", None),
+    }
+
+
+class LocalCache:
+    """Redis 앞단의 프로세스 내 LRU + TTL 캐시.
+
+    값은 Redis에 쓰는 것과 같은 인코딩된 바이트(헤더 + 직렬화/압축 본문)로 보관하고 CacheManager가 적중할 때마다
+    디코딩합니다. 그래서 용량 제한(항목 수가 아니라 저장된 바이트 합계)이 실제로 차지하는 메모리와 맞고,
+    호출자가 반환값을 수정해도 캐시에는 영향이 없습니다. 만료 시각은 Redis 키의 남은 TTL을 그대로 따릅니다.
+    """
+
+    def __init__(self, max_bytes: int = LOCAL_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()  # key -> (인코딩된 값, 만료 시각)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        """인코딩된 값을 반환하고, 없거나 만료되었으면 _MISSING을 반환"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, payload: bytes, ttl: float):
+        # 한 항목이 전체 용량의 1/4을 넘으면 다른 항목을 다 밀어내므로 저장하지 않음
+        if ttl <= 0 or len(payload) > self.max_bytes // 4:
+            self.delete(key)
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic() + ttl)
+            self.current_bytes += len(payload)
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        payload, _ = self._entries.pop(key)
+        self.current_bytes -= len(payload)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# 같은 프로세스의 CacheManager들이 하나의 인메모리 캐시를 공유
+default_local_cache = LocalCache()
+
+
 class CacheManager:
-    def __init__(self, host='localhost', port=6379, db=0, password=None, url=None): # url 인자 추가
+    """인메모리 LRU + Redis 2계층 캐시 (동기, redis-py).
+
+    생성 시에는 연결하지 않고 첫 명령에서 연결합니다(기동 시 Redis 왕복 없음). 연결에 실패하면
+    REDIS_RETRY_INTERVAL 동안 인메모리 캐시만 사용한 뒤 다시 시도합니다. 앱 기동 준비 단계에서
+    미리 연결해 두려면 ping()을 호출합니다.
+    """
+
+    def __init__(self, host='localhost', port=6379, db=0, password=None, url=None, local_cache: Optional[LocalCache] = None,
+                 codec: Optional[CacheCodec] = None): # url 인자 추가
         global _redis_connection_failed_logged
+        self.local_cache = local_cache or default_local_cache
+        self.codec = codec or CacheCodec()  # 값은 헤더 바이트가 붙은 바이너리(msgpack/zstd 등)로 저장
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._unavailable_until = 0.0
         if redis is None:
             if not _redis_connection_failed_logged:
-                print("Redis 모듈이 설치되지 않았습니다. 캐시를 사용하지 않습니다.")
+                print("Redis 모듈이 설치되지 않았습니다. 인메모리 캐시만 사용합니다.")
                 _redis_connection_failed_logged = True
             self.redis_client = None
             return
-            
-        try:
-            if url: # URL이 제공되면 from_url 사용
-                self.redis_client = redis.from_url(url, decode_responses=True)
-            else: # URL이 없으면 개별 인자 사용
-                self.redis_client = redis.Redis(host=host, port=port, db=db, password=password, decode_responses=True)
-            self.redis_client.ping()
-            print("Redis 연결 성공")
-        except Exception as e:
+
+        options = {
+            "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+            "decode_responses": False,
+        }
+        if url: # URL이 제공되면 from_url 사용
+            self.redis_client = redis.from_url(url, **options)
+        else: # URL이 없으면 개별 인자 사용
+            self.redis_client = redis.Redis(host=host, port=port, db=db, password=password, **options)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "CacheManager":
+        """환경 변수(REDIS_URL 또는 REDIS_HOST 등)로 설정한 캐시 매니저"""
+        return cls(**redis_settings_from_env(), **kwargs)
+
+    def is_available(self) -> bool:
+        return self.redis_client is not None and time.monotonic() >= self._unavailable_until
+
+    def _on_error(self, action: str, e: Exception):
+        """연결 오류면 잠시 Redis를 건너뛰고, 그 밖의 오류는 로그만 남김"""
+        global _redis_connection_failed_logged
+        if isinstance(e, (RedisConnectionError, RedisTimeoutError, OSError)):
+            self._unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL
             if not _redis_connection_failed_logged:
-                print("Redis에 연결할 수 없습니다 (Redis 서버가 실행 중이 아닐 수 있습니다). 캐시 없이 실행합니다.")
+                print("Redis에 연결할 수 없습니다 (Redis 서버가 실행 중이 아닐 수 있습니다). 인메모리 캐시만 사용합니다.")
                 _redis_connection_failed_logged = True
-            self.redis_client = None
-    
-    def is_available(self) -> bool:
-        return self.redis_client is not None
+            return
+        print(f"{action} 실패: {e}")
+
+    def ping(self) -> bool:
+        """Redis 연결 확인 (기동 준비/readiness용). 실패하면 재시도 간격 동안 인메모리만 사용"""
+        client = self.redis_client
+        if client is None:
+            return False
+        try:
+            client.ping()
+            self._unavailable_until = 0.0
+            return True
+        except Exception as e:
+            self._on_error("Redis 연결 확인", e)
+            return False
     
+    def _store_local(self, key: str, value: Any, ttl: int) -> Optional[bytes]:
+        """인코딩해 인메모리 캐시에 저장하고, Redis에 쓸 같은 바이트를 반환 (실패 시 None)"""
+        try:
+            payload = self.codec.encode(value)
+        except Exception as e:
+            print(f"캐시 직렬화 실패: {e}")
+            return None
+        self.local_cache.set(key, payload, ttl)
+        return payload
+
+    def _get_local(self, key: str) -> Any:
+        """인메모리 캐시의 값을 디코딩해 반환 (없으면 _MISSING)"""
+        payload = self.local_cache.get(key)
+        return payload if payload is _MISSING else self.codec.decode(payload)
+
+    def _load_remote(self, key: str, cached_value: Any, pttl: Optional[int]) -> Any:
+        """Redis에서 읽은 값을 복원하고 남은 TTL만큼 인메모리에 채움 (없으면 None)"""
+        if cached_value is None or not isinstance(cached_value, (str, bytes, bytearray)):
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        value = self.codec.decode(cached_value)
+        if pttl and pttl > 0:
+            payload = cached_value.encode("utf-8") if isinstance(cached_value, str) else bytes(cached_value)
+            self.local_cache.set(key, payload, pttl / 1000)
+        return value
+
+    def _split_local(self, keys: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """(인메모리 적중 {키: 값}, 인메모리에 없는 키 목록)"""
+        found: Dict[str, Any] = {}
+        missing = []
+        for key in keys:
+            value = self._get_local(key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        return found, missing
+
     def set_cache(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """인메모리 캐시와 Redis에 함께 저장 (Redis가 없으면 인메모리에만 저장)"""
+        payload = self._store_local(key, value, ttl)
+        if payload is None:
+            return False
+
         client = self.redis_client
         if not self.is_available() or client is None:
-            return False
+            return True
         try:
-            serialized_value = json.dumps(value, default=str)
-            client.setex(key, ttl, serialized_value)
+            client.setex(key, ttl, payload)
             return True
         except Exception as e:
-            print(f"캐시 저장 실패: {e}")
+            self._on_error("캐시 저장", e)
             return False
     
     def get_cache(self, key: str) -> Optional[Any]:
+        """인메모리 캐시를 먼저 보고, 없으면 Redis에서 읽어 남은 TTL만큼 인메모리에 채움"""
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+
         client = self.redis_client
         if not self.is_available() or client is None:
             return None
         try:
-            cached_value = client.get(key)
-            if cached_value is not None and isinstance(cached_value, (str, bytes, bytearray)):
-                return json.loads(cached_value)
-            return None
+            # 값과 남은 TTL을 한 번의 왕복으로 조회
+            pipe = client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            cached_value, pttl = pipe.execute()
+            return self._load_remote(key, cached_value, pttl)
         except Exception as e:
-            print(f"캐시 조회 실패: {e}")
+            self._on_error("캐시 조회", e)
             return None
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회해 {키: 값}(적중한 키만)을 반환.
+
+        인메모리 캐시에 없는 키만 Redis에 MGET + PTTL 파이프라인 한 번으로 요청합니다.
+        """
+        found, missing = self._split_local(keys)
+        client = self.redis_client
+        if not missing or not self.is_available() or client is None:
+            return found
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.mget(missing)
+            for key in missing:
+                pipe.pttl(key)
+            cached_values, *pttls = pipe.execute()
+            for key, cached_value, pttl in zip(missing, cached_values, pttls):
+                value = self._load_remote(key, cached_value, pttl)
+                if value is not None:
+                    found[key] = value
+        except Exception as e:
+            self._on_error("캐시 일괄 조회", e)
+        return found
+
+    def set_many(self, items: Dict[str, Any], ttl: int = 3600) -> bool:
+        """여러 값을 한 번에 저장 (Redis에는 SETEX 파이프라인 한 번으로 기록)"""
+        framed = {}
+        for key, value in items.items():
+            payload = self._store_local(key, value, ttl)
+            if payload is not None:
+                framed[key] = payload
+
+        client = self.redis_client
+        if not framed or not self.is_available() or client is None:
+            return True
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, payload in framed.items():
+                pipe.setex(key, ttl, payload)
+            pipe.execute()
+            return True
+        except Exception as e:
+            self._on_error("캐시 일괄 저장", e)
+            return False
+
+    def delete_cache(self, key: str) -> bool:
+        """두 계층에서 모두 삭제 (무효화)"""
+        self.local_cache.delete(key)
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return True
+        try:
+            client.delete(key)
+            return True
+        except Exception as e:
+            self._on_error("캐시 삭제", e)
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """계층별 적중/실패 통계"""
+        return {
+            "local": self.local_cache.stats(),
+            "redis": {"available": self.is_available(), "hits": self.redis_hits, "misses": self.redis_misses},
+        }
     
+    def acquire_lock(self, key: str, ttl: int = 10) -> Optional[str]:
+        """분산 락 획득 (SET NX EX). 성공 시 해제용 토큰, 다른 워커가 잡고 있으면 None.
+
+        Redis를 쓸 수 없으면 항상 획득한 것으로 간주합니다.
+        """
+        client = self.redis_client
+        token = uuid.uuid4().hex
+        if not self.is_available() or client is None:
+            return token
+        try:
+            if client.set(key, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            self._on_error("락 획득", e)
+            return token
+
+    def release_lock(self, key: str, token: str) -> bool:
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return False
+        try:
+            return bool(client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+        except Exception as e:
+            self._on_error("락 해제", e)
+            return False
+
+    def is_locked(self, key: str) -> bool:
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return False
+        try:
+            return bool(client.exists(key))
+        except Exception as e:
+            self._on_error("락 확인", e)
+            return False
+
+    def lock_token(self, key: str) -> Optional[str]:
+        """락을 잡은 쪽의 토큰 (락이 없거나 Redis를 쓸 수 없으면 None)"""
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return None
+        try:
+            token = client.get(key)
+            return token.decode() if isinstance(token, bytes) else token
+        except Exception as e:
+            self._on_error("락 확인", e)
+            return None
+
     def generate_key(self, prefix: str, *args) -> str:
         return f"{prefix}:{':'.join(str(arg) for arg in args)}"
     
@@ -72,6 +394,39 @@ class CacheManager:
         key = self.generate_key("puuid", game_name, tag_line)
         return self.get_cache(key)
     
+    def cache_summoner_id(self, puuid: str, summoner_id: str):
+        """puuid -> Summoner ID(encryptedSummonerId) 캐시. API 키가 같으면 바뀌지 않으므로 사실상 영구 (1년)"""
+        return self.set_cache(self.generate_key("summoner_id", puuid), summoner_id, ttl=SUMMONER_ID_TTL)
+
+    def cache_summoner_ids(self, summoner_ids: Dict[str, str]):
+        """여러 소환사의 Summoner ID를 한 번에 캐시 ({puuid: summoner_id}, 현재 게임 참가자 등)"""
+        return self.set_many({self.generate_key("summoner_id", puuid): summoner_id for puuid, summoner_id in summoner_ids.items()},
+                             ttl=SUMMONER_ID_TTL)
+
+    def get_cached_summoner_id(self, puuid: str) -> Optional[str]:
+        return self.get_cache(self.generate_key("summoner_id", puuid))
+
+    def cache_active_game(self, game: Dict):
+        """현재 게임 스냅샷을 gameId별로 짧게 캐시 (ACTIVE_GAME_TTL). 참가자 10명이 같은 스냅샷을 씀"""
+        return self.set_cache(self.generate_key("active_game", game["gameId"]), game, ttl=ACTIVE_GAME_TTL)
+
+    def cache_active_game_pointers(self, game: Dict):
+        """참가자 전원의 포인터(puuid -> gameId)를 캐시 (ACTIVE_GAME_POINTER_TTL).
+        스냅샷보다 오래 두어, 스냅샷이 만료된 뒤 참가자들의 재조회를 gameId 하나로 모을 수 있게 함"""
+        return self.set_many({self.generate_key("active_game_of", p["puuid"]): {"game_id": game["gameId"]}
+                              for p in game.get("participants", []) if p.get("puuid")}, ttl=ACTIVE_GAME_POINTER_TTL)
+
+    def cache_not_in_game(self, puuid: str):
+        """게임 중이 아님(spectator 404)을 짧게 캐시 (NOT_IN_GAME_TTL)"""
+        return self.set_cache(self.generate_key("active_game_of", puuid), {"game_id": None}, ttl=NOT_IN_GAME_TTL)
+
+    def get_cached_active_game_pointer(self, puuid: str) -> Optional[Dict]:
+        """{"game_id": gameId 또는 None(게임 중 아님)}, 캐시에 없으면 None"""
+        return self.get_cache(self.generate_key("active_game_of", puuid))
+
+    def get_cached_active_game(self, game_id: Any) -> Optional[Dict]:
+        return self.get_cache(self.generate_key("active_game", game_id))
+
     def cache_league_info(self, puuid: str, league_data: List[Dict]):
         key = self.generate_key("league", puuid)
         return self.set_cache(key, league_data, ttl=3600)
@@ -80,12 +435,13 @@ class CacheManager:
         key = self.generate_key("league", puuid)
         return self.get_cache(key)
     
-    def cache_match_ids(self, puuid: str, match_ids: List[str]):
-        key = self.generate_key("match_ids", puuid)
-        return self.set_cache(key, match_ids, ttl=1800)
+    def cache_match_index(self, puuid: str, index: Dict):
+        """소환사별 매치 ID 인덱스 캐시 (30일). 새 매치는 증분 동기화로 앞에 붙음 (match_index.py)"""
+        key = self.generate_key("match_index", puuid)
+        return self.set_cache(key, index, ttl=30 * 86400)
     
-    def get_cached_match_ids(self, puuid: str) -> Optional[List[str]]:
-        key = self.generate_key("match_ids", puuid)
+    def get_cached_match_index(self, puuid: str) -> Optional[Dict]:
+        key = self.generate_key("match_index", puuid)
         return self.get_cache(key)
     
     def cache_recent_match_ids(self, puuid: str, count: int, match_ids: List[str]):
@@ -98,12 +454,254 @@ class CacheManager:
         key = self.generate_key("recent_matches", puuid, count)
         return self.get_cache(key)
     
+    def match_detail_key(self, match_id: str) -> str:
+        # 축약 스키마 버전이 바뀌면 이전 형식의 항목은 읽지 않음
+        return self.generate_key("match_detail", f"v{MATCH_PROJECTION_VERSION}", match_id)
+
     def cache_match_detail(self, match_id: str, match_detail: Dict):
-        """개별 매치 상세 정보 캐시 (24시간)"""
-        key = self.generate_key("match_detail", match_id)
-        return self.set_cache(key, match_detail, ttl=86400)
+        """개별 매치 상세 정보(축약본) 캐시 (24시간)"""
+        return self.set_cache(self.match_detail_key(match_id), match_detail, ttl=86400)
     
     def get_cached_match_detail(self, match_id: str) -> Optional[Dict]:
-        """캐시된 매치 상세 정보 조회"""
-        key = self.generate_key("match_detail", match_id)
-        return self.get_cache(key)
+        """캐시된 매치 상세 정보(축약본) 조회"""
+        return self.get_cache(self.match_detail_key(match_id))
+
+    def cache_match_details(self, match_details: Dict[str, Dict]):
+        """여러 매치 상세 정보(축약본)를 한 번에 캐시 ({match_id: detail})"""
+        return self.set_many({self.match_detail_key(match_id): detail for match_id, detail in match_details.items()}, ttl=86400)
+
+    def get_cached_match_details(self, match_ids: List[str]) -> Dict[str, Dict]:
+        """여러 매치 상세 정보를 한 번에 조회해 {match_id: detail}(적중한 것만) 반환"""
+        keys = {self.match_detail_key(match_id): match_id for match_id in match_ids}
+        return {keys[key]: value for key, value in self.get_many(list(keys)).items()}
+
+    def match_timeline_key(self, match_id: str) -> str:
+        return self.generate_key("timeline", f"v{TIMELINE_PROJECTION_VERSION}", match_id)
+
+    def cache_match_timeline(self, match_id: str, timeline: Dict):
+        """매치 타임라인(축약본) 캐시 (7일). 끝난 매치의 타임라인은 바뀌지 않음"""
+        return self.set_cache(self.match_timeline_key(match_id), timeline, ttl=604800)
+
+    def get_cached_match_timeline(self, match_id: str) -> Optional[Dict]:
+        """캐시된 매치 타임라인(축약본) 조회"""
+        return self.get_cache(self.match_timeline_key(match_id))
+
+    def match_analysis_key(self, match_id: str) -> str:
+        # 분석기 버전이 바뀌면 이전 결과는 읽지 않음
+        return self.generate_key("analysis", f"v{ANALYZER_VERSION}", match_id)
+
+    def cache_match_analysis(self, match_id: str, analysis: Dict):
+        """매치 분석 결과(참가자 10명 전원) 캐시 (7일)"""
+        return self.set_cache(self.match_analysis_key(match_id), analysis, ttl=604800)
+
+    def get_cached_match_analysis(self, match_id: str) -> Optional[Dict]:
+        """캐시된 매치 분석 결과 조회"""
+        return self.get_cache(self.match_analysis_key(match_id))
+
+
+# 같은 설정의 AsyncCacheManager들이 공유하는 비동기 연결 풀 (설정 -> ConnectionPool)
+_async_pools: Dict[Tuple, Any] = {}
+
+
+def _get_async_pool(host: str, port: int, db: int, password: Optional[str], url: Optional[str]):
+    settings = (url, host, port, db, password)
+    pool = _async_pools.get(settings)
+    if pool is None:
+        options = {
+            "max_connections": REDIS_POOL_MAX_CONNECTIONS,
+            "socket_connect_timeout": REDIS_CONNECT_TIMEOUT,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+            "decode_responses": False,
+        }
+        if url:
+            pool = aioredis.ConnectionPool.from_url(url, **options)
+        else:
+            pool = aioredis.ConnectionPool(host=host, port=port, db=db, password=password, **options)
+        _async_pools[settings] = pool
+    return pool
+
+
+async def close_async_pools():
+    """앱 종료 시 비동기 연결 풀의 연결을 모두 닫음"""
+    pools = list(_async_pools.values())
+    _async_pools.clear()
+    for pool in pools:
+        try:
+            await pool.disconnect()
+        except Exception as e:
+            print(f"Redis 연결 풀 종료 실패: {e}")
+
+
+class AsyncCacheManager(CacheManager):
+    """redis.asyncio 기반 비동기 캐시 매니저 (AsyncRiotAPI용).
+
+    CacheManager와 같은 메서드를 제공하지만 Redis에 접근하는 메서드는 코루틴이므로 await해야 합니다
+    (cache_puuid 등 종류별 메서드도 마찬가지). 인메모리 계층과 코덱은 동기 버전과 공유합니다.
+
+    생성 시에는 연결하지 않고 첫 명령에서 공용 연결 풀로 연결합니다. 연결에 실패하면
+    REDIS_RETRY_INTERVAL 동안 인메모리 캐시만 사용한 뒤 다시 시도합니다.
+    """
+
+    def __init__(self, host='localhost', port=6379, db=0, password=None, url=None, local_cache: Optional[LocalCache] = None,
+                 codec: Optional[CacheCodec] = None):
+        self.local_cache = local_cache or default_local_cache
+        self.codec = codec or CacheCodec()
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._unavailable_until = 0.0
+        if aioredis is None:
+            self.redis_client = None
+            return
+        self.redis_client = aioredis.Redis(connection_pool=_get_async_pool(host, port, db, password, url))
+
+    async def ping(self) -> bool:
+        """Redis 연결 확인 (기동 준비/readiness용). 실패하면 재시도 간격 동안 인메모리만 사용"""
+        client = self.redis_client
+        if client is None:
+            return False
+        try:
+            await client.ping()
+            self._unavailable_until = 0.0
+            return True
+        except Exception as e:
+            self._on_error("Redis 연결 확인", e)
+            return False
+
+    async def set_cache(self, key: str, value: Any, ttl: int = 3600) -> bool:
+        """인메모리 캐시와 Redis에 함께 저장 (Redis가 없으면 인메모리에만 저장)"""
+        payload = self._store_local(key, value, ttl)
+        if payload is None:
+            return False
+
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return True
+        try:
+            await client.setex(key, ttl, payload)
+            return True
+        except Exception as e:
+            self._on_error("캐시 저장", e)
+            return False
+
+    async def get_cache(self, key: str) -> Optional[Any]:
+        """인메모리 캐시를 먼저 보고, 없으면 Redis에서 읽어 남은 TTL만큼 인메모리에 채움"""
+        value = self._get_local(key)
+        if value is not _MISSING:
+            return value
+
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return None
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                cached_value, pttl = await pipe.execute()
+            return self._load_remote(key, cached_value, pttl)
+        except Exception as e:
+            self._on_error("캐시 조회", e)
+            return None
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회해 {키: 값}(적중한 키만)을 반환"""
+        found, missing = self._split_local(keys)
+        client = self.redis_client
+        if not missing or not self.is_available() or client is None:
+            return found
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.mget(missing)
+                for key in missing:
+                    pipe.pttl(key)
+                cached_values, *pttls = await pipe.execute()
+            for key, cached_value, pttl in zip(missing, cached_values, pttls):
+                value = self._load_remote(key, cached_value, pttl)
+                if value is not None:
+                    found[key] = value
+        except Exception as e:
+            self._on_error("캐시 일괄 조회", e)
+        return found
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = 3600) -> bool:
+        """여러 값을 한 번에 저장 (Redis에는 SETEX 파이프라인 한 번으로 기록)"""
+        framed = {}
+        for key, value in items.items():
+            payload = self._store_local(key, value, ttl)
+            if payload is not None:
+                framed[key] = payload
+
+        client = self.redis_client
+        if not framed or not self.is_available() or client is None:
+            return True
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, payload in framed.items():
+                    pipe.setex(key, ttl, payload)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            self._on_error("캐시 일괄 저장", e)
+            return False
+
+    async def delete_cache(self, key: str) -> bool:
+        """두 계층에서 모두 삭제 (무효화)"""
+        self.local_cache.delete(key)
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return True
+        try:
+            await client.delete(key)
+            return True
+        except Exception as e:
+            self._on_error("캐시 삭제", e)
+            return False
+
+    async def acquire_lock(self, key: str, ttl: int = 10) -> Optional[str]:
+        """분산 락 획득 (SET NX EX). Redis를 쓸 수 없으면 항상 획득한 것으로 간주"""
+        client = self.redis_client
+        token = uuid.uuid4().hex
+        if not self.is_available() or client is None:
+            return token
+        try:
+            if await client.set(key, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            self._on_error("락 획득", e)
+            return token
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return False
+        try:
+            return bool(await client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+        except Exception as e:
+            self._on_error("락 해제", e)
+            return False
+
+    async def is_locked(self, key: str) -> bool:
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return False
+        try:
+            return bool(await client.exists(key))
+        except Exception as e:
+            self._on_error("락 확인", e)
+            return False
+
+    async def lock_token(self, key: str) -> Optional[str]:
+        client = self.redis_client
+        if not self.is_available() or client is None:
+            return None
+        try:
+            token = await client.get(key)
+            return token.decode() if isinstance(token, bytes) else token
+        except Exception as e:
+            self._on_error("락 확인", e)
+            return None
+
+    async def get_cached_match_details(self, match_ids: List[str]) -> Dict[str, Dict]:
+        """여러 매치 상세 정보를 한 번에 조회해 {match_id: detail}(적중한 것만) 반환"""
+        keys = {self.match_detail_key(match_id): match_id for match_id in match_ids}
+        return {keys[key]: value for key, value in (await self.get_many(list(keys))).items()}
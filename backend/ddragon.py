@@ -0,0 +1,207 @@
+"""Data Dragon(챔피언/아이템/소환사 주문) 조회 표와 디스크 스냅샷.
+
+앱 시작 시 Data Dragon을 네 번 연달아 호출하는 대신, 마지막으로 받은 표를 버전별 스냅샷 파일
+(ddragon-<버전>.json)로 저장해 두고 부팅 때는 그 파일만 읽습니다. 최신 버전 확인과 갱신은
+백그라운드 작업(refresh_loop)이 주기적으로 하며, 새 표를 다 만든 뒤 current()가 돌려주는 객체를
+한 번에 바꿔 끼웁니다. 요청 처리 중에는 current()를 한 번만 읽어 같은 버전의 표를 계속 쓰면 됩니다.
+
+스냅샷이 없으면(첫 배포) 빈 표로 시작하고 기동 준비(warmup) 단계에서 받아 옵니다.
+빌드 단계에서 미리 받아 두려면 `python ddragon.py`를 실행합니다.
+"""
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+import http_pool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+DDRAGON_URL = "https://ddragon.leagueoflegends.com"
+LOCALE = "ko_KR"
+FALLBACK_VERSION = "13.24.1"
+SNAPSHOT_DIR = Path(os.environ.get("DDRAGON_SNAPSHOT_DIR", Path(__file__).resolve().parent / ".ddragon"))
+KEEP_SNAPSHOTS = 2  # 최신 버전 외에 남겨 둘 이전 스냅샷 수 포함
+REFRESH_INTERVAL = int(os.environ.get("DDRAGON_REFRESH_INTERVAL", 6 * 3600))  # 최신 버전 확인 주기 (초)
+RETRY_INTERVAL = 60  # 갱신 실패 시 재시도 간격 (초)
+REQUEST_TIMEOUT = 10
+
+
+class DDragonTables(NamedTuple):
+    """한 버전의 Data Dragon 조회 표 (교체만 하고 수정하지 않음)"""
+    version: str
+    summoner_spells: Dict[str, Dict[str, Any]]  # 주문 key(숫자 문자열) -> {"id", "name", "image": {"full"}}
+    items: Dict[str, Dict[str, Any]]  # 아이템 ID -> {"name"}
+    champions: Dict[str, Dict[str, Any]]  # 챔피언 id(영문) -> {"key", "id", "name"}
+
+
+EMPTY = DDragonTables(FALLBACK_VERSION, {}, {}, {})
+_current: DDragonTables = EMPTY
+
+
+def current() -> DDragonTables:
+    """현재 사용 중인 표. 교체는 참조 하나를 바꾸는 것이므로 받은 객체는 끝까지 같은 버전"""
+    return _current
+
+
+def build_tables(version: str, summoner_data: Dict[str, Any], item_data: Dict[str, Any],
+                 champion_data: Dict[str, Any]) -> DDragonTables:
+    """Data Dragon 원본 JSON의 "data"에서 앱이 쓰는 필드만 남겨 조회 표를 만듦"""
+    summoner_spells = {
+        info["key"]: {"id": info.get("id"), "name": info.get("name"), "image": {"full": info.get("image", {}).get("full")}}
+        for info in summoner_data.values()
+    }
+    items = {item_id: {"name": info.get("name")} for item_id, info in item_data.items()}
+    champions = {name: {"key": info["key"], "id": info["id"], "name": info.get("name")} for name, info in champion_data.items()}
+    return DDragonTables(version, summoner_spells, items, champions)
+
+
+# --- 스냅샷 파일 ---
+
+def _version_key(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split("."))
+
+
+def _snapshot_path(version: str) -> Path:
+    return SNAPSHOT_DIR / f"ddragon-{version}.json"
+
+
+def _snapshot_versions() -> List[str]:
+    """디스크에 있는 스냅샷 버전 (최신순)"""
+    if not SNAPSHOT_DIR.is_dir():
+        return []
+    versions = [path.stem[len("ddragon-"):] for path in SNAPSHOT_DIR.glob("ddragon-*.json")]
+    return sorted(versions, key=_version_key, reverse=True)
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def save_snapshot(tables: DDragonTables):
+    """표를 스냅샷 파일로 저장. 임시 파일에 쓴 뒤 rename하므로 읽는 쪽은 반쯤 쓰인 파일을 보지 않음"""
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": tables.version,
+        "summoner_spells": tables.summoner_spells,
+        "items": tables.items,
+        "champions": tables.champions,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, prefix=".ddragon-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_dumps(data))
+        os.replace(tmp_path, _snapshot_path(tables.version))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    for old_version in _snapshot_versions()[KEEP_SNAPSHOTS:]:
+        _snapshot_path(old_version).unlink(missing_ok=True)
+
+
+def read_snapshot(version: Optional[str] = None) -> Optional[DDragonTables]:
+    """version(없으면 디스크의 최신 버전) 스냅샷을 읽음. 없거나 깨졌으면 None"""
+    candidates = [version] if version else _snapshot_versions()
+    for candidate in candidates:
+        try:
+            data = _loads(_snapshot_path(candidate).read_bytes())
+            return DDragonTables(data["version"], data["summoner_spells"], data["items"], data["champions"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Data Dragon 스냅샷 읽기 실패 ({candidate}): {e}")
+    return None
+
+
+def load_snapshot() -> DDragonTables:
+    """앱 시작 시 디스크 스냅샷을 현재 표로 올림 (네트워크 호출 없음)"""
+    global _current
+    tables = read_snapshot()
+    if tables is None:
+        print("Data Dragon 스냅샷이 없습니다. 빈 표로 시작하고 기동 준비 단계에서 받아 옵니다.")
+        return _current
+    _current = tables
+    print(f"Data Dragon 스냅샷 로드 (버전: {tables.version}, 챔피언 {len(tables.champions)}개)")
+    return tables
+
+
+# --- Data Dragon 다운로드 ---
+
+def _get_json(url: str) -> Any:
+    response = http_pool.get_sync_session().get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_latest_version() -> str:
+    return _get_json(f"{DDRAGON_URL}/api/versions.json")[0]
+
+
+def fetch_tables(version: str) -> DDragonTables:
+    base_url = f"{DDRAGON_URL}/cdn/{version}/data/{LOCALE}"
+    print(f"--- Data Dragon 데이터 다운로드 (버전: {version}, Locale: {LOCALE}) ---")
+    summoner_data = _get_json(f"{base_url}/summoner.json").get("data", {})
+    item_data = _get_json(f"{base_url}/item.json").get("data", {})
+    champion_data = _get_json(f"{base_url}/champion.json").get("data", {})
+    return build_tables(version, summoner_data, item_data, champion_data)
+
+
+def refresh() -> bool:
+    """최신 버전을 확인해 새 버전이면 받아서 저장하고 현재 표를 교체. 교체했으면 True
+
+    다른 버전의 표를 완전히 만든 뒤에 교체하므로 다운로드 중에도 요청은 이전 표를 그대로 씁니다.
+    """
+    global _current
+    latest = fetch_latest_version()
+    if latest == _current.version and _current.champions:
+        return False
+    tables = read_snapshot(latest) if _snapshot_path(latest).exists() else None
+    if tables is None:
+        tables = fetch_tables(latest)
+        if not (tables.summoner_spells and tables.items and tables.champions):
+            raise ValueError(f"Data Dragon {latest} 데이터가 비어 있습니다.")
+        save_snapshot(tables)
+    _current = tables
+    print(f"Data Dragon 표 교체: {latest} (챔피언 {len(tables.champions)}개, 아이템 {len(tables.items)}개)")
+    return True
+
+
+async def warmup() -> bool:
+    """앱 기동 준비: 스냅샷을 읽고, 없으면 한 번 받아 옴. 표가 채워졌으면 True"""
+    await asyncio.to_thread(load_snapshot)
+    if not _current.champions:
+        try:
+            await asyncio.to_thread(refresh)
+        except (requests.exceptions.RequestException, ValueError, KeyError, OSError) as e:
+            print(f"Data Dragon 다운로드 실패: {e}")
+    return bool(_current.champions)
+
+
+async def refresh_loop(interval: float = REFRESH_INTERVAL):
+    """REFRESH_INTERVAL마다 최신 버전을 확인하는 백그라운드 작업 (다운로드는 스레드에서 실행)"""
+    while True:
+        try:
+            await asyncio.to_thread(refresh)
+            delay = interval
+        except (requests.exceptions.RequestException, ValueError, KeyError, OSError) as e:
+            print(f"Data Dragon 갱신 실패: {e} ({RETRY_INTERVAL}초 후 재시도)")
+            delay = RETRY_INTERVAL
+        await asyncio.sleep(delay)
+
+
+if __name__ == "__main__":
+    # 빌드 단계에서 스냅샷을 미리 받아 두는 용도
+    load_snapshot()
+    refresh()
+    print(f"스냅샷 위치: {_snapshot_path(current().version)}")
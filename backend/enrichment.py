@@ -0,0 +1,123 @@
+"""매치/현재 게임 참가자에 Data Dragon 정보(이름, 아이콘 URL)를 붙이는 enricher.
+
+Data Dragon 표가 바뀔 때마다 소환사 주문/아이템/챔피언 ID별 레코드({"id", "name", "icon"})를
+한 번만 만들어 두고, 참가자를 처리할 때는 새 dict를 만들거나 URL을 포맷하지 않고 같은 레코드를
+그대로 참조합니다. 레코드는 여러 응답이 공유하므로 호출자는 수정하지 않아야 합니다.
+"""
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import ddragon
+
+DDRAGON_CDN = f"{ddragon.DDRAGON_URL}/cdn"
+ITEM_SLOTS = 7
+
+
+class Enrichment(NamedTuple):
+    """한 Data Dragon 버전의 ID별 레코드 (교체만 하고 수정하지 않음)"""
+    version: str
+    spells: Dict[str, Dict[str, Any]]  # 주문 key(숫자 문자열) -> {"id", "name", "icon"}
+    items: Dict[int, Dict[str, Any]]  # 아이템 ID -> {"id", "name", "icon"}
+    champions: Dict[int, Dict[str, Any]]  # 챔피언 key(숫자) -> {"id"(영문), "name", "icon"}
+
+
+def build(tables: ddragon.DDragonTables) -> Enrichment:
+    base = f"{DDRAGON_CDN}/{tables.version}/img"
+    spells = {}
+    for key, info in tables.summoner_spells.items():
+        image = (info.get("image") or {}).get("full")
+        spells[key] = {"id": key, "name": info["name"], "icon": f"{base}/spell/{image}" if image else ""}
+    items = {
+        int(item_id): {"id": int(item_id), "name": info.get("name"), "icon": f"{base}/item/{item_id}.png"}
+        for item_id, info in tables.items.items() if item_id.isdigit()
+    }
+    champions = {
+        int(info["key"]): {"id": champ_id, "name": info.get("name"), "icon": f"{base}/champion/{champ_id}.png"}
+        for champ_id, info in tables.champions.items()
+    }
+    return Enrichment(tables.version, spells, items, champions)
+
+
+_cached: Optional[Tuple[ddragon.DDragonTables, Enrichment]] = None
+_lock = threading.Lock()
+
+
+def current() -> Enrichment:
+    """현재 Data Dragon 표의 레코드. 표가 교체되면 처음 호출될 때 한 번 새로 만듦"""
+    global _cached
+    tables = ddragon.current()
+    cached = _cached
+    if cached is not None and cached[0] is tables:
+        return cached[1]
+    with _lock:
+        if _cached is None or _cached[0] is not tables:
+            _cached = (tables, build(tables))
+        return _cached[1]
+
+
+def spell(enrichment: Enrichment, spell_id: Any) -> Dict[str, Any]:
+    key = str(spell_id)
+    record = enrichment.spells.get(key)
+    if record is None:
+        return {"id": key, "name": "Unknown", "icon": ""}
+    return record
+
+
+def item(enrichment: Enrichment, item_id: Optional[int]) -> Optional[Dict[str, Any]]:
+    if not item_id:  # 0은 빈 슬롯
+        return None
+    record = enrichment.items.get(item_id)
+    if record is None:
+        return {"id": item_id, "name": "Unknown Item", "icon": ""}
+    return record
+
+
+def champion_name(enrichment: Enrichment, champion_id: int) -> str:
+    """챔피언 key(숫자) -> 영문 id (밴하지 않았거나 모르면 Unknown)"""
+    record = enrichment.champions.get(champion_id)
+    return record["id"] if record else "Unknown"
+
+
+def match_participant(enrichment: Enrichment, p: Dict[str, Any]) -> Dict[str, Any]:
+    """매치 상세(축약본) 참가자 -> 매치 카드 상세 드롭다운용 참가자"""
+    return {
+        "puuid": p.get("puuid"), # 내 정보 하이라이트용
+        "teamId": p.get("teamId"),
+        "win": p.get("win"),
+        "championName": p.get("championName"),
+        "teamPosition": p.get("teamPosition"), # TOP, JUNGLE ...
+        "summonerName": f"{p.get('riotIdGameName')} #{p.get('riotIdTagline')}",
+        "kda_str": f"{p.get('kills')}/{p.get('deaths')}/{p.get('assists')}",
+        "kda_score": p.get("challenges", {}).get("kda", 0), # kda 점수
+        "visionScore": p.get("visionScore"),
+        "wards": f"{p.get('wardsKilled')}/{p.get('wardsPlaced')}",
+        "cs": p.get("totalMinionsKilled") + p.get("neutralMinionsKilled", 0), # 전체 CS
+        "damage": p.get("totalDamageDealtToChampions"),
+        "gold": p.get("goldEarned"),
+        "kills": p.get('kills'),
+        "deaths": p.get('deaths'),
+        "assists": p.get('assists'),
+        "summonerSpell1": spell(enrichment, p.get("summoner1Id")),
+        "summonerSpell2": spell(enrichment, p.get("summoner2Id")),
+        "items": [item(enrichment, p.get(f"item{slot}")) for slot in range(ITEM_SLOTS)], # 빈 슬롯은 None
+    }
+
+
+def match_teams(enrichment: Enrichment, teams: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """팀별 밴 목록에 championName 추가"""
+    return [
+        {**team, "bans": [{**ban, "championName": champion_name(enrichment, ban.get('championId', -1))}
+                          for ban in team.get('bans', [])]}
+        for team in teams
+    ]
+
+
+def active_game_participant(enrichment: Enrichment, p: Dict[str, Any]) -> Dict[str, Any]:
+    """spectator 현재 게임 참가자 -> 현재 게임 화면용 참가자"""
+    return {
+        "summonerName": p.get("summonerName"),
+        "championName": p.get("championName"),
+        "teamId": p.get("teamId"),
+        "summonerSpell1": spell(enrichment, p.get("spell1Id")),
+        "summonerSpell2": spell(enrichment, p.get("spell2Id")),
+    }
@@ -0,0 +1,74 @@
+"""요청 하나의 Riot API 호출을 의존 관계 그래프(DAG)로 실행.
+
+각 단계는 이름, 코루틴 함수, 의존 단계 이름으로 등록하고, 단계의 결과가 필요해지면(get/gather/start)
+의존 단계부터 Task로 시작합니다. 서로 의존하지 않는 단계는 동시에 실행되므로 요청 지연은 모든 호출 시간의
+합이 아니라 가장 긴 의존 경로(critical path)로 정해집니다. 단계마다 시작/소요 시간을 기록해
+Server-Timing 헤더로 내려줍니다.
+
+    graph = FetchGraph()
+    graph.stage("account", lambda: get_puuid(...))
+    graph.stage("league", lambda puuid: get_league(puuid), "account")
+    graph.stage("match_ids", lambda puuid: get_match_ids(puuid), "account")
+    graph.start("league")  # 결과가 필요해지기 전에 미리 시작 (추측 실행)
+    league, ids = await graph.gather("league", "match_ids")
+    ...
+    await graph.close()  # 쓰지 않은 추측 실행 단계 취소
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+
+class FetchGraph:
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._started = time.perf_counter()
+        self.timings: Dict[str, Tuple[float, float]] = {}  # 단계 -> (요청 시작 기준 시작 ms, 소요 ms)
+
+    def stage(self, name: str, fn: Callable[..., Awaitable[Any]], *deps: str):
+        """단계 등록. fn은 의존 단계 결과를 deps 순서대로 인자로 받음"""
+        self._stages[name] = (fn, deps)
+
+    def _task(self, name: str) -> asyncio.Task:
+        task = self._tasks.get(name)
+        if task is None:
+            task = self._tasks[name] = asyncio.ensure_future(self._run(name))
+        return task
+
+    async def _run(self, name: str) -> Any:
+        fn, deps = self._stages[name]
+        args = await asyncio.gather(*(self._task(dep) for dep in deps))
+        started = time.perf_counter()
+        try:
+            return await fn(*args)
+        finally:
+            self.timings[name] = ((started - self._started) * 1000, (time.perf_counter() - started) * 1000)
+
+    def start(self, *names: str):
+        """결과를 기다리지 않고 단계(와 의존 단계)를 시작"""
+        for name in names:
+            self._task(name)
+
+    async def get(self, name: str) -> Any:
+        # 여러 단계가 같은 Task를 기다리므로 한 대기자가 취소되어도 단계 자체는 취소되지 않게 함
+        return await asyncio.shield(self._task(name))
+
+    async def gather(self, *names: str) -> List[Any]:
+        return await asyncio.gather(*(self.get(name) for name in names))
+
+    async def close(self):
+        """끝나지 않은 단계(결과를 쓰지 않은 추측 실행 등)를 취소"""
+        pending = [task for task in self._tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (끝난 단계를 시작 순서대로, 마지막에 total)"""
+        entries = [f"{name};dur={duration:.1f}" for name, (_, duration) in sorted(self.timings.items(), key=lambda item: item[1][0])]
+        entries.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(entries)
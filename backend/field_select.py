@@ -0,0 +1,65 @@
+"""응답 필드 선택 (?fields=).
+
+fields는 쉼표로 구분한 점 경로 목록입니다. 예: "user_info,analysis,match_details.matchId,match_details.my_stats"
+경로의 마지막 키는 그 아래 전체를 포함하고, 리스트는 원소마다 같은 선택을 적용합니다.
+선택 트리는 {키: 하위 트리}이며 None은 "전체"를 뜻합니다 (fields를 주지 않으면 트리 자체가 None).
+"""
+from typing import Any, Dict, Optional
+
+Tree = Optional[Dict[str, Any]]
+
+
+def parse(spec: Optional[str]) -> Tree:
+    """fields 문자열 -> 선택 트리. 비었으면 None(전체). 빈 경로 조각이 있으면 ValueError"""
+    if spec is None or not spec.strip():
+        return None
+    tree: Dict[str, Any] = {}
+    for path in spec.split(","):
+        keys = path.strip().split(".")
+        if not all(keys):
+            raise ValueError(f"잘못된 필드 경로입니다: {path.strip()!r}")
+        node = tree
+        for key in keys[:-1]:
+            if key in node and node[key] is None:  # 상위 경로를 이미 전체 선택함
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[keys[-1]] = None
+    return tree
+
+
+def wants(tree: Tree, *path: str) -> bool:
+    """path(또는 그 일부)가 선택되었는지. 비싼 필드를 만들지 않아도 되는지 판단할 때 사용"""
+    node = tree
+    for key in path:
+        if node is None:
+            return True
+        if key not in node:
+            return False
+        node = node[key]
+    return True
+
+
+def select(value: Any, tree: Tree) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [select(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: select(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+
+def canonical(tree: Tree) -> str:
+    """같은 선택이면 같은 문자열 (응답 캐시 키용)"""
+    if tree is None:
+        return "*"
+
+    def paths(node: Dict[str, Any], prefix: str):
+        for key in sorted(node):
+            if node[key] is None:
+                yield prefix + key
+            else:
+                yield from paths(node[key], prefix + key + ".")
+
+    return ",".join(paths(tree, ""))
@@ -0,0 +1,84 @@
+"""프로세스 공용 HTTP 커넥션 풀.
+
+Riot API 호출마다 새 연결을 맺으면 TCP+TLS 핸드셰이크가 매번 반복되므로,
+동기(requests.Session)/비동기(aiohttp.ClientSession) 세션을 프로세스당 하나씩 두고
+keep-alive 연결을 재사용합니다. 비동기 세션은 앱 시작 시(startup) 만들고 종료 시(shutdown) 닫으며,
+DNS 조회 결과도 커넥터에서 캐시합니다.
+"""
+import os
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore[assignment]
+
+# 전체 동시 연결 수 / 호스트(asia, kr 등)당 동시 연결 수
+POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 100))
+POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 20))
+KEEPALIVE_TIMEOUT = 60  # 유휴 연결 유지 시간 (초)
+DNS_CACHE_TTL = 300  # DNS 캐시 유지 시간 (초)
+REQUEST_TIMEOUT = 10  # 요청 전체 타임아웃 (초)
+
+_async_session: Optional[Any] = None
+_sync_session: Optional[requests.Session] = None
+_sync_lock = threading.Lock()
+
+
+def get_sync_session() -> requests.Session:
+    """동기 클라이언트(RiotAPI, Data Dragon 로드)가 공유하는 requests 세션"""
+    global _sync_session
+    if _sync_session is None:
+        with _sync_lock:
+            if _sync_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=POOL_LIMIT_PER_HOST)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sync_session = session
+    return _sync_session
+
+
+def _create_async_session():
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT))
+
+
+def get_async_session():
+    """비동기 클라이언트(AsyncRiotAPI)가 공유하는 aiohttp 세션 (aiohttp가 없으면 None)
+
+    보통 startup()에서 미리 만들어 두지만, 스크립트처럼 앱 수명 주기 밖에서 호출되면
+    현재 이벤트 루프에서 새로 만듭니다.
+    """
+    global _async_session
+    if aiohttp is None:
+        return None
+    if _async_session is None or _async_session.closed:
+        _async_session = _create_async_session()
+    return _async_session
+
+
+async def startup():
+    """앱 시작 시 비동기 세션과 동기 세션을 미리 생성"""
+    get_async_session()
+    get_sync_session()
+
+
+async def shutdown():
+    """앱 종료 시 세션을 닫아 유휴 연결을 정리"""
+    global _async_session, _sync_session
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+    if _sync_session is not None:
+        _sync_session.close()
+        _sync_session = None
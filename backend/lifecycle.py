@@ -0,0 +1,69 @@
+"""앱 기동 준비(warmup)와 readiness 상태.
+
+모듈 임포트와 클라이언트 생성은 네트워크/Redis에 접근하지 않고, Redis 연결 확인, Data Dragon 스냅샷 로드,
+분석 워커 기동 같은 준비 작업은 lifespan에서 백그라운드로 동시에 실행합니다. 서버는 준비가 끝나기 전에도
+요청을 받으며(각 계층은 준비 전에도 fallback으로 동작), 준비 상태는 /ready에서 확인합니다.
+
+단계 결과:
+    pending  - 아직 실행 중
+    ready    - 준비 완료
+    degraded - 실패했지만 fallback으로 동작 (예: Redis 없이 인메모리 캐시만 사용)
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PENDING = "pending"
+READY = "ready"
+DEGRADED = "degraded"
+
+
+class Warmup:
+    def __init__(self):
+        self.steps: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, steps: Dict[str, Callable[[], Awaitable[bool]]]):
+        """준비 단계들을 백그라운드에서 동시에 시작 (기다리지 않음)"""
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.steps = {name: PENDING for name in steps}
+        self._tasks = [asyncio.create_task(self._run(steps))]
+
+    def add_background(self, coro: Awaitable[Any]):
+        """앱 수명 동안 돌 백그라운드 작업 등록 (stop()에서 함께 취소)"""
+        self._tasks.append(asyncio.ensure_future(coro))
+
+    async def _run(self, steps: Dict[str, Callable[[], Awaitable[bool]]]):
+        await asyncio.gather(*(self._run_step(name, step) for name, step in steps.items()))
+        self.finished_at = time.monotonic()
+        print(f"기동 준비 완료 ({self.elapsed_ms():.0f}ms): {self.steps}")
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[bool]]):
+        try:
+            ok = await step()
+        except Exception as e:
+            print(f"기동 준비 실패 ({name}): {e}")
+            ok = False
+        self.steps[name] = READY if ok else DEGRADED
+
+    def elapsed_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return ((self.finished_at or time.monotonic()) - self.started_at) * 1000
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    def report(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "steps": dict(self.steps), "warmup_ms": self.elapsed_ms()}
+
+    async def stop(self):
+        """앱 종료 시 남은 준비 작업과 백그라운드 작업을 취소"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -6,8 +6,12 @@ try:
     load_dotenv(Path(__file__).resolve().parent / ".env")
 except Exception:
     pass
-from fastapi import FastAPI
-from riot_api import RiotAPI
+from fastapi import FastAPI, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from riot_api import RiotAPI, ThreadedRiotAPI
+import analysis_pool
+import http_pool
+from cache_manager import AsyncCacheManager, close_async_pools
 try:
     from async_riot_api import AsyncRiotAPI
     import aiohttp
@@ -17,14 +21,94 @@ except ImportError:
     AsyncRiotAPI = None  # type: ignore[misc, assignment]
     aiohttp = None  # type: ignore[assignment]
     print("비동기 기능을 사용할 수 없습니다. 동기 모드로 실행합니다.")
-from analyzer import analyze_game
+from analyzer import aggregate_trends, player_analysis
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
-from typing import Any, Dict # Dict 임포트 추가
-import requests # Added for Data Dragon
-import json # Added for Data Dragon
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, Dict, List, Optional # Dict 임포트 추가
+import json
+import ddragon
+import enrichment
+import fetch_graph
+import field_select
+import lifecycle
+import prefetch
+import response_cache
+import request_context
+from rate_limiter import BackgroundScheduler, Priority, priority
 
-app = FastAPI()
+API_KEY = os.environ.get("RIOT_API_KEY", "")
+# 클라이언트는 lifespan에서 생성 (임포트 시에는 네트워크/Redis 접근 없음)
+riot_client: Optional[RiotAPI] = None
+async_riot_client: Any = None
+# prefetch 전용 클라이언트 (같은 캐시/Rate Limit 예산을 쓰되 남는 몫만 사용)
+prefetch_client: Any = None
+prefetcher: Optional[prefetch.Prefetcher] = None
+warmup = lifecycle.Warmup()
+CURSOR_EXPIRED = "페이지 커서가 만료되었습니다. 첫 페이지부터 다시 조회하세요."
+
+
+def create_clients():
+    """RIOT_API_KEY로 Riot 클라이언트 생성. 캐시 매니저는 클라이언트 하나가 만들어 공유 (연결은 첫 명령에서)"""
+    global riot_client, async_riot_client, prefetch_client, prefetcher
+    if not API_KEY:
+        return
+    if ASYNC_AVAILABLE and AsyncRiotAPI is not None:
+        async_riot_client = AsyncRiotAPI(API_KEY)
+        prefetch_client = AsyncRiotAPI(API_KEY, cache=async_riot_client.cache,
+                                       scheduler=BackgroundScheduler(async_riot_client.rate_limiter, prefetch.RESERVE))
+        # 같은 소환사를 prefetch와 사용자 요청이 동시에 받으면 한 번만 호출 (사용자가 합류하면 그 우선순위로 올라감)
+        prefetch_client.flight = async_riot_client.flight
+    else:
+        # aiohttp가 없으면 동기 클라이언트를 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+        riot_client = RiotAPI(API_KEY)
+        async_riot_client = ThreadedRiotAPI(riot_client)
+        prefetch_client = ThreadedRiotAPI(RiotAPI(API_KEY, cache=riot_client.cache,
+                                                  scheduler=BackgroundScheduler(riot_client.rate_limiter, prefetch.RESERVE)))
+    if prefetch.ENABLED:
+        prefetcher = prefetch.Prefetcher(prefetch_player, prefetch.create_store(async_riot_client.cache))
+
+
+async def warm_redis() -> bool:
+    cache = async_riot_client.cache
+    if isinstance(cache, AsyncCacheManager):
+        return await cache.ping()
+    return await asyncio.to_thread(cache.ping)
+
+
+async def warm_ddragon() -> bool:
+    # 스냅샷(없으면 다운로드)을 올린 뒤 최신 버전 확인/갱신은 주기적으로 백그라운드에서
+    ready = await ddragon.warmup()
+    enrichment.current()  # 참가자 레코드도 미리 만들어 둠
+    warmup.add_background(ddragon.refresh_loop())
+    return ready
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 프로세스 공용 HTTP 커넥션 풀 생성/정리
+    await http_pool.startup()
+    create_clients()
+    # Redis 연결 확인, Data Dragon 로드, 분석 워커 기동은 기다리지 않고 동시에 진행 (/ready에서 확인)
+    steps = {"ddragon": warm_ddragon, "analysis_pool": analysis_pool.warmup}
+    if async_riot_client is not None:
+        steps["redis"] = warm_redis
+    warmup.start(steps)
+    if prefetcher is not None:
+        # 최근 검색/추적 중인 소환사의 응답을 남는 Rate Limit 예산으로 미리 만들어 둠
+        warmup.add_background(prefetcher.run())
+    try:
+        yield
+    finally:
+        await warmup.stop()
+        await http_pool.shutdown()
+        await close_async_pools()
+        analysis_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+# Riot 호출을 요청한 클라이언트별로 공정 분배하고, 연결이 끊기면 처리 중인 요청을 취소
+app.add_middleware(request_context.RequestContextMiddleware)
 # 프론트엔드(Next.js)와 통신 허용
 app.add_middleware(
     CORSMiddleware,
@@ -35,115 +119,10 @@ app.add_middleware(
         "http://localhost:3000"  # 로컬 개발용
     ],
     allow_credentials=True,
-    allow_methods=["GET", "POST"],
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"]
 )
 
-API_KEY = os.environ.get("RIOT_API_KEY", "")
-riot_client = RiotAPI(API_KEY) if API_KEY else None
-async_riot_client: Any = None
-if API_KEY and ASYNC_AVAILABLE and AsyncRiotAPI is not None:
-    async_riot_client = AsyncRiotAPI(API_KEY)
-
-# Data Dragon global variables
-DDRAGON_VERSION: str = ""
-SUMMONER_SPELLS: Dict[str, Any] = {}
-ITEMS: Dict[str, Any] = {}
-CHAMPIONS: Dict[str, Any] = {} # Add global variable for Champions
-CHAMPION_ID_TO_NAME: Dict[int, str] = {} # Add global map for ID to Name
-
-def get_latest_ddragon_version():
-    print("--- Data Dragon 버전 확인 시작 ---")
-    try:
-        response = requests.get("https://ddragon.leagueoflegends.com/api/versions.json")
-        response.raise_for_status()
-        latest_version = response.json()[0] # Get the latest version
-        print(f"최신 Data Dragon 버전: {latest_version}")
-        return latest_version
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching Data Dragon version: {e} (Fallback to 13.24.1)")
-        return "13.24.1" # Fallback to a known version
-
-def load_ddragon_data(version: str):
-    global SUMMONER_SPELLS, ITEMS, DDRAGON_VERSION, CHAMPIONS, CHAMPION_ID_TO_NAME
-    DDRAGON_VERSION = version
-    base_url = f"https://ddragon.leagueoflegends.com/cdn/{version}/data/ko_KR" # Using Korean locale
-    print(f"--- Data Dragon 데이터 로드 시작 (버전: {version}, Locale: ko_KR) ---")
-
-    # Load Summoner Spells
-    try:
-        print(f"소환사 주문 데이터 로드 시도: {base_url}/summoner.json")
-        response = requests.get(f"{base_url}/summoner.json")
-        response.raise_for_status()
-        summoner_data = response.json().get("data", {})
-        SUMMONER_SPELLS = {spell_info['key']: spell_info for spell_id, spell_info in summoner_data.items()}
-        print(f"로드된 소환사 주문 개수: {len(SUMMONER_SPELLS)}")
-    except requests.exceptions.RequestException as e:
-        print(f"소환사 주문 로드 중 에러: {e}")
-        SUMMONER_SPELLS = {}
-    except json.JSONDecodeError as e:
-        print(f"소환사 주문 JSON 파싱 에러: {e}")
-        SUMMONER_SPELLS = {}
-    except Exception as e:
-        print(f"알 수 없는 소환사 주문 로드 에러: {e}")
-        SUMMONER_SPELLS = {}
-
-    # Load Items
-    try:
-        print(f"아이템 데이터 로드 시도: {base_url}/item.json")
-        response = requests.get(f"{base_url}/item.json")
-        response.raise_for_status()
-        item_data = response.json().get("data", {})
-        ITEMS = item_data
-        print(f"로드된 아이템 개수: {len(ITEMS)}")
-    except requests.exceptions.RequestException as e:
-        print(f"아이템 로드 중 에러: {e}")
-        ITEMS = {}
-    except json.JSONDecodeError as e:
-        print(f"아이템 JSON 파싱 에러: {e}")
-        ITEMS = {}
-    except Exception as e:
-        print(f"알 수 없는 아이템 로드 에러: {e}")
-        ITEMS = {}
-        
-    # Load Champions
-    try:
-        print(f"챔피언 데이터 로드 시도: {base_url}/champion.json")
-        response = requests.get(f"{base_url}/champion.json")
-        response.raise_for_status()
-        champion_data = response.json().get("data", {})
-        
-        CHAMPIONS = champion_data
-        
-        # Build ID to Name map
-        for champ_name, champ_info in CHAMPIONS.items(): # Changed from champ_id to champ_name to iterate correctly
-            CHAMPION_ID_TO_NAME[int(champ_info['key'])] = champ_info['id']
-        
-        print(f"로드된 챔피언 개수: {len(CHAMPIONS)}")
-    except requests.exceptions.RequestException as e:
-        print(f"챔피언 데이터 로드 중 에러: {e}")
-        CHAMPIONS = {}
-        CHAMPION_ID_TO_NAME = {}
-    except json.JSONDecodeError as e:
-        print(f"챔피언 JSON 파싱 에러: {e}")
-        CHAMPIONS = {}
-        CHAMPION_ID_TO_NAME = {}
-    except Exception as e:
-        print(f"알 수 없는 챔피언 로드 에러: {e}")
-        CHAMPIONS = {}
-        CHAMPION_ID_TO_NAME = {}
-
-def get_champion_name_by_id(champion_id: int) -> str:
-    if champion_id == -1: # Banned champion
-        return "Unknown"
-    return CHAMPION_ID_TO_NAME.get(champion_id, "Unknown")
-
-
-# Load Data Dragon data on startup
-latest_version = get_latest_ddragon_version()
-load_ddragon_data(latest_version)
-
-
 # Queue ID Mapping
 QUEUE_MAPPING = {
     400: "일반 게임",
@@ -183,9 +162,32 @@ QUEUE_MAPPING = {
 async def root():
     return {"message": "LoL AI Backend API", "docs": "/docs"}
 
+@app.get("/ready")
+async def ready():
+    """기동 준비(Redis 연결 확인, Data Dragon 로드, 분석 워커 기동) 상태. 준비 중이면 503"""
+    cache = async_riot_client.cache if async_riot_client else None
+    body = {
+        **warmup.report(),
+        "redis": cache.is_available() if cache else False,
+        "ddragon_version": ddragon.current().version,
+    }
+    return JSONResponse(body, status_code=200 if warmup.ready else 503)
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """인메모리/Redis 캐시 적중률 등 캐시 계층 통계"""
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    return async_riot_client.cache.stats()
+
 @app.get("/current-game/{full_id}")
-async def get_current_game(full_id: str):
-    if not riot_client:
+async def get_current_game(full_id: str, if_none_match: Annotated[Optional[str], Header()] = None):
+    """현재 게임 조회. Riot ID -> puuid -> Summoner ID -> 현재 게임은 앞 단계 결과가 있어야 하는 직렬 경로이며,
+    단계별 소요 시간은 Server-Timing 헤더로 내려줌.
+    Summoner ID는 영구 캐시하고, 현재 게임은 gameId별 스냅샷을 참가자 10명이 함께 쓰므로(ACTIVE_GAME_TTL)
+    게임 중에 페이지를 계속 새로고침해도 spectator 호출은 게임당 TTL마다 한 번입니다.
+    게임 중이 아님도 NOT_IN_GAME_TTL 동안 캐시합니다"""
+    if not async_riot_client:
         return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
     
     if "#" not in full_id:
@@ -193,49 +195,43 @@ async def get_current_game(full_id: str):
         
     game_name, tag_line = full_id.split("#")
     
-    puuid = riot_client.get_puuid_by_riot_id(game_name, tag_line)
-    if not puuid:
-        return {"error": "해당 Riot ID를 찾을 수 없습니다."}
-    
-    encrypted_summoner_id = riot_client._get_summoner_id_by_puuid(puuid)
-    if not encrypted_summoner_id:
-        return {"error": "소환사 ID를 찾을 수 없습니다."}
-    
-    active_game_data = riot_client.get_active_game_by_summoner_id(encrypted_summoner_id)
-    
-    if active_game_data is None:
-        return {"status": "not_in_game", "message": f"{game_name}#{tag_line}님은 현재 게임 중이 아닙니다."}
-    
-    # Process active game data for frontend display
-    processed_participants = []
-    for p in active_game_data.get("participants", []):
-        # Summoner Spells
-        summoner_spell_1_id = str(p.get("spell1Id"))
-        summoner_spell_2_id = str(p.get("spell2Id"))
+    session = http_pool.get_async_session()
+    graph = fetch_graph.FetchGraph()
+    graph.stage("account", lambda: async_riot_client.get_puuid_by_riot_id_async(session, game_name, tag_line))
+    graph.stage("summoner", lambda puuid: async_riot_client.get_summoner_id_by_puuid_async(session, puuid), "account")
+    graph.stage("spectator", lambda puuid, summoner_id: async_riot_client.get_active_game_async(session, summoner_id, puuid),
+                "account", "summoner")
+    try:
+        puuid = await graph.get("account")
+        if not puuid:
+            return {"error": "해당 Riot ID를 찾을 수 없습니다."}
+
+        encrypted_summoner_id = await graph.get("summoner")
+        if not encrypted_summoner_id:
+            return {"error": "소환사 ID를 찾을 수 없습니다."}
+
+        active_game_data = await graph.get("spectator")
+
+        if active_game_data is None:
+            return {"status": "not_in_game", "message": f"{game_name}#{tag_line}님은 현재 게임 중이 아닙니다."}
         
-        spell1_info = SUMMONER_SPELLS.get(summoner_spell_1_id)
-        spell2_info = SUMMONER_SPELLS.get(summoner_spell_2_id)
-
-        processed_spell1 = {
-            "id": summoner_spell_1_id,
-            "name": spell1_info['name'] if spell1_info else "Unknown",
-            "icon": f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell1_info['image']['full']}" if spell1_info and 'image' in spell1_info else ""
-        }
-        processed_spell2 = {
-            "id": summoner_spell_2_id,
-            "name": spell2_info['name'] if spell2_info else "Unknown",
-            "icon": f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell2_info['image']['full']}" if spell2_info and 'image' in spell2_info else ""
-        }
-
-        processed_participants.append({
-            "summonerName": p.get("summonerName"),
-            "championName": p.get("championName"),
-            "teamId": p.get("teamId"),
-            "summonerSpell1": processed_spell1,
-            "summonerSpell2": processed_spell2,
-            # Add other relevant active game participant data
-        })
+        # Process active game data for frontend display (같은 게임이면 어느 참가자가 조회하든 직렬화한 응답을 재사용)
+        enr = enrichment.current()  # 응답 하나는 같은 버전의 Data Dragon 레코드로 만듦
+        key = response_cache.current_game_key(active_game_data.get("gameId"), enr.version)
+        response = await response_cache.cached(async_riot_client.cache, key, response_cache.CURRENT_GAME_TTL,
+                                               lambda: build_current_game(active_game_data, enr), if_none_match)
+        return with_server_timing(response, graph)
+    finally:
+        await graph.close()
+
 
+def with_server_timing(response: Response, graph: fetch_graph.FetchGraph) -> Response:
+    response.headers["Server-Timing"] = graph.server_timing()
+    return response
+
+
+async def build_current_game(active_game_data: Dict[str, Any], enr: enrichment.Enrichment) -> Dict[str, Any]:
+    processed_participants = [enrichment.active_game_participant(enr, p) for p in active_game_data.get("participants", [])]
     return {
         "status": "in_game",
         "gameId": active_game_data.get("gameId"),
@@ -247,164 +243,496 @@ async def get_current_game(full_id: str):
         "participants": processed_participants,
     }
 
+@app.get("/match-ids/{full_id}")
+async def get_match_ids(full_id: str, start: int = 0, count: int = 20, cursor: Optional[str] = None):
+    """매치 ID를 최신순으로 페이지 단위 조회 (더 오래된 매치는 요청할 때만 Riot API에서 받아옴)
+
+    cursor(이전 응답의 next_cursor)를 주면 start 대신 그 매치 다음부터 조회합니다.
+    """
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    if "#" not in full_id:
+        return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+    if start < 0 or not 1 <= count <= 100:
+        return {"error": "start는 0 이상, count는 1~100 이어야 합니다."}
+
+    game_name, tag_line = full_id.split("#")
+    session = http_pool.get_async_session()
+    puuid = await async_riot_client.get_puuid_by_riot_id_async(session, game_name, tag_line)
+    if not puuid:
+        return {"error": "해당 Riot ID를 찾을 수 없습니다."}
+    id_page = await async_riot_client.get_match_ids_async(session, puuid, start=start, count=count, after=cursor)
+    if id_page is None:
+        return {"error": CURSOR_EXPIRED}
+    return id_page
+
+@app.get("/analyze-trends/{full_id}")
+async def analyze_trends(full_id: str, count: int = 20):
+    """최근 count개 매치를 모두 분석해 추세를 요약 (NDJSON 스트림)
+
+    타임라인은 동시에 받고 분석은 프로세스 풀에서 실행하며, 매치별 결과는 끝나는 대로
+    {"type": "match", ...} 줄로 보내고 마지막에 {"type": "summary", ...} 줄로 추세를 보냅니다.
+    """
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    if "#" not in full_id:
+        return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+    if not 1 <= count <= 100:
+        return {"error": "count는 1~100 이어야 합니다."}
+
+    game_name, tag_line = full_id.split("#")
+    session = http_pool.get_async_session()
+    puuid = await async_riot_client.get_puuid_by_riot_id_async(session, game_name, tag_line)
+    if not puuid:
+        return {"error": "해당 Riot ID를 찾을 수 없습니다."}
+    id_page = await async_riot_client.get_match_ids_async(session, puuid, start=0, count=count)
+    match_ids = id_page["match_ids"]
+    if not match_ids:
+        return {"error": "최근 매치 기록이 없습니다."}
+
+    async def analyze_one(index: int, match_id: str):
+        match_analysis = await async_riot_client.get_match_analysis_async(session, match_id)
+        if not match_analysis:
+            return index, match_id, {"macro_score": 0, "tilt_index": 0, "positions": [], "error": "타임라인 데이터 없음"}
+        return index, match_id, player_analysis(match_analysis, puuid)
+
+    async def stream():
+        # 타임라인 최대 100개를 받는 과거 기록 조회이므로 다른 요청의 단건/다건 조회보다 뒤에 보냄
+        with priority(Priority.BACKFILL):
+            tasks = [asyncio.ensure_future(analyze_one(i, match_id)) for i, match_id in enumerate(match_ids)]
+        results: Dict[str, Any] = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, match_id, result = await next_done
+                results[match_id] = result
+                yield json.dumps({"type": "match", "index": index, "matchId": match_id, "analysis": result},
+                                 ensure_ascii=False) + "\n"
+            trends = aggregate_trends([(match_id, results[match_id]) for match_id in match_ids])
+            yield json.dumps({"type": "summary", "user_info": {"name": game_name, "tag": tag_line}, **trends},
+                             ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 작업 취소
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @app.get("/analyze-user/{full_id}")
-async def analyze_user(full_id: str):
-    if not riot_client:
+async def analyze_user(full_id: str, cursor: Optional[str] = None, limit: int = 20, fields: Optional[str] = None,
+                       if_none_match: Annotated[Optional[str], Header()] = None):
+    """사용자 분석. 응답은 (puuid, 최신 매치 ID, Data Dragon 버전, 분석기 버전, limit, fields)별로 직렬화해 캐시하고
+    ETag가 같으면 304로 응답
+
+    - limit: 한 페이지의 매치 수 (1~20)
+    - cursor: 이전 응답의 next_cursor. 주면 그 다음 매치 페이지만 응답 (match_ids, has_more_matches, next_cursor, match_details)
+    - fields: 응답에 넣을 필드의 점 경로 목록 (예: "user_info,analysis,match_details.matchId,match_details.my_stats").
+      선택하지 않은 분석/참가자/팀 정보는 만들지도 않음. 참가자 전체는 /match-details/{match_id}에서 따로 조회
+
+    Riot 호출은 의존 관계 그래프로 실행합니다 (단계별 소요 시간은 Server-Timing 헤더):
+
+        account ─┬─ league (첫 페이지만, 매치 ID 조회와 동시에 미리 시작)
+                 └─ match_ids ─┬─ analysis       (응답 캐시에 없을 때만)
+                               └─ match_details  (응답 캐시에 없을 때만)
+    """
+    if not async_riot_client:
         return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}    
+    graph = fetch_graph.FetchGraph()
     try:
         # 1. ID 분리 (예: "가나다#KR1")
         if "#" not in full_id:
             return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+        if not 1 <= limit <= 20:
+            return {"error": "limit는 1~20 이어야 합니다."}
+        tree = field_select.parse(fields)
         
         game_name, tag_line = full_id.split("#")
         
-        # 1. 계정 및 티어 정보 가져오기
-        puuid = riot_client.get_puuid_by_riot_id(game_name, tag_line)
+        enr = enrichment.current()  # 응답 하나는 같은 버전의 Data Dragon 레코드로 만듦
+        add_analyze_user_stages(graph, async_riot_client, game_name, tag_line, limit, cursor, tree, enr)
+
+        # 1. 계정 정보 가져오기
+        puuid = await graph.get("account")
         if not puuid:
             return {"error": "해당 Riot ID를 찾을 수 없습니다."}
-        league_data = riot_client.get_league_info(puuid)
-
-        # 3. 매치 분석 진행 (기존 로직)
-        print(f"PUUUID: {puuid}")
-        match_ids = riot_client.get_recent_match_ids(puuid, count=1)
-        print(f"Match IDs: {match_ids}")
-        if not match_ids: 
-            return {"error": "최근 매치 기록이 없습니다."}
-        
-        print(f"Getting timeline for match: {match_ids[0]}")
-        timeline_data = riot_client.get_match_timeline(match_ids[0])
-        print(f"Timeline data received: {timeline_data is not None}")
-        if not timeline_data:
+        if cursor is None:
+            # 리그 정보는 puuid만 있으면 되므로 매치 ID와 동시에 받음 (리그 정보 캐시와 응답 캐시 TTL이 같아 대개 캐시 적중)
+            graph.start("league")
+
+        # 2. 매치 ID
+        id_page = await graph.get("match_ids")
+        if id_page is None:
+            return {"error": CURSOR_EXPIRED}
+
+        variant = f"{limit}:{field_select.canonical(tree)}"
+        if cursor is not None:
+            key = response_cache.analyze_user_page_key(puuid, cursor, enr.version, variant)
+            build = lambda: build_match_page(graph, id_page, tree)
+        else:
+            if not id_page["match_ids"]:
+                return {"error": "최근 매치 기록이 없습니다."}
+            await note_search(puuid, game_name, tag_line, limit, tree)
+            key = response_cache.analyze_user_key(puuid, id_page["match_ids"][0], enr.version, variant)
+            build = lambda: build_analyze_user(graph, game_name, tag_line, id_page, tree)
+        response = await response_cache.cached(
+            async_riot_client.cache, key, response_cache.ANALYZE_USER_TTL, build,
+            if_none_match, cacheable=lambda body: not (isinstance(body, dict) and "error" in body),
+        )
+        return with_server_timing(response, graph)
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        await graph.close()
+
+
+def add_analyze_user_stages(graph: fetch_graph.FetchGraph, client, game_name: str, tag_line: str, limit: int,
+                            cursor: Optional[str], tree: field_select.Tree, enr: enrichment.Enrichment):
+    """/analyze-user의 Riot 호출 단계 등록 (요청 처리와 prefetch가 같은 그래프를 씀)"""
+    session = http_pool.get_async_session()
+    graph.stage("account", lambda: client.get_puuid_by_riot_id_async(session, game_name, tag_line))
+    graph.stage("league", lambda puuid: client.get_league_info_async(session, puuid), "account")
+    # 최근 limit개 (cursor가 있으면 그 다음 limit개) 매치 ID. 첫 페이지는 최신 매치 ID가 응답 캐시 키
+    graph.stage("match_ids", lambda puuid: client.get_match_ids_async(session, puuid, start=0, count=limit, after=cursor),
+                "account")
+    graph.stage("analysis", lambda id_page: first_match_analysis(client, session, id_page, tree), "match_ids")
+    graph.stage("match_details", lambda puuid, id_page: build_match_details(client, session, puuid, id_page["match_ids"], enr, tree),
+                "account", "match_ids")
+
+
+async def first_match_analysis(client, session, id_page: Dict[str, Any], tree: field_select.Tree):
+    """최신 매치의 참가자 10명 분석 결과 (매치당 한 번만 계산해 캐시, 같은 매치의 팀원 조회도 재사용)"""
+    if not field_select.wants(tree, "analysis") or not id_page["match_ids"]:
+        return None
+    with priority(Priority.FANOUT):  # 타임라인은 크고 느리므로 단건 조회보다 뒤에
+        return await client.get_match_analysis_async(session, id_page["match_ids"][0])
+
+
+async def build_analyze_user(graph: fetch_graph.FetchGraph, game_name: str, tag_line: str, id_page: Dict[str, Any],
+                             tree: field_select.Tree = None):
+    """/analyze-user 첫 페이지 응답 본문 구성 (응답 캐시에 없을 때만 실행)"""
+    # 3. 리그 정보, 최신 매치 분석, 매치 상세(최근 limit개)를 동시에
+    puuid = await graph.get("account")
+    league_data, match_analysis, processed_matches = await graph.gather("league", "analysis", "match_details")
+
+    analysis_result = None
+    if field_select.wants(tree, "analysis"):
+        if not match_analysis:
             return {"error": "매치 타임라인 데이터를 가져올 수 없습니다."}
-            
-        analysis_result = analyze_game(timeline_data)
-        print(f"Analysis completed: {analysis_result}")
+        # 요청한 플레이어(puuid)의 participantId 결과
+        analysis_result = player_analysis(match_analysis, puuid)
+
+    # 솔랭(RANKED_SOLO_5x5) 데이터 찾기
+    solo_rank = next((item for item in league_data if item['queueType'] == 'RANKED_SOLO_5x5'), None)
+    if solo_rank:
+        n_total = solo_rank['wins'] + solo_rank['losses']
+        return field_select.select({
+            "user_info": {"name": game_name, "tag": tag_line},
+            "league": league_data,
+            "total_matches": n_total,
+            "match_ids": id_page["match_ids"], # 이 페이지의 매치 ID 리스트 (다음 페이지는 ?cursor=next_cursor)
+            "has_more_matches": id_page["has_more"],
+            "next_cursor": id_page["next_cursor"],
+            "analysis": analysis_result,
+            "match_details": processed_matches,
+            # "processed_matches": processed_matches,
+        }, tree)
+    return None
+
+
+async def build_match_page(graph: fetch_graph.FetchGraph, id_page: Dict[str, Any], tree: field_select.Tree = None) -> Dict[str, Any]:
+    """/analyze-user?cursor= 응답 본문 (다음 매치 페이지만)"""
+    return field_select.select({
+        "match_ids": id_page["match_ids"],
+        "has_more_matches": id_page["has_more"],
+        "next_cursor": id_page["next_cursor"],
+        "match_details": await graph.get("match_details"),
+    }, tree)
+
+
+def match_summary(match: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "matchId": match['matchId'],
+        "gameMode": match['gameMode'],
+        "queueId": match['queueId'],
+        "queueType": QUEUE_MAPPING.get(match['queueId'], "알 수 없는 모드"),
+        "gameDuration": match['gameDuration'],
+    }
+
+
+async def build_match_details(client, session, puuid: str, match_ids: List[str], enr: enrichment.Enrichment,
+                              tree: field_select.Tree = None) -> List[Dict[str, Any]]:
+    """매치 카드 목록. 선택하지 않은 필드(참가자, 팀)는 만들지 않음"""
+    if not field_select.wants(tree, "match_details"):
+        return []
+    match_details = await client.get_match_details_batch_async(session, match_ids)
+    processed_matches = (process_match(match, puuid, enr, tree) for match in match_details)
+    return [processed for processed in processed_matches if processed]
+
+
+def process_match(match: Dict[str, Any], puuid: str, enr: enrichment.Enrichment,
+                  tree: field_select.Tree = None) -> Optional[Dict[str, Any]]:
+    """매치 상세(축약본) -> 매치 카드. 요청한 소환사가 없는 매치는 None"""
+    # 1. 내 정보 찾기 (요약 카드용)
+    my_stats = next((p for p in match['participants'] if p['puuid'] == puuid), None)
+    if not my_stats:
+        return None
+    processed = match_summary(match)
+    processed["my_stats"] = {
+        "win": my_stats['win'],
+        "championName": my_stats['championName'],
+        "kills": my_stats['kills'],
+        "deaths": my_stats['deaths'],
+        "assists": my_stats['assists'],
+    }
+    # 2. 전체 참가자 10명 데이터 정제 (상세 드롭다운용). 주문/아이템은 미리 만든 레코드를 공유
+    if field_select.wants(tree, "match_details", "participants"):
+        processed["participants"] = [enrichment.match_participant(enr, p) for p in match['participants']]
+    if field_select.wants(tree, "match_details", "teams"):
+        processed["teams"] = enrichment.match_teams(enr, match.get('teams', [])) # 밴 목록에 championName 추가
+    return processed
+
+
+# 스트리밍 응답에서 한 이벤트로 묶어 보내는 /analyze-user 필드
+STREAM_GROUPS = (
+    ("league", ("league", "total_matches")),
+    ("page", ("match_ids", "has_more_matches", "next_cursor")),
+)
+
+
+@app.get("/analyze-user/{full_id}/stream")
+async def analyze_user_stream(full_id: str, limit: int = 20, fields: Optional[str] = None,
+                              accept: Annotated[Optional[str], Header()] = None):
+    """/analyze-user 첫 페이지의 스트리밍 버전. 모든 단계를 기다리지 않고 준비되는 대로 이벤트를 한 줄씩 보냄
+
+    기본은 NDJSON이고, Accept: text/event-stream이면 SSE(event: <type>, data: <json>)로 보냅니다.
+
+        {"type": "user_info", "user_info"}                       puuid 확인 직후
+        {"type": "league", "league", "total_matches"}
+        {"type": "page", "match_ids", "has_more_matches", "next_cursor"}
+        {"type": "match", "index", "match"}                        매치 상세가 도착하는 대로 (index는 최신순 위치)
+        {"type": "analysis", "analysis"}                           최신 매치 타임라인 분석
+        {"type": "done", "server_timing"} 또는 {"type": "error", "error"}
+
+    limit/fields는 /analyze-user와 같고, 다 보낸 응답은 같은 인자의 /analyze-user 응답 캐시에 저장합니다
+    (캐시에 있으면 Riot 호출 없이 바로 재생). Riot 호출 수는 /analyze-user와 같습니다.
+    """
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    if "#" not in full_id:
+        return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+    if not 1 <= limit <= 20:
+        return {"error": "limit는 1~20 이어야 합니다."}
+    try:
+        tree = field_select.parse(fields)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    game_name, tag_line = full_id.split("#")
+    sse = "text/event-stream" in (accept or "")
+    return StreamingResponse(stream_analyze_user(game_name, tag_line, limit, tree, sse),
+                             media_type="text/event-stream" if sse else "application/x-ndjson",
+                             headers={"Cache-Control": "no-cache"})
+
+
+async def stream_analyze_user(game_name: str, tag_line: str, limit: int, tree: field_select.Tree, sse: bool):
+    def event(event_type: str, payload: Dict[str, Any]) -> bytes:
+        data = response_cache.dumps({"type": event_type, **payload})
+        return b"event: " + event_type.encode() + b"\ndata: " + data + b"\n\n" if sse else data + b"\n"
+
+    def group_events(body: Dict[str, Any]):
+        for event_type, keys in STREAM_GROUPS:
+            payload = {key: body[key] for key in keys if key in body}
+            if payload:
+                yield event(event_type, payload)
 
-        # 솔랭(RANKED_SOLO_5x5) 데이터 찾기
+    session = http_pool.get_async_session()
+    enr = enrichment.current()
+    graph = fetch_graph.FetchGraph()
+    # 매치 상세는 match_details 단계 대신 도착하는 대로 하나씩 받음
+    add_analyze_user_stages(graph, async_riot_client, game_name, tag_line, limit, None, tree, enr)
+    try:
+        puuid = await graph.get("account")
+        if not puuid:
+            yield event("error", {"error": "해당 Riot ID를 찾을 수 없습니다."})
+            return
+        graph.start("league")
+        user_info = {"name": game_name, "tag": tag_line}
+        if field_select.wants(tree, "user_info"):
+            yield event("user_info", {"user_info": user_info})
+
+        id_page = await graph.get("match_ids")
+        match_ids = id_page["match_ids"]
+        if not match_ids:
+            yield event("error", {"error": "최근 매치 기록이 없습니다."})
+            return
+        await note_search(puuid, game_name, tag_line, limit, tree)
+
+        # 같은 인자의 /analyze-user 응답이 캐시에 있으면 그대로 재생
+        key = response_cache.analyze_user_key(puuid, match_ids[0], enr.version, f"{limit}:{field_select.canonical(tree)}")
+        entry = await response_cache.get(async_riot_client.cache, key)
+        body = json.loads(entry["body"]) if entry else None
+        if body is not None:
+            for line in group_events(body):
+                yield line
+            for index, match in enumerate(body.get("match_details", [])):
+                yield event("match", {"index": index, "match": match})
+            if "analysis" in body:
+                yield event("analysis", {"analysis": body["analysis"]})
+            yield event("done", {"server_timing": graph.server_timing()})
+            return
+
+        # 타임라인 분석은 오래 걸리므로 리그 정보, 매치 상세와 동시에 시작
+        graph.start("analysis")
+        league_data = await graph.get("league")
         solo_rank = next((item for item in league_data if item['queueType'] == 'RANKED_SOLO_5x5'), None)
+        n_total = solo_rank['wins'] + solo_rank['losses'] if solo_rank else None
+        page = field_select.select({
+            "league": league_data,
+            "total_matches": n_total,
+            "match_ids": match_ids,
+            "has_more_matches": id_page["has_more"],
+            "next_cursor": id_page["next_cursor"],
+        }, tree)
+        for line in group_events(page):
+            yield line
+
+        processed_matches: Dict[int, Dict[str, Any]] = {}
+        if field_select.wants(tree, "match_details"):
+            match_tree = None if tree is None else tree["match_details"]
+            async for index, match in async_riot_client.iter_match_details_async(session, match_ids):
+                processed = process_match(match, puuid, enr, tree)
+                if processed:
+                    processed_matches[index] = processed
+                    yield event("match", {"index": index, "match": field_select.select(processed, match_tree)})
+
+        analysis_result = None
+        if field_select.wants(tree, "analysis"):
+            match_analysis = await graph.get("analysis")
+            if not match_analysis:
+                yield event("error", {"error": "매치 타임라인 데이터를 가져올 수 없습니다."})
+                return
+            analysis_result = player_analysis(match_analysis, puuid)
+            yield event("analysis", {"analysis": analysis_result})
+
         if solo_rank:
-            n_total = solo_rank['wins'] + solo_rank['losses']
-            
-            if ASYNC_AVAILABLE and aiohttp is not None:
-                # 비동기로 모든 매치 ID 가져오기 (성능 개선)
-                async with aiohttp.ClientSession() as session:
-                    all_ids = await async_riot_client.get_all_match_ids_async(session, puuid, solo_rank['wins'], solo_rank['losses'])
-                    
-                    # 비동기로 매치 상세 정보 가져오기 (최근 20개)
-                    match_details = await async_riot_client.get_match_details_batch_async(session, all_ids[:20])
-            else:
-                # 동기 방식으로 fallback
-                all_ids = riot_client.get_all_match_ids(puuid, solo_rank['wins'], solo_rank['losses'])
-                match_details = riot_client.get_match_details_batch(all_ids[:20])
-            
-            processed_matches = []
-            for match in match_details:
-                # 1. 내 정보 찾기 (요약 카드용)
-                my_stats = next((p for p in match['participants'] if p['puuid'] == puuid), None)
-                
-                # 2. 전체 참가자 10명 데이터 정제 (상세 드롭다운용)
-                participants_list = []
-                for p in match['participants']:
-                    # Summoner Spells
-                    summoner_spell_1_id = str(p.get("summoner1Id"))
-                    summoner_spell_2_id = str(p.get("summoner2Id"))
-                    
-                    spell1_info = SUMMONER_SPELLS.get(summoner_spell_1_id)
-                    spell2_info = SUMMONER_SPELLS.get(summoner_spell_2_id)
-
-                    processed_spell1 = {
-                        "id": summoner_spell_1_id,
-                        "name": spell1_info['name'] if spell1_info else "Unknown",
-                        "icon": f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell1_info['image']['full']}" if spell1_info and 'image' in spell1_info else ""
-                    }
-                    processed_spell2 = {
-                        "id": summoner_spell_2_id,
-                        "name": spell2_info['name'] if spell2_info else "Unknown",
-                        "icon": f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/spell/{spell2_info['image']['full']}" if spell2_info and 'image' in spell2_info else ""
-                    }
-
-                    # Items
-                    item_ids = [p.get(f"item{i}") for i in range(7)]
-                    processed_items = []
-                    for item_id in item_ids:
-                        if item_id and item_id != 0: # 0 is often for empty item slots
-                            item_info = ITEMS.get(str(item_id))
-                            if item_info:
-                                processed_items.append({
-                                    "id": item_id,
-                                    "name": item_info.get('name'),
-                                    "icon": f"https://ddragon.leagueoflegends.com/cdn/{DDRAGON_VERSION}/img/item/{item_id}.png"
-                                })
-                            else:
-                                processed_items.append({"id": item_id, "name": "Unknown Item", "icon": ""})
-                        else:
-                            processed_items.append(None) # Represent empty slot
-
-                    participants_list.append({
-                        "puuid": p.get("puuid"), # 내 정보 하이라이트용
-                        "teamId": p.get("teamId"),
-                        "win": p.get("win"),
-                        "championName": p.get("championName"),
-                        "teamPosition": p.get("teamPosition"), # TOP, JUNGLE ...
-                        "summonerName": f"{p.get('riotIdGameName')} #{p.get('riotIdTagline')}",
-                        "kda_str": f"{p.get('kills')}/{p.get('deaths')}/{p.get('assists')}",
-                        "kda_score": p.get("challenges", {}).get("kda", 0), # kda 점수
-                        "visionScore": p.get("visionScore"),
-                        "wards": f"{p.get('wardsKilled')}/{p.get('wardsPlaced')}",
-                        "cs": p.get("totalMinionsKilled") + p.get("neutralMinionsKilled", 0), # 전체 CS
-                        "damage": p.get("totalDamageDealtToChampions"),
-                        "gold": p.get("goldEarned"),
-                        "kills": p.get('kills'),
-                        "deaths": p.get('deaths'),
-                        "assists": p.get('assists'),
-                        "summonerSpell1": processed_spell1, # Add processed spell 1
-                        "summonerSpell2": processed_spell2, # Add processed spell 2
-                        "items": processed_items, # Add processed items
-                    })
-
-                if my_stats:
-                    processed_teams = []
-                    for team in match.get('teams', []): # teams 데이터 순회
-                        processed_bans = []
-                        for ban in team.get('bans', []): # 각 팀의 bans 순회
-                            ban_champion_id = ban.get('championId', -1)
-                            ban_champion_name = get_champion_name_by_id(ban_champion_id)
-                            processed_bans.append({
-                                **ban, # 기존 ban 정보 유지
-                                "championName": ban_champion_name # championName 추가
-                            })
-                        processed_teams.append({
-                            **team, # 기존 team 정보 유지
-                            "bans": processed_bans # championName이 추가된 bans로 교체
-                        })
-
-                    processed_matches.append({
-                        "matchId": match['matchId'],
-                        "gameMode": match['gameMode'],
-                        "queueId": match['queueId'],
-                        "queueType": QUEUE_MAPPING.get(match['queueId'], "알 수 없는 모드"),
-                        "gameDuration": match['gameDuration'],
-                        "my_stats": {
-                            "win": my_stats['win'],
-                            "championName": my_stats['championName'],
-                            "kills": my_stats['kills'],
-                            "deaths": my_stats['deaths'],
-                            "assists": my_stats['assists'],
-                        },
-                        "participants": participants_list,
-                        "teams": processed_teams # 변환된 teams 데이터 사용
-                    })
-
-            analysis_result = analyze_game(timeline_data)
-
-            return {
-                "user_info": {"name": game_name, "tag": tag_line},
+            # /analyze-user와 같은 본문으로 캐시 (비솔랭 응답은 /analyze-user처럼 본문 없음)
+            await response_cache.put(async_riot_client.cache, key, field_select.select({
+                "user_info": user_info,
                 "league": league_data,
                 "total_matches": n_total,
-                "match_ids": all_ids, # 전체 매치 ID 리스트
+                "match_ids": match_ids,
+                "has_more_matches": id_page["has_more"],
+                "next_cursor": id_page["next_cursor"],
                 "analysis": analysis_result,
-                "match_details": processed_matches,
-                # "processed_matches": processed_matches,
-            }
+                "match_details": [processed_matches[index] for index in sorted(processed_matches)],
+            }, tree), response_cache.ANALYZE_USER_TTL)
+        yield event("done", {"server_timing": graph.server_timing()})
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        yield event("error", {"error": str(e)})
+    finally:
+        await graph.close()
+
+
+async def note_search(puuid: str, game_name: str, tag_line: str, limit: int, tree: field_select.Tree):
+    """검색한 소환사를 같은 요청 형태(limit, fields)로 prefetch 대상에 기록"""
+    if prefetcher is not None:
+        await prefetcher.note_search(puuid, game_name, tag_line, limit, None if tree is None else field_select.canonical(tree))
+
+
+async def prefetch_player(puuid: str, player: prefetch.Player) -> bool:
+    """prefetch 워커 콜백: 소환사의 /analyze-user 첫 페이지 응답을 요청 형태별로 미리 만들어 응답 캐시에 저장.
+    새 매치가 없어 응답 캐시 키가 그대로면 Riot 호출은 매치 ID 확인뿐. 새로 만든 응답이 있으면 True"""
+    enr = enrichment.current()
+    warmed = False
+    for limit, fields in player["variants"]:
+        tree = field_select.parse(fields)
+        graph = fetch_graph.FetchGraph()
+        add_analyze_user_stages(graph, prefetch_client, player["game_name"], player["tag_line"], limit, None, tree, enr)
+        try:
+            id_page = await graph.get("match_ids")
+            if not id_page or not id_page["match_ids"]:
+                continue
+            key = response_cache.analyze_user_key(puuid, id_page["match_ids"][0], enr.version,
+                                                  f"{limit}:{field_select.canonical(tree)}")
+            if await response_cache.get(prefetch_client.cache, key) is not None:
+                continue
+            body = await build_analyze_user(graph, player["game_name"], player["tag_line"], id_page, tree)
+            if isinstance(body, dict) and "error" in body:
+                continue
+            await response_cache.put(prefetch_client.cache, key, body, response_cache.ANALYZE_USER_TTL)
+            warmed = True
+        finally:
+            await graph.close()
+    return warmed
+
+
+@app.post("/track/{full_id}")
+async def track_player(full_id: str, limit: int = 20, fields: Optional[str] = None):
+    """검색하지 않아도 새 매치를 계속 확인해 /analyze-user 응답을 미리 만들어 둘 소환사 등록"""
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    if prefetcher is None:
+        return {"error": "prefetch가 꺼져 있습니다 (PREFETCH_ENABLED=0)."}
+    if "#" not in full_id:
+        return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+    if not 1 <= limit <= 20:
+        return {"error": "limit는 1~20 이어야 합니다."}
+    try:
+        tree = field_select.parse(fields)
+    except ValueError as e:
+        return {"error": str(e)}
+    game_name, tag_line = full_id.split("#")
+    puuid = await async_riot_client.get_puuid_by_riot_id_async(http_pool.get_async_session(), game_name, tag_line)
+    if not puuid:
+        return {"error": "해당 Riot ID를 찾을 수 없습니다."}
+    await prefetcher.track(puuid, game_name, tag_line, limit, None if tree is None else field_select.canonical(tree))
+    return {"tracked": True, "user_info": {"name": game_name, "tag": tag_line}}
+
+
+@app.delete("/track/{full_id}")
+async def untrack_player(full_id: str):
+    """추적 해제 (최근 검색 기록이 남아 있으면 PREFETCH_RECENT_TTL 동안은 계속 prefetch)"""
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    if prefetcher is None:
+        return {"error": "prefetch가 꺼져 있습니다 (PREFETCH_ENABLED=0)."}
+    if "#" not in full_id:
+        return {"error": "Riot ID 형식은 Name#Tag 여야 합니다."}
+    game_name, tag_line = full_id.split("#")
+    puuid = await async_riot_client.get_puuid_by_riot_id_async(http_pool.get_async_session(), game_name, tag_line)
+    if not puuid:
+        return {"error": "해당 Riot ID를 찾을 수 없습니다."}
+    return {"tracked": False, "found": await prefetcher.untrack(puuid)}
+
+
+@app.get("/prefetch-stats")
+async def prefetch_stats():
+    """prefetch 대상 소환사 수, 대기 중인 작업 수, 미리 만든 응답 수"""
+    if prefetcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **await prefetcher.stats()}
+
+
+@app.get("/match-details/{match_id}")
+async def get_match_details(match_id: str, if_none_match: Annotated[Optional[str], Header()] = None):
+    """매치 하나의 참가자 10명/팀 상세 (매치 카드 드롭다운을 펼칠 때 조회). 끝난 매치는 바뀌지 않으므로 하루 캐시"""
+    if not async_riot_client:
+        return {"error": "RIOT_API_KEY가 설정되지 않았습니다."}
+    session = http_pool.get_async_session()
+    enr = enrichment.current()
+    key = response_cache.match_detail_key(match_id, enr.version)
+    return await response_cache.cached(
+        async_riot_client.cache, key, response_cache.MATCH_DETAIL_TTL,
+        lambda: build_match_detail(session, match_id, enr),
+        if_none_match, cacheable=lambda body: "error" not in body,
+    )
+
+
+async def build_match_detail(session, match_id: str, enr: enrichment.Enrichment) -> Dict[str, Any]:
+    match = await async_riot_client.get_match_detail_async(session, match_id)
+    if not match:
+        return {"error": "매치 정보를 찾을 수 없습니다."}
+    return {
+        **match_summary(match),
+        "participants": [enrichment.match_participant(enr, p) for p in match['participants']],
+        "teams": enrichment.match_teams(enr, match.get('teams', [])),
+    }
@@ -0,0 +1,123 @@
+"""소환사의 협곡 지역/오브젝트/포탑 표와 좌표 -> 지역 조회.
+
+맵(0~14870 게임 좌표)을 CELL_SIZE 단위 격자로 나눠 칸마다 지역 ID를 미리 칠해 둔(rasterize) 배열을 만들고,
+위치는 좌표를 칸 인덱스로 바꿔 배열에서 바로 읽습니다. 위치 하나당 O(1)이고 (프레임 x 참가자) 전체를
+NumPy 인덱싱 한 번으로 분류하므로 여러 매치의 모든 참가자에 대해 돌려도 부담이 없습니다.
+
+좌표는 Riot 타임라인 기준(파랑 팀 기지가 왼쪽 아래)이며, 지역 경계는 대략적인 값입니다.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+MAP_SIZE = 14870
+CELL_SIZE = 50
+GRID_SIZE = MAP_SIZE // CELL_SIZE + 1
+
+# 지역 ID = 인덱스. 위치가 없으면 -1
+ZONE_NAMES = (
+    "BLUE_BASE", "RED_BASE",
+    "TOP_LANE", "MID_LANE", "BOT_LANE",
+    "RIVER",
+    "BLUE_TOP_JUNGLE", "BLUE_BOT_JUNGLE", "RED_TOP_JUNGLE", "RED_BOT_JUNGLE",
+    "DRAGON_PIT", "BARON_PIT",
+)
+ZONE_IDS = {name: i for i, name in enumerate(ZONE_NAMES)}
+NO_ZONE = -1
+
+# 에픽 오브젝트 둥지 중심. 바론 둥지는 20분 전에는 전령/공허 유충 둥지
+OBJECTIVES: Dict[str, Tuple[int, int]] = {"dragon": (9800, 4400), "baron": (5000, 10400)}
+OBJECTIVE_IDS = {name: i + 1 for i, name in enumerate(OBJECTIVES)}  # 0은 오브젝트 근처 아님
+PIT_RADIUS = 1000  # 둥지 지역(DRAGON_PIT/BARON_PIT) 반경
+OBJECTIVE_RADIUS = 2000  # 오브젝트 싸움에 관여한다고 보는 반경 (매크로 점수는 드래곤 둥지만)
+BARON_SPAWN_MS = 20 * 60 * 1000
+
+# 포탑 (팀, 라인, 티어, x, y)
+TOWERS: List[Tuple[int, str, str, int, int]] = [
+    (100, "TOP", "OUTER", 981, 10441), (100, "TOP", "INNER", 1512, 6699), (100, "TOP", "INHIBITOR", 1169, 4287),
+    (100, "MID", "OUTER", 5846, 6396), (100, "MID", "INNER", 5048, 4812), (100, "MID", "INHIBITOR", 3651, 3696),
+    (100, "BOT", "OUTER", 10504, 1029), (100, "BOT", "INNER", 6919, 1483), (100, "BOT", "INHIBITOR", 4281, 1253),
+    (100, "MID", "NEXUS", 1748, 2270), (100, "MID", "NEXUS", 2177, 1807),
+    (200, "TOP", "OUTER", 4318, 13875), (200, "TOP", "INNER", 7943, 13411), (200, "TOP", "INHIBITOR", 10481, 13650),
+    (200, "MID", "OUTER", 8955, 8510), (200, "MID", "INNER", 9767, 10113), (200, "MID", "INHIBITOR", 11134, 11207),
+    (200, "BOT", "OUTER", 13866, 4505), (200, "BOT", "INNER", 13327, 8226), (200, "BOT", "INHIBITOR", 13624, 10572),
+    (200, "MID", "NEXUS", 12611, 13084), (200, "MID", "NEXUS", 13052, 12612),
+]
+TOWER_RANGE = 900  # 포탑 사거리(약 750) + 여유
+TOWER_TEAMS = np.array([0] + [team for team, *_ in TOWERS], dtype=np.int16)  # 포탑 ID(1부터) -> 팀
+
+LANE_WIDTH = 2200  # 맵 가장자리 라인(탑/봇) 폭
+MID_HALF_WIDTH = 1300  # 미드 라인(대각선) 반폭
+RIVER_HALF_WIDTH = 1300  # 강(반대 대각선) 반폭
+BASE_EXTENT = 4600  # 기지 사각형 한 변
+BASE_DIAGONAL = 7800  # 기지 모서리를 자르는 대각선 (x + y)
+
+
+def _cell_centers() -> Tuple[np.ndarray, np.ndarray]:
+    centers = (np.arange(GRID_SIZE) + 0.5) * CELL_SIZE
+    return np.meshgrid(centers, centers, indexing="ij")  # [x칸, y칸]
+
+
+def _build_zone_grid() -> np.ndarray:
+    x, y = _cell_centers()
+    blue_side = x + y < MAP_SIZE
+    top_side = y > x
+    grid = np.empty((GRID_SIZE, GRID_SIZE), dtype=np.int8)
+
+    # 나중에 칠한 지역이 우선
+    grid[blue_side & top_side] = ZONE_IDS["BLUE_TOP_JUNGLE"]
+    grid[blue_side & ~top_side] = ZONE_IDS["BLUE_BOT_JUNGLE"]
+    grid[~blue_side & top_side] = ZONE_IDS["RED_TOP_JUNGLE"]
+    grid[~blue_side & ~top_side] = ZONE_IDS["RED_BOT_JUNGLE"]
+    grid[np.abs(x + y - MAP_SIZE) < RIVER_HALF_WIDTH * np.sqrt(2)] = ZONE_IDS["RIVER"]
+    grid[np.abs(x - y) < MID_HALF_WIDTH * np.sqrt(2)] = ZONE_IDS["MID_LANE"]
+    grid[(x < LANE_WIDTH) | (y > MAP_SIZE - LANE_WIDTH)] = ZONE_IDS["TOP_LANE"]
+    grid[(y < LANE_WIDTH) | (x > MAP_SIZE - LANE_WIDTH)] = ZONE_IDS["BOT_LANE"]
+    for name, zone in (("dragon", "DRAGON_PIT"), ("baron", "BARON_PIT")):
+        cx, cy = OBJECTIVES[name]
+        grid[(x - cx) ** 2 + (y - cy) ** 2 < PIT_RADIUS ** 2] = ZONE_IDS[zone]
+    grid[(x < BASE_EXTENT) & (y < BASE_EXTENT) & (x + y < BASE_DIAGONAL)] = ZONE_IDS["BLUE_BASE"]
+    far_x, far_y = MAP_SIZE - x, MAP_SIZE - y
+    grid[(far_x < BASE_EXTENT) & (far_y < BASE_EXTENT) & (far_x + far_y < BASE_DIAGONAL)] = ZONE_IDS["RED_BASE"]
+    return grid
+
+
+def _build_point_grid(points: List[Tuple[int, int]], radius: float) -> np.ndarray:
+    """칸마다 반경 안에서 가장 가까운 점의 ID(1부터), 없으면 0"""
+    x, y = _cell_centers()
+    grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.int8)
+    nearest = np.full((GRID_SIZE, GRID_SIZE), np.inf)
+    for point_id, (px, py) in enumerate(points, start=1):
+        dist2 = (x - px) ** 2 + (y - py) ** 2
+        closer = (dist2 < radius ** 2) & (dist2 < nearest)
+        grid[closer] = point_id
+        nearest[closer] = dist2[closer]
+    return grid
+
+
+# 모듈 로드 시 한 번만 계산 (각 약 90KB)
+ZONE_GRID = _build_zone_grid()
+OBJECTIVE_GRID = _build_point_grid(list(OBJECTIVES.values()), OBJECTIVE_RADIUS)
+TOWER_GRID = _build_point_grid([(x, y) for *_, x, y in TOWERS], TOWER_RANGE)
+
+
+def _lookup(grid: np.ndarray, positions: np.ndarray, missing: int) -> np.ndarray:
+    """positions (..., 2) 게임 좌표 -> 같은 앞쪽 모양의 격자 값. NaN 좌표는 missing"""
+    valid = ~np.isnan(positions[..., 0])
+    cells = np.clip(np.nan_to_num(positions) // CELL_SIZE, 0, GRID_SIZE - 1).astype(np.intp)
+    return np.where(valid, grid[cells[..., 0], cells[..., 1]], missing)
+
+
+def zone_ids(positions: np.ndarray) -> np.ndarray:
+    """좌표 -> 지역 ID (ZONE_NAMES 인덱스, 위치가 없으면 -1)"""
+    return _lookup(ZONE_GRID, positions, NO_ZONE)
+
+
+def objective_ids(positions: np.ndarray) -> np.ndarray:
+    """좌표 -> 근처 에픽 오브젝트 ID (OBJECTIVE_IDS 값, 없으면 0)"""
+    return _lookup(OBJECTIVE_GRID, positions, 0)
+
+
+def tower_ids(positions: np.ndarray) -> np.ndarray:
+    """좌표 -> 사거리 안 포탑 ID (TOWERS 인덱스 + 1, 없으면 0)"""
+    return _lookup(TOWER_GRID, positions, 0)
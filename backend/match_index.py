@@ -0,0 +1,102 @@
+"""소환사별 매치 ID 인덱스 (증분 동기화).
+
+전적 전체를 100개씩 매번 다시 받아오지 않고, puuid마다 최신순 매치 ID 목록을 캐시에 두고
+마지막 동기화 이후의 새 매치만 앞에 붙입니다. 오래된 매치는 요청한 페이지가 인덱스 범위를
+벗어날 때만 이어서 받아옵니다.
+
+인덱스 형식: {"ids": [최신순 매치 ID], "complete": 전적 끝까지 받았는지, "synced_at": 마지막 동기화 시각(epoch 초)}
+병합 함수는 받은 인덱스를 수정하지 않고 항상 새 dict를 만들어 돌려주므로, 동기화 전후 인덱스를 비교해 바뀐 경우에만 저장할 수 있습니다.
+실제 요청(동기/비동기)은 RiotAPI/AsyncRiotAPI가 하고, 이 모듈은 요청 인자 계산과 병합만 담당합니다.
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# match-v5 by-puuid/ids 한 번에 받을 수 있는 최대 개수
+PAGE_SIZE = 100
+# 마지막 동기화 후 이 시간(초)이 지나야 새 매치를 확인
+SYNC_INTERVAL = int(os.environ.get("MATCH_INDEX_SYNC_INTERVAL", 120))
+# startTime은 게임 시작 시각 기준이므로, 지난 동기화 때 진행 중이던 게임도 잡히도록 여유를 둠
+SYNC_OVERLAP = 2 * 3600
+# 새 매치를 이 페이지 수만큼 받아도 기존 인덱스와 이어지지 않으면 인덱스를 새로 시작
+MAX_SYNC_PAGES = 3
+
+
+def empty_index() -> Dict[str, Any]:
+    return {"ids": [], "complete": False, "synced_at": 0}
+
+
+def needs_sync(index: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+    if not index:
+        return True
+    return (now if now is not None else time.time()) - index.get("synced_at", 0) >= SYNC_INTERVAL
+
+
+def newer_page_params(index: Dict[str, Any], page: int) -> Dict[str, int]:
+    """새 매치 확인용 요청 인자 (page번째 페이지, 0부터)"""
+    params = {"start": page * PAGE_SIZE, "count": PAGE_SIZE}
+    if index["ids"] and index.get("synced_at"):
+        params["startTime"] = int(index["synced_at"] - SYNC_OVERLAP)
+    return params
+
+
+def take_newer(index: Dict[str, Any], page_ids: List[str]) -> Tuple[List[str], bool]:
+    """응답 페이지에서 인덱스에 없는 (더 최신) ID와, 다음 페이지를 더 받아야 하는지 여부를 반환
+
+    이미 아는 ID를 만나거나 페이지가 덜 찼으면(startTime 이후 매치를 다 받음) 기존 인덱스와 이어진 것입니다.
+    """
+    known = set(index["ids"])
+    fresh = []
+    for match_id in page_ids:
+        if match_id in known:
+            return fresh, False
+        fresh.append(match_id)
+    # 처음 만드는 인덱스는 첫 페이지만 받고 나머지는 필요할 때 이어서 받음
+    return fresh, bool(index["ids"]) and len(page_ids) == PAGE_SIZE
+
+
+def merge_newer(index: Dict[str, Any], new_ids: List[str], connected: bool = True, now: Optional[float] = None) -> Dict[str, Any]:
+    """새 매치를 앞에 붙인 인덱스. MAX_SYNC_PAGES 안에 기존 인덱스와 이어지지 않았으면(connected=False) 새로 시작"""
+    now = now if now is not None else time.time()
+    if not index["ids"]:
+        return {"ids": new_ids, "complete": len(new_ids) < PAGE_SIZE, "synced_at": now}
+    if not connected:
+        return {"ids": new_ids, "complete": False, "synced_at": now}
+    return {"ids": new_ids + index["ids"], "complete": index["complete"], "synced_at": now}
+
+
+def older_page_params(index: Dict[str, Any]) -> Dict[str, int]:
+    """인덱스의 가장 오래된 매치 다음부터 받는 요청 인자 (동기화 직후에만 오프셋이 맞음)"""
+    return {"start": len(index["ids"]), "count": PAGE_SIZE}
+
+
+def needs_older(index: Dict[str, Any], start: int, count: int) -> bool:
+    return not index["complete"] and len(index["ids"]) < start + count
+
+
+def merge_older(index: Dict[str, Any], page_ids: List[str]) -> Dict[str, Any]:
+    known = set(index["ids"])
+    return {
+        "ids": index["ids"] + [match_id for match_id in page_ids if match_id not in known],
+        "complete": len(page_ids) < PAGE_SIZE,
+        "synced_at": index["synced_at"],
+    }
+
+
+def start_after(index: Dict[str, Any], cursor: str) -> Optional[int]:
+    """커서(이전 페이지의 마지막 매치 ID) 다음 위치. 인덱스에 없으면(인덱스가 새로 시작됨) None
+
+    새 매치는 인덱스 앞에 붙으므로 오프셋 대신 매치 ID를 커서로 쓰면 그 사이에 게임을 더 해도 페이지가 밀리지 않습니다.
+    """
+    try:
+        return index["ids"].index(cursor) + 1
+    except ValueError:
+        return None
+
+
+def page_of(index: Dict[str, Any], start: int, count: int) -> Dict[str, Any]:
+    """API 응답용 페이지: {"match_ids", "start", "count", "has_more", "next_cursor"}"""
+    ids = index["ids"][start:start + count]
+    has_more = len(index["ids"]) > start + count or not index["complete"]
+    next_cursor = ids[-1] if ids and has_more else None
+    return {"match_ids": ids, "start": start, "count": len(ids), "has_more": has_more, "next_cursor": next_cursor}
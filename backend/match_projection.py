@@ -0,0 +1,202 @@
+"""Riot 원본 응답을 서비스에서 쓰는 필드만 남긴 축약본(projection)으로 변환.
+
+match-v5 상세 응답은 참가자당 100개가 넘는 필드를, 타임라인은 프레임마다 모든 참가자의
+스탯과 이벤트를 담고 있지만 실제로 쓰는 필드는 일부뿐입니다. 캐시에는 축약본만 저장해
+Redis 메모리와 역직렬화 비용을 줄입니다.
+
+축약 스키마를 바꿀 때는 버전을 올리면 캐시 키가 바뀌어 이전 형식의 항목은 읽히지 않고
+TTL이 지나면 사라집니다.
+
+타임라인은 수 MB짜리 문서라 전체를 파싱하면 메모리를 많이 쓰므로, ijson이 설치되어 있으면
+응답 바이트를 받는 대로 토큰 단위로 읽어 축약본에 필요한 필드만 모읍니다(TimelineStreamProjector).
+ijson이 없으면 전체를 파싱한 뒤 project_timeline으로 축약합니다.
+"""
+from typing import Any, Dict, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+
+MATCH_PROJECTION_VERSION = 1
+TIMELINE_PROJECTION_VERSION = 1
+
+# main.py의 매치 카드/참가자 표에서 쓰는 참가자 필드
+PARTICIPANT_FIELDS = (
+    "puuid", "teamId", "win", "championName", "teamPosition",
+    "summonerName", "riotIdGameName", "riotIdTagline",
+    "kills", "deaths", "assists",
+    "visionScore", "wardsKilled", "wardsPlaced",
+    "totalMinionsKilled", "neutralMinionsKilled",
+    "totalDamageDealtToChampions", "goldEarned",
+    "summoner1Id", "summoner2Id",
+    "item0", "item1", "item2", "item3", "item4", "item5", "item6",
+)
+
+# 분석기에서 쓰는 타임라인 이벤트 종류와 필드
+TIMELINE_EVENT_TYPES = {"CHAMPION_KILL", "CHAMPION_SPECIAL_KILL", "ELITE_MONSTER_KILL", "BUILDING_KILL"}
+TIMELINE_EVENT_FIELDS = ("type", "timestamp", "killerId", "victimId", "position", "killType",
+                         "monsterType", "buildingType", "teamId")
+_SCALAR_EVENTS = {"string", "number", "boolean", "null"}
+
+
+def project_participant(participant: Dict[str, Any]) -> Dict[str, Any]:
+    projected = {field: participant.get(field) for field in PARTICIPANT_FIELDS}
+    projected["neutralMinionsKilled"] = participant.get("neutralMinionsKilled", 0)
+    projected["challenges"] = {"kda": participant.get("challenges", {}).get("kda", 0)}
+    return projected
+
+
+def project_team(team: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "teamId": team.get("teamId"),
+        "win": team.get("win"),
+        "bans": [{"championId": ban.get("championId", -1), "pickTurn": ban.get("pickTurn")} for ban in team.get("bans", [])],
+        "objectives": team.get("objectives", {}),
+    }
+
+
+def project_match(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """match-v5 상세 응답 -> 매치 카드 렌더링에 필요한 필드만 남긴 축약본"""
+    if not raw:
+        return None
+    info = raw.get("info", {})
+    return {
+        "matchId": raw.get("metadata", {}).get("matchId"),
+        "gameMode": info.get("gameMode"),
+        "queueId": info.get("queueId"),
+        "gameDuration": info.get("gameDuration"),
+        "participants": [project_participant(p) for p in info.get("participants", [])],
+        "teams": [project_team(t) for t in info.get("teams", [])],
+    }
+
+
+def project_timeline(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """타임라인 응답 -> 참가자 위치와 킬/오브젝트 이벤트만 남긴 축약본 (원본과 같은 구조)"""
+    if not raw or "info" not in raw:
+        return None
+    info = raw["info"]
+    frames = []
+    for frame in info.get("frames", []):
+        participant_frames = {
+            pid: {"position": p_frame["position"]}
+            for pid, p_frame in frame.get("participantFrames", {}).items()
+            if "position" in p_frame
+        }
+        events = [
+            {field: event[field] for field in TIMELINE_EVENT_FIELDS if field in event}
+            for event in frame.get("events", [])
+            if event.get("type") in TIMELINE_EVENT_TYPES
+        ]
+        frames.append({"timestamp": frame.get("timestamp"), "participantFrames": participant_frames, "events": events})
+    return {
+        "metadata": {
+            "matchId": raw.get("metadata", {}).get("matchId"),
+            "participants": raw.get("metadata", {}).get("participants", []),
+        },
+        "info": {
+            "frameInterval": info.get("frameInterval"),
+            "participants": [{"participantId": p.get("participantId"), "puuid": p.get("puuid")}
+                             for p in info.get("participants", [])],
+            "frames": frames,
+        },
+    }
+
+
+class TimelineStreamProjector:
+    """ijson.parse의 (prefix, event, value) 토큰을 받아 project_timeline과 같은 축약본을 만듦
+
+    필요한 필드(위치, 관심 이벤트의 일부 필드, 참가자 매핑)만 모으고 나머지 토큰은 버리므로
+    원본 전체를 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self):
+        self.match_id = None
+        self.metadata_participants = []
+        self.frame_interval = None
+        self.participants = []
+        self.frames = []
+        self._frame: Dict[str, Any] = {}
+        self._event: Dict[str, Any] = {}
+
+    def feed(self, prefix: str, event: str, value: Any):
+        if prefix.startswith("info.frames.item"):
+            self._feed_frame(prefix[16:], event, value)
+        elif prefix.startswith("info.participants.item"):
+            rest = prefix[22:]
+            if not rest:
+                if event == "start_map":
+                    self.participants.append({"participantId": None, "puuid": None})
+            elif rest in (".participantId", ".puuid"):
+                self.participants[-1][rest[1:]] = value
+        elif prefix == "metadata.participants.item":
+            self.metadata_participants.append(value)
+        elif prefix == "metadata.matchId":
+            self.match_id = value
+        elif prefix == "info.frameInterval":
+            self.frame_interval = value
+
+    def _feed_frame(self, rest: str, event: str, value: Any):
+        if not rest:
+            if event == "start_map":
+                self._frame = {"timestamp": None, "participantFrames": {}, "events": []}
+                self.frames.append(self._frame)
+        elif rest.startswith(".participantFrames."):
+            # "<participantId>.position.x" 형태만 사용
+            participant_id, _, field = rest[19:].partition(".")
+            if field in ("position.x", "position.y"):
+                p_frame = self._frame["participantFrames"].setdefault(participant_id, {"position": {}})
+                p_frame["position"][field[-1]] = value
+        elif rest.startswith(".events.item"):
+            field = rest[13:]
+            if not field:
+                if event == "start_map":
+                    self._event = {}
+                elif event == "end_map" and self._event.get("type") in TIMELINE_EVENT_TYPES:
+                    event_fields = self._event
+                    self._frame["events"].append({f: event_fields[f] for f in TIMELINE_EVENT_FIELDS if f in event_fields})
+            elif field in ("position.x", "position.y"):
+                self._event.setdefault("position", {})[field[-1]] = value
+            elif event in _SCALAR_EVENTS and field in TIMELINE_EVENT_FIELDS:
+                self._event[field] = value
+        elif rest == ".timestamp":
+            self._frame["timestamp"] = value
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        if not self.frames and self.frame_interval is None:
+            return None
+        return {
+            "metadata": {"matchId": self.match_id, "participants": self.metadata_participants},
+            "info": {
+                "frameInterval": self.frame_interval,
+                "participants": self.participants,
+                "frames": self.frames,
+            },
+        }
+
+
+async def project_timeline_stream(response) -> Optional[Dict[str, Any]]:
+    """aiohttp 응답 본문을 받는 대로 파싱해 타임라인 축약본을 만듦 (ijson이 없으면 전체 파싱 후 축약)"""
+    if ijson is None:
+        return project_timeline(await response.json())
+    projector = TimelineStreamProjector()
+    try:
+        async for prefix, event, value in ijson.parse_async(response.content, use_float=True):
+            projector.feed(prefix, event, value)
+    except ijson.JSONError as e:
+        raise ValueError(f"타임라인 JSON 파싱 실패: {e}") from e
+    return projector.result()
+
+
+def project_timeline_stream_sync(response) -> Optional[Dict[str, Any]]:
+    """requests 응답(stream=True)을 받는 대로 파싱해 타임라인 축약본을 만듦 (ijson이 없으면 전체 파싱 후 축약)"""
+    if ijson is None:
+        return project_timeline(response.json())
+    response.raw.decode_content = True  # gzip 등 전송 인코딩 해제
+    projector = TimelineStreamProjector()
+    try:
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            projector.feed(prefix, event, value)
+    except ijson.JSONError as e:
+        raise ValueError(f"타임라인 JSON 파싱 실패: {e}") from e
+    return projector.result()
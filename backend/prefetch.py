@@ -0,0 +1,277 @@
+"""최근 검색/추적 중인 소환사의 응답을 미리 만들어 두는 백그라운드 prefetch.
+
+/analyze-user를 처음 요청하는 사용자는 계정 조회, 리그, 매치 ID, 매치 상세 20개, 타임라인 분석까지
+콜드 경로를 모두 거칩니다. Prefetcher는 최근 검색된(PREFETCH_RECENT_TTL 안) 소환사와 명시적으로 추적 중인
+소환사를 PREFETCH_POLL_INTERVAL마다 작업 큐에 넣고, 워커가 새 매치를 확인해 매치 상세/타임라인/분석을 받아
+/analyze-user 응답 캐시까지 채워 둡니다. 자주 보는 사용자의 /analyze-user는 응답 캐시 적중으로 끝납니다.
+
+Riot 호출은 rate_limiter.BackgroundScheduler를 쓰는 별도 클라이언트로 보내므로 Rate Limit 예산 중 남는 몫만
+쓰고, 예산을 기다리는 대화형 요청이 있으면 양보합니다. 실제로 무엇을 받아 둘지는 warm 콜백(main.prefetch_player)이
+정합니다.
+
+저장소:
+    local - 프로세스 메모리 (asyncio 큐). 워커(프로세스)마다 따로 prefetch
+    redis - 소환사 목록(해시)과 작업 큐(리스트)를 Redis에 두어 여러 워커가 나눠 처리 (PREFETCH_STORE=redis)
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from cache_manager import AsyncCacheManager
+from rate_limiter import Priority, priority
+
+ENABLED = os.environ.get("PREFETCH_ENABLED", "1") != "0"
+STORE = os.environ.get("PREFETCH_STORE", "local")
+# 같은 소환사를 다시 확인하는 간격 (초)
+POLL_INTERVAL = int(os.environ.get("PREFETCH_POLL_INTERVAL", 300))
+# 마지막 검색 후 이 시간이 지나면 prefetch 대상에서 뺌 (추적 중인 소환사는 제외)
+RECENT_TTL = int(os.environ.get("PREFETCH_RECENT_TTL", 86400))
+MAX_PLAYERS = int(os.environ.get("PREFETCH_MAX_PLAYERS", 200))
+# 동시에 prefetch할 소환사 수
+CONCURRENCY = int(os.environ.get("PREFETCH_CONCURRENCY", 2))
+# Rate Limit 각 구간에서 대화형 요청 몫으로 남겨 둘 비율
+RESERVE = float(os.environ.get("PREFETCH_RESERVE", 0.5))
+# 소환사마다 기억할 요청 형태(limit, fields) 수
+MAX_VARIANTS = 4
+SCHEDULE_TICK = 10  # 대상 소환사를 훑어 큐에 넣는 주기 (초)
+
+# 소환사 항목: {"game_name", "tag_line", "variants": [[limit, fields]], "last_seen", "tracked", "prefetched_at"}
+Player = Dict[str, Any]
+
+
+def new_player(game_name: str, tag_line: str) -> Player:
+    return {"game_name": game_name, "tag_line": tag_line, "variants": [], "last_seen": 0.0, "tracked": False,
+            "prefetched_at": 0.0}
+
+
+def add_variant(player: Player, limit: int, fields: Optional[str]) -> Player:
+    """최근 요청 형태를 앞에 두고 MAX_VARIANTS개만 유지한 새 항목"""
+    variant = [limit, fields]
+    variants = [variant] + [v for v in player["variants"] if v != variant]
+    return {**player, "variants": variants[:MAX_VARIANTS]}
+
+
+def is_due(player: Player, now: float) -> bool:
+    return now - player["prefetched_at"] >= POLL_INTERVAL
+
+
+def is_expired(player: Player, now: float) -> bool:
+    return not player["tracked"] and now - player["last_seen"] >= RECENT_TTL
+
+
+class LocalStore:
+    """프로세스 메모리 저장소"""
+
+    def __init__(self):
+        self._players: Dict[str, Player] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._queued: Set[str] = set()
+
+    async def get_player(self, puuid: str) -> Optional[Player]:
+        return self._players.get(puuid)
+
+    async def put_player(self, puuid: str, player: Player):
+        self._players[puuid] = player
+
+    async def remove_player(self, puuid: str):
+        self._players.pop(puuid, None)
+
+    async def players(self) -> Dict[str, Player]:
+        return dict(self._players)
+
+    async def push(self, puuid: str) -> bool:
+        """큐에 없을 때만 넣음"""
+        if puuid in self._queued:
+            return False
+        self._queued.add(puuid)
+        self._queue.put_nowait(puuid)
+        return True
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        try:
+            puuid = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._queued.discard(puuid)
+        return puuid
+
+    async def queued(self) -> int:
+        return self._queue.qsize()
+
+
+class RedisStore:
+    """Redis 저장소: 소환사 목록은 해시, 작업 큐는 리스트 + 중복 방지 집합. Redis를 쓸 수 없으면 아무것도 하지 않음"""
+
+    PLAYERS_KEY = "prefetch:players"
+    QUEUE_KEY = "prefetch:queue"
+    QUEUED_KEY = "prefetch:queued"
+
+    def __init__(self, cache: AsyncCacheManager):
+        self.cache = cache
+
+    def _client(self):
+        return self.cache.redis_client if self.cache.is_available() else None
+
+    async def _call(self, action: str, fn: Callable[[Any], Awaitable[Any]], default: Any = None) -> Any:
+        client = self._client()
+        if client is None:
+            return default
+        try:
+            return await fn(client)
+        except Exception as e:
+            print(f"prefetch {action} 실패: {e}")
+            return default
+
+    async def get_player(self, puuid: str) -> Optional[Player]:
+        raw = await self._call("소환사 조회", lambda client: client.hget(self.PLAYERS_KEY, puuid))
+        return json.loads(raw) if raw else None
+
+    async def put_player(self, puuid: str, player: Player):
+        await self._call("소환사 저장", lambda client: client.hset(self.PLAYERS_KEY, puuid, json.dumps(player, ensure_ascii=False)))
+
+    async def remove_player(self, puuid: str):
+        await self._call("소환사 삭제", lambda client: client.hdel(self.PLAYERS_KEY, puuid))
+
+    async def players(self) -> Dict[str, Player]:
+        raw = await self._call("소환사 목록 조회", lambda client: client.hgetall(self.PLAYERS_KEY), {})
+        return {key.decode() if isinstance(key, bytes) else key: json.loads(value) for key, value in raw.items()}
+
+    async def push(self, puuid: str) -> bool:
+        async def push(client):
+            if not await client.sadd(self.QUEUED_KEY, puuid):
+                return False
+            await client.rpush(self.QUEUE_KEY, puuid)
+            return True
+
+        return await self._call("작업 추가", push, False)
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        async def pop(client):
+            item = await client.blpop([self.QUEUE_KEY], timeout=max(1, int(timeout)))
+            if item is None:
+                return None
+            puuid = item[1].decode() if isinstance(item[1], bytes) else item[1]
+            await client.srem(self.QUEUED_KEY, puuid)
+            return puuid
+
+        if self._client() is None:
+            await asyncio.sleep(timeout)  # Redis가 돌아올 때까지 대기
+            return None
+        return await self._call("작업 꺼내기", pop)
+
+    async def queued(self) -> int:
+        return await self._call("큐 길이 조회", lambda client: client.llen(self.QUEUE_KEY), 0)
+
+
+class Prefetcher:
+    def __init__(self, warm: Callable[[str, Player], Awaitable[bool]], store=None):
+        """warm(puuid, player): 소환사 하나의 응답을 미리 만듦. 새로 만든 것이 있으면 True"""
+        self.warm = warm
+        self.store = store or LocalStore()
+        self.warmed = 0  # 새로 만들어 둔 횟수
+        self.fresh = 0  # 이미 최신이라 건너뛴 횟수
+        self.errors = 0
+
+    async def note_search(self, puuid: str, game_name: str, tag_line: str, limit: int, fields: Optional[str]):
+        """/analyze-user 검색 기록 (같은 요청 형태로 미리 만들어 둘 대상)"""
+        player = await self.store.get_player(puuid) or new_player(game_name, tag_line)
+        # 방금 응답을 만들었으므로 다음 확인은 POLL_INTERVAL 뒤부터
+        player = {**add_variant(player, limit, fields), "game_name": game_name, "tag_line": tag_line,
+                  "last_seen": time.time(), "prefetched_at": time.time()}
+        await self.store.put_player(puuid, player)
+
+    async def track(self, puuid: str, game_name: str, tag_line: str, limit: int, fields: Optional[str]):
+        """명시적 추적 (검색하지 않아도 계속 prefetch)"""
+        player = await self.store.get_player(puuid) or new_player(game_name, tag_line)
+        player = {**add_variant(player, limit, fields), "tracked": True}
+        await self.store.put_player(puuid, player)
+        await self.store.push(puuid)
+
+    async def untrack(self, puuid: str) -> bool:
+        player = await self.store.get_player(puuid)
+        if player is None:
+            return False
+        await self.store.put_player(puuid, {**player, "tracked": False})
+        return True
+
+    async def schedule(self, now: Optional[float] = None) -> int:
+        """만료된 소환사를 정리하고, 확인할 때가 된 소환사를 큐에 넣음. 넣은 수를 반환"""
+        now = now if now is not None else time.time()
+        players = await self.store.players()
+        for puuid, player in list(players.items()):
+            if is_expired(player, now):
+                await self.store.remove_player(puuid)
+                del players[puuid]
+        # 너무 많으면 오래 검색하지 않은 소환사부터 뺌
+        untracked = sorted((p["last_seen"], puuid) for puuid, p in players.items() if not p["tracked"])
+        for _, puuid in untracked[:max(0, len(players) - MAX_PLAYERS)]:
+            await self.store.remove_player(puuid)
+            del players[puuid]
+        pushed = 0
+        for puuid, player in players.items():
+            if is_due(player, now) and await self.store.push(puuid):
+                pushed += 1
+        return pushed
+
+    async def process(self, puuid: str):
+        player = await self.store.get_player(puuid)
+        if player is None or not is_due(player, time.time()):
+            return
+        # 시작할 때 시각을 바꿔 두어, 처리 중에 스케줄러가 같은 소환사를 다시 큐에 넣지 않게 함
+        await self.store.put_player(puuid, {**player, "prefetched_at": time.time()})
+        try:
+            # prefetch가 시작한 병합 호출도 prefetch 우선순위로 보냄 (대화형 요청이 합류하면 그때 올라감)
+            with priority(Priority.PREFETCH):
+                warmed = await self.warm(puuid, player)
+            if warmed:
+                self.warmed += 1
+            else:
+                self.fresh += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"prefetch 실패 ({player['game_name']}#{player['tag_line']}): {e}")
+
+    async def _worker(self):
+        while True:
+            puuid = await self.store.pop(SCHEDULE_TICK)
+            if puuid is not None:
+                await self.process(puuid)
+
+    async def _scheduler(self):
+        while True:
+            try:
+                await self.schedule()
+            except Exception as e:
+                print(f"prefetch 스케줄 실패: {e}")
+            await asyncio.sleep(SCHEDULE_TICK)
+
+    async def run(self):
+        """앱 수명 동안 실행 (lifecycle.Warmup.add_background로 등록, 종료 시 취소)"""
+        tasks = [asyncio.ensure_future(self._scheduler())]
+        tasks += [asyncio.ensure_future(self._worker()) for _ in range(CONCURRENCY)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stats(self) -> Dict[str, Any]:
+        players = await self.store.players()
+        return {
+            "store": type(self.store).__name__,
+            "players": len(players),
+            "tracked": sum(1 for p in players.values() if p["tracked"]),
+            "queued": await self.store.queued(),
+            "warmed": self.warmed,
+            "fresh": self.fresh,
+            "errors": self.errors,
+        }
+
+
+def create_store(cache: AsyncCacheManager):
+    if STORE == "redis" and isinstance(cache, AsyncCacheManager):
+        return RedisStore(cache)
+    return LocalStore()
@@ -0,0 +1,576 @@
+"""Riot API Rate Limit 스케줄러.
+
+Riot은 API 키마다 리전(호스트) 단위의 애플리케이션 제한(X-App-Rate-Limit)과
+엔드포인트(메서드) 단위의 제한(X-Method-Rate-Limit)을 "요청수:초" 목록으로 내려줍니다.
+예) X-App-Rate-Limit: 20:1,100:120  -> 1초에 20회, 120초에 100회
+
+RateLimitScheduler는 (리전, 메서드)별로 각 제한 구간의 최근 요청 시각을 기록해 두고,
+모든 구간에 여유가 생길 때까지 요청을 대기시킵니다. 응답 헤더를 받을 때마다 제한값을
+갱신하고, 429 응답은 Retry-After 만큼 해당 버킷을 막은 뒤 재시도하도록 대기 시간을 돌려줍니다.
+동기(RiotAPI)/비동기(AsyncRiotAPI) 클라이언트가 같은 인스턴스를 공유할 수 있도록
+내부 상태는 threading.Lock으로 보호합니다.
+
+예산을 기다리는 요청은 우선순위(Priority)별로 줄을 세웁니다. 예산이 나면 지금 보낼 수 있는 요청 중
+우선순위가 가장 높은 것부터 보내고, 같은 우선순위 안에서는 클라이언트(요청한 사용자)별로 번갈아 보냅니다
+(start-time fair queuing). 낮은 우선순위는 각 제한의 일부(PRIORITY_RESERVE)를 남겨 두므로, 한 사용자의
+매치 상세 수십 건이 예산을 쓰는 중에도 다른 사용자의 /current-game 조회는 바로 나갑니다.
+기다리는 요청은 rank 순 힙에 두고, 예산이 다시 생기는 시각에 깨어난 요청 하나가 다음 차례들을 직접 깨웁니다
+(주기적으로 줄 전체를 다시 훑지 않음).
+우선순위와 클라이언트는 contextvars로 전달하므로(priority(), client_scope()) 호출 경로에 인자를 추가하지
+않아도 되고, 그 안에서 만든 Task와 asyncio.to_thread에도 이어집니다.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+# 헤더를 받기 전까지 사용할 기본 애플리케이션 제한 (개발용 키 기준)
+DEFAULT_APP_RATE_LIMIT = "20:1,100:120"
+# 429 응답에 Retry-After가 없을 때 사용할 지수 백오프 (초)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# 네트워크 지연으로 서버 도착 시각이 흔들려도 윈도우 경계를 넘지 않도록 두는 여유 (초)
+WINDOW_MARGIN = 0.1
+# 클라이언트별 공정 분배 태그가 이보다 많아지면 이미 지난 태그를 정리
+MAX_FAIR_TAGS = 1024
+
+
+class Priority(IntEnum):
+    """Riot 호출 우선순위 (작을수록 먼저 보냄)"""
+    INTERACTIVE = 0  # 화면 하나를 그리는 단건 조회 (계정, 리그, 소환사, 현재 게임, 최근 매치 ID, 매치 하나)
+    FANOUT = 1  # 한 응답을 위한 다건 조회 (매치 상세 배치, 타임라인 분석)
+    BACKFILL = 2  # 과거 기록 대량 조회 (오래된 매치 ID 페이지, 추세 분석)
+    PREFETCH = 3  # 백그라운드 prefetch
+
+
+# 우선순위별로 각 제한에서 쓰지 않고 남겨 둘 최소 비율. 다건/대량 조회가 예산을 다 써도 단건 조회는
+# 다음 슬롯을 기다리지 않고 바로 나갈 수 있게 함 (예: 20:1이면 FANOUT 18회, BACKFILL 15회, PREFETCH 10회까지)
+PRIORITY_RESERVE = {
+    Priority.INTERACTIVE: 0.0,
+    Priority.FANOUT: 0.1,
+    Priority.BACKFILL: 0.25,
+    Priority.PREFETCH: 0.5,
+}
+
+_priority: ContextVar[Priority] = ContextVar("riot_priority", default=Priority.INTERACTIVE)
+_client: ContextVar[str] = ContextVar("riot_client", default="")
+_shared: ContextVar[Optional["SharedPriority"]] = ContextVar("riot_shared_priority", default=None)
+
+
+class SharedPriority:
+    """single-flight로 병합된 호출 하나의 우선순위: 그 결과를 기다리는 호출자 중 가장 높은 우선순위.
+
+    추세 분석(BACKFILL)이 시작한 타임라인 조회에 /analyze-user(INTERACTIVE)가 합류하면 그 조회의 Riot 호출도
+    INTERACTIVE로 올라가고, 합류한 호출자가 빠지면 다시 내려갑니다. 병합된 호출 안에서 또 병합된 호출을 기다리면
+    바깥 호출의 우선순위가 바뀔 때 안쪽도 따라 바뀝니다.
+    """
+
+    def __init__(self):
+        self._callers: Dict[int, Tuple[Priority, Optional["SharedPriority"]]] = {}  # 토큰 -> (호출자 우선순위, 호출자가 속한 병합 호출)
+        self._tokens = itertools.count()
+        self._children: Dict["SharedPriority", int] = {}  # 이 병합 호출 안에서 기다리는 병합 호출 -> 호출자 수
+        self._waiters: Dict["_Waiter", "RateLimitScheduler"] = {}  # 이 우선순위로 예산을 기다리는 요청
+        self._level = Priority.PREFETCH
+
+    def level(self) -> Priority:
+        return self._level
+
+    def join(self) -> int:
+        """현재 컨텍스트의 호출자를 합류시키고 leave에 넘길 토큰을 반환"""
+        token = next(self._tokens)
+        parent = _shared.get()
+        self._callers[token] = (_priority.get(), parent)
+        if parent is not None:
+            parent._children[self] = parent._children.get(self, 0) + 1
+        self._refresh()
+        return token
+
+    def leave(self, token: int):
+        _, parent = self._callers.pop(token)
+        if parent is not None:
+            parent._children[self] -= 1
+            if not parent._children[self]:
+                del parent._children[self]
+        self._refresh()
+
+    def _refresh(self):
+        level = min((_level_of(var, parent) for var, parent in self._callers.values()), default=Priority.PREFETCH)
+        if level == self._level:
+            return
+        self._level = level
+        for waiter, scheduler in list(self._waiters.items()):
+            scheduler._rerank(waiter)
+        for child in list(self._children):
+            child._refresh()
+
+
+def _level_of(var: Priority, shared: Optional[SharedPriority]) -> Priority:
+    return max(var, shared.level()) if shared is not None else var
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """이 블록에서 보내는 Riot 호출(과 여기서 만든 Task, to_thread)의 우선순위를 level로 낮춤.
+    이미 더 낮은 우선순위(예: prefetch 안의 매치 상세 배치)면 그대로 둠"""
+    token = _priority.set(max(_priority.get(), level))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def client_scope(client: str) -> Iterator[None]:
+    """이 블록의 Riot 호출을 client(요청한 사용자) 몫으로 셈 (같은 우선순위 안의 공정 분배 단위)"""
+    token = _client.set(client)
+    try:
+        yield
+    finally:
+        _client.reset(token)
+
+
+@contextmanager
+def shared_scope(shared: SharedPriority) -> Iterator[None]:
+    """이 블록에서 만든 Task(single-flight의 병합 호출)의 Riot 호출은 shared의 우선순위를 따름.
+    Task 안에서 priority()로 낮추는 것(예: 이전 매치 페이지는 BACKFILL)은 그 위에 그대로 적용"""
+    priority_token = _priority.set(Priority.INTERACTIVE)
+    shared_token = _shared.set(shared)
+    try:
+        yield
+    finally:
+        _shared.reset(shared_token)
+        _priority.reset(priority_token)
+
+
+def current_priority() -> Priority:
+    return _level_of(_priority.get(), _shared.get())
+
+
+def parse_rate_limits(header: Optional[str]) -> List[Tuple[int, int]]:
+    """'20:1,100:120' 형식의 헤더를 [(20, 1), (100, 120)]으로 변환"""
+    limits = []
+    if not header:
+        return limits
+    for part in header.split(","):
+        try:
+            count, seconds = part.strip().split(":")
+            limits.append((int(count), int(seconds)))
+        except ValueError:
+            continue
+    return limits
+
+
+def region_of(url: str) -> str:
+    """요청 URL에서 리전 키(호스트)를 추출 (예: asia.api.riotgames.com)"""
+    return urlsplit(url).netloc
+
+
+class RateLimitWindow:
+    """'limit회 / seconds초' 제한 하나.
+
+    최근 seconds초 동안 발급한 요청 시각을 보관하므로, 어느 구간을 잘라 봐도
+    limit회를 넘지 않습니다 (Riot의 고정 윈도우 제한보다 항상 보수적).
+    """
+
+    def __init__(self, limit: int, seconds: int):
+        self.limit = limit
+        self.seconds = seconds
+        self.slots: deque = deque()
+
+    def _expire(self, now: float):
+        while self.slots and self.slots[0] <= now - self.seconds - WINDOW_MARGIN:
+            self.slots.popleft()
+
+    def wait_time(self, now: float, reserve: float = 0.0) -> float:
+        """지금 요청을 보내려면 기다려야 하는 시간 (0이면 바로 가능)
+
+        reserve는 쓰지 않고 남겨 둘 비율입니다 (백그라운드 작업이 대화형 요청 몫을 쓰지 않도록).
+        """
+        self._expire(now)
+        limit = self.limit - math.ceil(self.limit * reserve)
+        if limit <= 0:
+            return float(self.seconds)
+        if len(self.slots) < limit:
+            return 0.0
+        return self.slots[len(self.slots) - limit] + self.seconds + WINDOW_MARGIN - now
+
+    def record(self, now: float):
+        self.slots.append(now)
+
+    def sync_count(self, count: int, now: float):
+        """서버가 알려준 사용량(X-*-Rate-Limit-Count)이 로컬 기록보다 많으면 맞춰 채움.
+
+        같은 키를 쓰는 다른 워커/프로세스의 사용량을 반영하기 위함입니다.
+        """
+        self._expire(now)
+        missing = min(count, self.limit) - len(self.slots)
+        for _ in range(missing):
+            self.slots.append(now)
+
+
+class _Waiter:
+    """예산을 기다리는 요청 하나. rank = (우선순위, 공정 분배 시작 태그, 도착 순서)
+
+    차례가 오면 스케줄러가 granted를 세우고 깨웁니다. 제한에 막힌 요청 중 (제한, reserve)마다 가장 앞선 하나만
+    wake_at(예산이 다시 생기는 시각)에 스스로 깨어나 차례를 다시 나누고, 나머지는 깨울 때까지 잠들어 있습니다.
+    """
+    __slots__ = ("rank", "keys", "reserve", "granted", "cancelled", "wake_at", "var", "shared", "base_reserve",
+                 "reserve_level", "_event", "_loop")
+
+    def __init__(self, rank: Tuple[int, float, int], keys: Tuple[Tuple[str, ...], ...], reserve: float,
+                 loop: Optional[asyncio.AbstractEventLoop]):
+        self.rank = rank
+        self.keys = keys
+        self.reserve = reserve
+        self.granted = False
+        self.cancelled = False
+        self.wake_at: Optional[float] = None
+        # 우선순위를 다시 계산할 때 쓰는 값 (병합된 호출에 더 높은 우선순위 호출자가 합류하면 올라감)
+        self.var = Priority.INTERACTIVE
+        self.shared: Optional[SharedPriority] = None
+        self.base_reserve = reserve
+        self.reserve_level: Optional[Priority] = None
+        self._loop = loop  # None이면 동기(스레드) 대기
+        self._event: Union[asyncio.Event, threading.Event] = asyncio.Event() if loop is not None else threading.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return self.rank < other.rank
+
+    def level(self) -> Priority:
+        return _level_of(self.var, self.shared)
+
+    def wake(self):
+        """다른 스레드(동기 클라이언트)에서 불러도 됨"""
+        if self._loop is None:
+            self._event.set()
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 닫힘
+
+
+class RateLimitScheduler:
+    def __init__(self, app_rate_limit: Optional[str] = None, prioritize: bool = True):
+        self._lock = threading.Lock()
+        self._default_app_limits = parse_rate_limits(
+            app_rate_limit or os.environ.get("RIOT_APP_RATE_LIMIT") or DEFAULT_APP_RATE_LIMIT
+        )
+        self._windows: Dict[Tuple[str, ...], List[RateLimitWindow]] = {}
+        self._blocked_until: Dict[Tuple[str, ...], float] = {}
+        # prioritize=False면 우선순위/클라이언트 구분 없이 도착 순서대로 보냄 (벤치마크 비교용)
+        self.prioritize = prioritize
+        self._heap: List[_Waiter] = []  # 기다리는 요청 (rank 순 힙, 취소된 요청은 꺼낼 때 버림)
+        # 마지막으로 차례를 나눈 뒤 힙에 남은 요청은 모두 제한에 막혀 있음. (제한, reserve)마다 가장 앞선 요청과
+        # 그 중 가장 이른 깨어날 시각. 그 전에 들어온 요청은 자기 제한만 확인하면 됨
+        self._heads: Dict[Tuple[Tuple[Tuple[str, ...], ...], float], _Waiter] = {}
+        self._next_wake = math.inf
+        self._seq = itertools.count()
+        self._virtual: Dict[Priority, float] = {}  # 우선순위 -> 마지막으로 보낸 요청의 시작 태그
+        self._finish: Dict[Tuple[Priority, str], float] = {}  # (우선순위, 클라이언트) -> 마지막 요청의 끝 태그
+
+    @staticmethod
+    def _app_key(region: str) -> Tuple[str, ...]:
+        return ("app", region)
+
+    @staticmethod
+    def _method_key(region: str, method: str) -> Tuple[str, ...]:
+        return ("method", region, method)
+
+    def _get_windows(self, key: Tuple[str, ...]) -> List[RateLimitWindow]:
+        windows = self._windows.get(key)
+        if windows is None:
+            # 메서드 제한은 첫 응답 헤더를 받기 전까지 알 수 없으므로 비워 둠
+            limits = self._default_app_limits if key[0] == "app" else []
+            windows = [RateLimitWindow(count, seconds) for count, seconds in limits]
+            self._windows[key] = windows
+        return windows
+
+    def _set_limits(self, key: Tuple[str, ...], limits: List[Tuple[int, int]]) -> bool:
+        """제한값이 바뀌었으면 True"""
+        current = self._get_windows(key)
+        if [(w.limit, w.seconds) for w in current] == limits:
+            return False
+        # 제한값이 바뀌면 같은 구간 길이의 기존 기록은 유지
+        previous = {w.seconds: w for w in current}
+        windows = []
+        for count, seconds in limits:
+            window = RateLimitWindow(count, seconds)
+            if seconds in previous:
+                window.slots = previous[seconds].slots
+            windows.append(window)
+        self._windows[key] = windows
+        return True
+
+    def _wait_locked(self, keys: Tuple[Tuple[str, ...], ...], now: float, reserve: float) -> float:
+        wait = 0.0
+        for key in keys:
+            wait = max(wait, self._blocked_until.get(key, 0.0) - now)
+            for window in self._get_windows(key):
+                wait = max(wait, window.wait_time(now, reserve))
+        return wait
+
+    def _enqueue(self, region: str, method: str, reserve: float, level: Optional[Priority],
+                 loop: Optional[asyncio.AbstractEventLoop]) -> _Waiter:
+        keys = (self._app_key(region), self._method_key(region, method))
+        shared = _shared.get()
+        # 병합된 호출 안에서는 level 대신 그 결과를 기다리는 호출자들의 우선순위를 따름
+        var = level if level is not None and shared is None else _priority.get()
+        with self._lock:
+            waiter = _Waiter((0, 0.0, next(self._seq)), keys, reserve, loop)
+            waiter.var, waiter.shared, waiter.reserve_level = var, shared, level
+            if self.prioritize:
+                level = waiter.level()
+                waiter.reserve = self._reserve_of(waiter, level)
+                # 클라이언트마다 요청 하나에 태그 1씩: 밀린 요청이 많은 클라이언트는 뒤로, 새로 온 클라이언트는 지금 차례부터
+                fair_key = (level, _client.get())
+                start = max(self._virtual.get(level, 0.0), self._finish.get(fair_key, 0.0))
+                self._finish[fair_key] = start + 1
+                waiter.rank = (int(level), start, waiter.rank[2])
+            self._admit_locked(waiter, time.monotonic())
+            if shared is not None and not waiter.granted:
+                shared._waiters[waiter] = self
+        return waiter
+
+    @staticmethod
+    def _reserve_of(waiter: _Waiter, level: Priority) -> float:
+        """호출자가 준 reserve는 그 우선순위(reserve_level) 그대로일 때만 적용 (병합 호출로 올라가면 남겨 둘 몫도 줄어듦)"""
+        reserve = waiter.base_reserve if waiter.reserve_level is None or level >= waiter.reserve_level else 0.0
+        return max(reserve, PRIORITY_RESERVE[level])
+
+    def _rerank(self, waiter: _Waiter):
+        """병합된 호출의 우선순위가 바뀌면 기다리는 요청의 차례를 다시 정함 (새 우선순위의 지금 차례부터)"""
+        with self._lock:
+            if waiter.granted or waiter.cancelled or not self.prioritize:
+                return
+            level = waiter.level()
+            if level == waiter.rank[0]:
+                return
+            waiter.rank = (int(level), self._virtual.get(level, 0.0), waiter.rank[2])
+            waiter.reserve = self._reserve_of(waiter, level)
+            heapq.heapify(self._heap)
+            self._dispatch_locked(time.monotonic())
+
+    def _admit_locked(self, waiter: _Waiter, now: float):
+        """새 요청: 힙의 요청은 모두 막혀 있으므로 이 요청의 제한만 확인해 바로 보내거나 줄에 넣음"""
+        if now >= self._next_wake:
+            heapq.heappush(self._heap, waiter)
+            self._dispatch_locked(now)
+            return
+        combo = (waiter.keys, waiter.reserve)
+        head = self._heads.get(combo)
+        if head is not None and head.cancelled:
+            heapq.heappush(self._heap, waiter)
+            self._dispatch_locked(now)
+            return
+        if head is None:
+            wait = self._wait_locked(waiter.keys, now, waiter.reserve)
+            if wait <= 0:
+                self._grant_locked(waiter, now)
+                return
+            wake_at = now + wait
+        else:
+            if head.rank < waiter.rank:  # 같은 제한에 막힌 앞선 요청이 깨어날 때 차례를 나눔
+                heapq.heappush(self._heap, waiter)
+                return
+            wake_at, head.wake_at = head.wake_at, None
+        heapq.heappush(self._heap, waiter)
+        self._heads[combo] = waiter
+        waiter.wake_at = wake_at
+        self._next_wake = min(self._next_wake, wake_at)
+
+    def _dispatch_locked(self, now: float):
+        """기다리는 요청을 rank 순으로 보며 지금 보낼 수 있는 요청을 모두 보내고, 막힌 요청은 (제한, reserve)마다
+        가장 앞선 하나에만 다시 확인할 시각을 맡김"""
+        heads: Dict[Tuple[Tuple[Tuple[str, ...], ...], float], _Waiter] = {}
+        remaining: List[_Waiter] = []
+        while self._heap:
+            waiter = heapq.heappop(self._heap)
+            if waiter.cancelled:
+                continue
+            combo = (waiter.keys, waiter.reserve)
+            if combo in heads:
+                waiter.wake_at = None
+                remaining.append(waiter)
+                continue
+            wait = self._wait_locked(waiter.keys, now, waiter.reserve)
+            if wait > 0:
+                heads[combo] = waiter
+                remaining.append(waiter)
+                if waiter.wake_at != now + wait:
+                    waiter.wake_at = now + wait
+                    waiter.wake()
+            else:
+                self._grant_locked(waiter, now)
+                waiter.wake()
+        self._heap = remaining  # 꺼낸 순서(rank 순)대로 쌓았으므로 그대로 힙
+        self._heads = heads
+        self._next_wake = min((waiter.wake_at for waiter in heads.values()), default=math.inf)  # type: ignore[type-var]
+
+    def _dispatch(self):
+        with self._lock:
+            self._dispatch_locked(time.monotonic())
+
+    def _grant_locked(self, waiter: _Waiter, now: float):
+        for key in waiter.keys:
+            for window in self._get_windows(key):
+                window.record(now)
+        waiter.granted = True
+        waiter.wake_at = None
+        if waiter.shared is not None:
+            waiter.shared._waiters.pop(waiter, None)
+        self._advance(waiter)
+
+    def _cancel(self, waiter: _Waiter):
+        """차례를 받기 전에 그만둔 요청(취소, 연결 끊김)을 줄에서 뺌. 다시 확인할 시각을 맡고 있었으면 넘김"""
+        with self._lock:
+            if waiter.granted:
+                return
+            waiter.cancelled = True
+            if waiter.shared is not None:
+                waiter.shared._waiters.pop(waiter, None)
+            if self._heads.get((waiter.keys, waiter.reserve)) is waiter:
+                self._dispatch_locked(time.monotonic())
+
+    def _advance(self, waiter: _Waiter):
+        level, start, _ = waiter.rank
+        virtual = self._virtual[Priority(level)] = max(self._virtual.get(Priority(level), 0.0), start)
+        if len(self._finish) > MAX_FAIR_TAGS:
+            # 끝 태그가 지금 차례보다 앞선 클라이언트는 다음 요청에서 어차피 지금 차례부터 시작
+            self._finish = {key: tag for key, tag in self._finish.items() if tag > self._virtual.get(key[0], virtual)}
+
+    def try_acquire(self, region: str, method: str, reserve: float = 0.0) -> float:
+        """기다리지 않고 한 번만 시도. 보낼 수 있으면 요청 1회를 기록하고 0을, 아니면 기다릴 시간(초)을 반환
+
+        reserve를 주면 각 제한의 그 비율만큼은 남겨 둔 채로 판단합니다.
+        """
+        waiter = self._enqueue(region, method, reserve, None, None)
+        if waiter.granted:
+            return 0.0
+        self._cancel(waiter)
+        with self._lock:
+            return max(self._wait_locked(waiter.keys, time.monotonic(), waiter.reserve), 0.001)
+
+    async def acquire(self, region: str, method: str, reserve: float = 0.0, level: Optional[Priority] = None):
+        """비동기 클라이언트용: 요청을 보낼 차례가 될 때까지 대기 (level을 주지 않으면 현재 컨텍스트의 우선순위)"""
+        waiter = self._enqueue(region, method, reserve, level, asyncio.get_running_loop())
+        event: asyncio.Event = waiter._event  # type: ignore[assignment]
+        try:
+            while not waiter.granted:
+                wake_at = waiter.wake_at
+                if wake_at is None:
+                    await event.wait()
+                else:
+                    try:
+                        await asyncio.wait_for(event.wait(), max(0.0, wake_at - time.monotonic()))
+                    except asyncio.TimeoutError:
+                        self._dispatch()
+                event.clear()
+        finally:
+            # 취소되면(요청한 클라이언트 연결 끊김 등) 줄에서 빠짐
+            self._cancel(waiter)
+
+    def acquire_sync(self, region: str, method: str, reserve: float = 0.0, level: Optional[Priority] = None):
+        """동기 클라이언트용: 요청을 보낼 차례가 될 때까지 대기"""
+        waiter = self._enqueue(region, method, reserve, level, None)
+        event: threading.Event = waiter._event  # type: ignore[assignment]
+        try:
+            while not waiter.granted:
+                wake_at = waiter.wake_at
+                timeout = None if wake_at is None else max(0.0, wake_at - time.monotonic())
+                if not event.wait(timeout):
+                    self._dispatch()
+                event.clear()
+        finally:
+            self._cancel(waiter)
+
+    def waiting(self) -> Dict[str, int]:
+        """우선순위별로 예산을 기다리는 요청 수"""
+        with self._lock:
+            counts = {level.name.lower(): 0 for level in Priority}
+            for waiter in self._heap:
+                if not waiter.cancelled:
+                    counts[Priority(waiter.rank[0]).name.lower()] += 1
+        return counts
+
+    def update_from_headers(self, region: str, method: str, headers: Mapping[str, str]):
+        """응답 헤더의 제한값/사용량을 반영"""
+        with self._lock:
+            now = time.monotonic()
+            changed = False
+            for key, limit_header, count_header in (
+                (self._app_key(region), "X-App-Rate-Limit", "X-App-Rate-Limit-Count"),
+                (self._method_key(region, method), "X-Method-Rate-Limit", "X-Method-Rate-Limit-Count"),
+            ):
+                limits = parse_rate_limits(headers.get(limit_header))
+                if limits:
+                    changed = self._set_limits(key, limits) or changed
+                counts = dict((seconds, count) for count, seconds in parse_rate_limits(headers.get(count_header)))
+                for window in self._get_windows(key):
+                    if window.seconds in counts:
+                        window.sync_count(counts[window.seconds], now)
+            if changed:
+                # 제한이 바뀌면 기다리는 요청의 차례/깨어날 시각을 다시 계산
+                self._dispatch_locked(now)
+
+    def penalize(self, region: str, method: str, headers: Mapping[str, str], attempt: int) -> float:
+        """429 응답 처리. 막을 버킷에 Retry-After를 적용하고 재시도 전 대기 시간을 반환"""
+        retry_after: Optional[float] = None
+        try:
+            retry_after = float(headers.get("Retry-After", ""))
+        except ValueError:
+            pass
+        delay = retry_after if retry_after is not None else min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+
+        limit_type = (headers.get("X-Rate-Limit-Type") or "").lower()
+        with self._lock:
+            until = time.monotonic() + delay
+            if limit_type == "application":
+                key = self._app_key(region)
+            elif limit_type == "method":
+                key = self._method_key(region, method)
+            else:
+                # service 제한 등: 다른 요청은 막지 않고 이 요청만 백오프
+                return delay
+            self._blocked_until[key] = max(self._blocked_until.get(key, 0.0), until)
+        return delay
+
+
+class BackgroundScheduler:
+    """백그라운드 작업(prefetch 등)용 스케줄러. 같은 RateLimitScheduler의 예산을 가장 낮은 우선순위로 씀
+
+    - 각 제한의 reserve 비율은 대화형 요청 몫으로 남겨 둠 (예: 20:1, reserve=0.5 -> 백그라운드는 초당 10회까지)
+    - 같은 예산을 기다리는 다른 요청이 있으면 항상 그쪽이 먼저 보냄 (level=Priority.PREFETCH)
+    - 단, 병합된 호출에 더 높은 우선순위 호출자가 합류하면 그 우선순위를 따르고 reserve도 적용하지 않음
+    RiotAPI/AsyncRiotAPI의 scheduler 인자로 넘겨 씁니다. 헤더 반영/429 처리는 원래 스케줄러에 그대로 전달합니다.
+    """
+
+    def __init__(self, scheduler: RateLimitScheduler, reserve: float = 0.5, level: Priority = Priority.PREFETCH):
+        self.scheduler = scheduler
+        self.reserve = reserve
+        self.level = level
+
+    async def acquire(self, region: str, method: str):
+        await self.scheduler.acquire(region, method, self.reserve, self.level)
+
+    def acquire_sync(self, region: str, method: str):
+        self.scheduler.acquire_sync(region, method, self.reserve, self.level)
+
+    def update_from_headers(self, region: str, method: str, headers: Mapping[str, str]):
+        self.scheduler.update_from_headers(region, method, headers)
+
+    def penalize(self, region: str, method: str, headers: Mapping[str, str], attempt: int) -> float:
+        return self.scheduler.penalize(region, method, headers, attempt)
+
+
+# 프로세스 전체가 하나의 API 키 예산을 공유하도록 기본 스케줄러를 하나만 둠
+default_scheduler = RateLimitScheduler()
@@ -0,0 +1,113 @@
+"""요청별 Riot 호출 컨텍스트와 연결 끊김 처리 (ASGI 미들웨어).
+
+- 요청한 클라이언트(접속 주소)를 rate_limiter.client_scope로 묶어, 같은 우선순위의 Riot 호출이 클라이언트별로
+  번갈아 나가게 합니다. X-Forwarded-For는 클라이언트가 마음대로 쓸 수 있으므로 접속 주소가 TRUSTED_PROXIES
+  (쉼표로 구분한 IP/CIDR, 예: "10.0.0.0/8,127.0.0.1")에 있을 때만 보고, 오른쪽부터 신뢰하는 프록시가 아닌
+  첫 주소를 씁니다. 그래야 요청마다 헤더를 바꿔 공정 분배를 피해 갈 수 없습니다.
+- 클라이언트 연결이 끊기면 처리 중인 핸들러 Task를 취소합니다. 예산을 기다리던 Riot 호출은 줄에서 빠지고
+  FetchGraph의 남은 단계도 취소되므로, 아무도 받지 않을 응답을 위해 Rate Limit 예산을 쓰지 않습니다.
+
+요청 본문은 핸들러를 시작하기 전에 모두 읽어 두고(이 API는 본문이 없거나 작음), 이후 receive는 연결 끊김
+감시에만 씁니다. 핸들러에는 읽어 둔 본문을 다시 넘기고, 연결이 끊기면 http.disconnect를 전달합니다
+(StreamingResponse도 이를 보고 멈춤).
+"""
+import asyncio
+import ipaddress
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+import rate_limiter
+
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_proxies(value: Optional[str]) -> List[Network]:
+    """"10.0.0.0/8,127.0.0.1" 형식을 네트워크 목록으로 변환 (잘못된 항목은 무시)"""
+    networks = []
+    for part in (value or "").split(","):
+        try:
+            networks.append(ipaddress.ip_network(part.strip(), strict=False))
+        except ValueError:
+            continue
+    return networks
+
+
+# X-Forwarded-For를 믿을 리버스 프록시 (기본: 없음 -> 항상 접속 주소)
+TRUSTED_PROXIES = parse_proxies(os.environ.get("TRUSTED_PROXIES"))
+
+
+def _trusted(address: str, proxies: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def client_key(scope: Dict[str, Any], proxies: Optional[Sequence[Network]] = None) -> str:
+    proxies = TRUSTED_PROXIES if proxies is None else proxies
+    client: Optional[List[Any]] = scope.get("client")
+    address = client[0] if client else ""
+    if not _trusted(address, proxies):
+        return address
+    forwarded: List[str] = []
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-for":
+            forwarded += [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+    # 각 프록시는 받은 접속 주소를 오른쪽에 덧붙이므로, 오른쪽부터 신뢰하는 프록시를 건너뜀
+    for hop in reversed(forwarded):
+        if not _trusted(hop, proxies):
+            return hop
+        address = hop
+    return address
+
+
+class RequestContextMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        body: List[Message] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.append(message)
+            if not message.get("more_body"):
+                break
+
+        disconnected = asyncio.Event()
+
+        async def replay() -> Message:
+            if body:
+                return body.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def watch():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        # 핸들러 Task는 만들 때의 컨텍스트(클라이언트, 기본 우선순위 INTERACTIVE)를 복사해 씀
+        with rate_limiter.client_scope(client_key(scope)):
+            handler = asyncio.ensure_future(self.app(scope, replay, send))
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if handler.done():
+                handler.result()  # 핸들러 예외는 그대로 서버에 전달
+                return
+            # 응답을 다 보내기 전에 연결이 끊김
+            handler.cancel()
+            await asyncio.gather(handler, return_exceptions=True)
+        finally:
+            watcher.cancel()
+            handler.cancel()  # 이 미들웨어가 취소된 경우 (서버 종료 등)
@@ -0,0 +1,119 @@
+"""직렬화된 API 응답 캐시와 ETag.
+
+/analyze-user처럼 구성 비용이 큰 응답은 내용을 결정하는 값(puuid, 최신 매치 ID, Data Dragon 버전,
+분석기 버전 등)으로 키를 만들어, 직렬화가 끝난 JSON 본문과 ETag를 함께 캐시합니다.
+같은 키로 다시 요청되면 응답을 다시 만들거나 직렬화하지 않고 저장된 바이트를 그대로 보내며,
+클라이언트가 If-None-Match로 같은 ETag를 보내면 본문 없이 304로 응답합니다.
+
+ETag는 본문 바이트의 해시(강한 ETag)이고, Cache-Control: no-cache로 브라우저가 매번 재검증하게 합니다.
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Response
+
+from analyzer import ANALYZER_VERSION
+from cache_manager import AsyncCacheManager, CacheManager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# 응답 형식이 바뀌면 올려서 이전 형식의 캐시를 읽지 않도록 함
+RESPONSE_VERSION = 1
+CACHE_CONTROL = "private, no-cache"
+ANALYZE_USER_TTL = 3600  # 새 매치가 생기면 키가 바뀌므로 리그 정보 캐시(1시간)에 맞춤
+CURRENT_GAME_TTL = 60
+MATCH_DETAIL_TTL = 86400  # 끝난 매치는 바뀌지 않음
+
+
+def dumps(body: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def etag_of(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def analyze_user_key(puuid: str, newest_match_id: str, ddragon_version: str, variant: str = "") -> str:
+    """variant: 같은 사용자라도 응답이 달라지는 요청 인자(limit, fields 등)"""
+    return f"response:analyze_user:v{RESPONSE_VERSION}:a{ANALYZER_VERSION}:{ddragon_version}:{puuid}:{newest_match_id}:{variant}"
+
+
+def analyze_user_page_key(puuid: str, cursor: str, ddragon_version: str, variant: str = "") -> str:
+    """커서 다음 페이지는 새 매치가 생겨도 바뀌지 않으므로 최신 매치 ID 대신 커서로 키를 만듦"""
+    return f"response:analyze_user_page:v{RESPONSE_VERSION}:{ddragon_version}:{puuid}:{cursor}:{variant}"
+
+
+def match_detail_key(match_id: str, ddragon_version: str) -> str:
+    return f"response:match_detail:v{RESPONSE_VERSION}:{ddragon_version}:{match_id}"
+
+
+def current_game_key(game_id: Any, ddragon_version: str) -> str:
+    """응답은 누가 조회했는지와 상관없이 게임 스냅샷으로만 정해지므로 참가자 10명이 함께 씀"""
+    return f"response:current_game:v{RESPONSE_VERSION}:{ddragon_version}:{game_id}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더(여러 값, W/ 접두사, * 포함)가 etag와 맞는지 (RFC 9110의 약한 비교)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def to_response(entry: Dict[str, Any], if_none_match: Optional[str]) -> Response:
+    """캐시 항목({"etag", "body"}) -> 200 응답, 또는 ETag가 맞으면 304"""
+    headers = {"ETag": entry["etag"], "Cache-Control": CACHE_CONTROL}
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    body = entry["body"]
+    return Response(body.encode("utf-8") if isinstance(body, str) else body, media_type="application/json", headers=headers)
+
+
+def make_entry(body: Any) -> Dict[str, Any]:
+    raw = dumps(body)
+    # 캐시 코덱이 JSON이어도 저장할 수 있도록 본문은 문자열로 보관
+    return {"etag": etag_of(raw), "body": raw.decode("utf-8")}
+
+
+async def _cache_call(cache: CacheManager, method: str, *args: Any) -> Any:
+    # ThreadedRiotAPI의 동기 캐시는 이벤트 루프를 막지 않도록 스레드에서 호출
+    if isinstance(cache, AsyncCacheManager):
+        return await getattr(cache, method)(*args)
+    return await asyncio.to_thread(getattr(cache, method), *args)
+
+
+async def get(cache: CacheManager, key: str) -> Optional[Dict[str, Any]]:
+    entry = await _cache_call(cache, "get_cache", key)
+    return entry if isinstance(entry, dict) and "etag" in entry else None
+
+
+async def put(cache: CacheManager, key: str, body: Any, ttl: int) -> Dict[str, Any]:
+    """다른 경로(스트리밍 응답 등)에서 만든 본문을 같은 키로 캐시"""
+    entry = make_entry(body)
+    await _cache_call(cache, "set_cache", key, entry, ttl)
+    return entry
+
+
+async def cached(cache: CacheManager, key: str, ttl: int, build: Callable[[], Awaitable[Any]],
+                 if_none_match: Optional[str], cacheable: Callable[[Any], bool] = lambda body: True) -> Response:
+    """key로 캐시된 응답을 보내고, 없으면 build()로 만들어 직렬화/캐시한 뒤 보냄.
+
+    cacheable(body)가 False인 응답(오류 등)은 캐시하지 않습니다.
+    """
+    entry = await get(cache, key)
+    if entry is None:
+        body = await build()
+        entry = make_entry(body)
+        if cacheable(body):
+            await _cache_call(cache, "set_cache", key, entry, ttl)
+    return to_response(entry, if_none_match)
@@ -1,31 +1,68 @@
+import asyncio
+import contextvars
+import functools
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 import requests
 from urllib import parse
 from cache_manager import CacheManager
+import match_index
+from analyzer import analyze_match
+from match_projection import project_match, project_timeline_stream_sync
+import http_pool
+from rate_limiter import Priority, RateLimitScheduler, current_priority, default_scheduler, priority, region_of
 import os # <-- os 모듈 임포트 추가
 
+# 429 응답 재시도 횟수
+MAX_RETRIES = 3
+# ThreadedRiotAPI의 우선순위별 스레드 수. 다건/대량 조회 스레드가 Rate Limit을 기다리며 모두 잠들어도
+# 단건 조회는 자기 스레드 풀에서 바로 실행됨 (기본 스레드 풀 하나를 쓰면 그 뒤에 줄을 섬)
+THREADS_PER_PRIORITY = int(os.environ.get("RIOT_THREADS_PER_PRIORITY", 8))
+
+_executors: Dict[Priority, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _executor(level: Priority) -> ThreadPoolExecutor:
+    executor = _executors.get(level)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(level)
+            if executor is None:
+                executor = _executors[level] = ThreadPoolExecutor(THREADS_PER_PRIORITY, thread_name_prefix=f"riot-{level.name.lower()}")
+    return executor
+
 class RiotAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url=None, platform_url=None, scheduler: RateLimitScheduler = None,
+                 cache: CacheManager = None):
         self.api_key = api_key
-        self.base_url = "https://asia.api.riotgames.com"
+        self.base_url = base_url or "https://asia.api.riotgames.com"  # account, match (대륙 라우팅)
+        self.platform_url = platform_url or "https://kr.api.riotgames.com"  # league, summoner, spectator (플랫폼 라우팅)
         self.headers = {"X-Riot-Token": self.api_key}
+        self.rate_limiter = scheduler or default_scheduler  # 리전/메서드별 Rate Limit 스케줄러
+        # REDIS_URL이 있으면 URL로, 없으면 REDIS_HOST/PORT/DB/PASSWORD로 연결 (첫 명령에서 연결)
+        self.cache = cache or CacheManager.from_env()
 
-        redis_url = os.environ.get("REDIS_URL") # REDIS_URL 환경 변수 읽기
+    def _get(self, url, method, params=None, timeout=10, stream=False):
+        """Rate Limit을 지키며 GET 요청. 429 응답은 Retry-After만큼 기다렸다가 재시도합니다.
 
-        if redis_url: # REDIS_URL이 있으면 CacheManager에 URL 전달
-            self.cache = CacheManager(url=redis_url)
-        else: # REDIS_URL이 없으면 기존처럼 개별 환경 변수 사용
-            redis_host = os.environ.get("REDIS_HOST", "localhost")
-            redis_port = int(os.environ.get("REDIS_PORT", 6379))
-            redis_db = int(os.environ.get("REDIS_DB", 0))
-            redis_password = os.environ.get("REDIS_PASSWORD", None)
-
-            self.cache = CacheManager(
-                host=redis_host,
-                port=redis_port,
-                db=redis_db,
-                password=redis_password
-            )
+        method는 Riot 엔드포인트 이름(예: match-v5.getMatch)으로, 메서드별 Rate Limit 버킷 키로 쓰입니다.
+        stream=True이면 본문을 미리 읽지 않으므로 호출자가 끝까지 읽거나 닫아야 합니다.
+        """
+        region = region_of(url)
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire_sync(region, method)
+            response = http_pool.get_sync_session().get(url, headers=self.headers, params=params, timeout=timeout, stream=stream)
+            self.rate_limiter.update_from_headers(region, method, response.headers)
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            delay = self.rate_limiter.penalize(region, method, response.headers, attempt)
+            print(f"Rate Limit 초과 ({method}), {delay:.1f}초 후 재시도")
+            response.close()  # stream=True일 때 커넥션을 풀에 돌려줌
+            time.sleep(delay)
+        return response
 
     def get_puuid_by_riot_id(self, game_name, tag_line):
         """1단계: 계정명#태그로 PUUID(고유 식별자) 가져오기"""
@@ -35,7 +72,7 @@ class RiotAPI:
             return cached_puuid
         
         url = f"{self.base_url}/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url, "account-v1.getByRiotId")
         if response.status_code == 200:
             puuid = response.json()['puuid']
             # 캐시 저장
@@ -50,8 +87,8 @@ class RiotAPI:
         if cached_league:
             return cached_league
         
-        url = f"https://kr.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}"
-        response = requests.get(url, headers=self.headers)
+        url = f"{self.platform_url}/lol/league/v4/entries/by-puuid/{puuid}"
+        response = self._get(url, "league-v4.getLeagueEntriesByPUUID")
         if response.status_code == 200:
             league_data = response.json()
             # 캐시 저장
@@ -71,7 +108,7 @@ class RiotAPI:
         print(f"API 호출: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get(url, "match-v5.getMatchIdsByPUUID")
             print(f"API 응답 상태: {response.status_code}")
             
             if response.status_code == 200:
@@ -94,17 +131,27 @@ class RiotAPI:
             return []
 
     def get_match_timeline(self, match_id):
-        """4단계: Match ID로 상세 타임라인 데이터 가져오기"""
+        """4단계: Match ID로 타임라인 데이터(분석용 축약본) 가져오기"""
+        # 캐시 확인
+        cached_timeline = self.cache.get_cached_match_timeline(match_id)
+        if cached_timeline:
+            return cached_timeline
+
         url = f"{self.base_url}/lol/match/v5/matches/{match_id}/timeline"
         print(f"Timeline API 호출: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            # 수 MB짜리 원본을 통째로 파싱하지 않고 받는 대로 축약본 필드만 추출
+            response = self._get(url, "match-v5.getTimeline", stream=True)
             print(f"Timeline 응답 상태: {response.status_code}")
             
             if response.status_code == 200:
-                timeline_data = response.json()
+                with response:
+                    timeline_data = project_timeline_stream_sync(response)
                 print(f"Timeline 데이터 수신 성공")
+                if timeline_data:
+                    # 캐시 저장
+                    self.cache.cache_match_timeline(match_id, timeline_data)
                 return timeline_data
             elif response.status_code == 403:
                 print("Timeline API 키 만료 또는 권한 없음")
@@ -115,100 +162,226 @@ class RiotAPI:
             else:
                 print(f"Timeline API 오류: {response.status_code} - {response.text}")
                 return None
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"Timeline 요청 예외: {e}")
             return None
 
+    def get_match_analysis(self, match_id):
+        """매치 분석 결과(참가자 10명 전원, analyzer.analyze_match 형식). 캐시에 있으면 타임라인도 받지 않음"""
+        cached_analysis = self.cache.get_cached_match_analysis(match_id)
+        if cached_analysis:
+            return cached_analysis
+
+        timeline_data = self.get_match_timeline(match_id)
+        if not timeline_data:
+            return None
+        analysis = analyze_match(timeline_data)
+        self.cache.cache_match_analysis(match_id, analysis)
+        return analysis
+
     def _get_summoner_id_by_puuid(self, puuid):
-        """PUUID로 Summoner ID 가져오기"""
-        url = f"https://kr.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}"
-        response = requests.get(url, headers=self.headers)
+        """PUUID로 Summoner ID 가져오기 (캐시에 영구 보관)"""
+        cached_summoner_id = self.cache.get_cached_summoner_id(puuid)
+        if cached_summoner_id:
+            return cached_summoner_id
+
+        url = f"{self.platform_url}/lol/summoner/v4/summoners/by-puuid/{puuid}"
+        response = self._get(url, "summoner-v4.getByPUUID")
         if response.status_code == 200:
-            return response.json()['id'] # encryptedSummonerId
+            summoner_id = response.json()['id'] # encryptedSummonerId
+            self.cache.cache_summoner_id(puuid, summoner_id)
+            return summoner_id
         return None
 
-    def get_active_game_by_summoner_id(self, encrypted_summoner_id):
-        """Summoner ID로 현재 진행 중인 게임 정보 가져오기"""
-        url = f"https://kr.api.riotgames.com/lol/spectator/v5/active-games/by-summoner/{encrypted_summoner_id}"
-        response = requests.get(url, headers=self.headers)
+    def get_active_game_by_summoner_id(self, encrypted_summoner_id, puuid=None):
+        """Summoner ID로 현재 진행 중인 게임 정보 가져오기.
+        puuid를 주면 같은 게임 참가자가 캐시해 둔 스냅샷이나 "게임 중 아님" 결과를 먼저 확인합니다"""
+        if puuid:
+            pointer = self.cache.get_cached_active_game_pointer(puuid)
+            if pointer is not None:
+                if pointer["game_id"] is None:
+                    return None
+                cached_game = self.cache.get_cached_active_game(pointer["game_id"])
+                if cached_game:
+                    return cached_game
+
+        url = f"{self.platform_url}/lol/spectator/v5/active-games/by-summoner/{encrypted_summoner_id}"
+        response = self._get(url, "spectator-v5.getCurrentGameInfoBySummoner")
         if response.status_code == 200:
-            return response.json()
+            game = response.json()
+            self.cache.cache_active_game(game)
+            self.cache.cache_active_game_pointers(game)
+            self.cache.cache_summoner_ids({p["puuid"]: p["summonerId"] for p in game.get("participants", [])
+                                           if p.get("puuid") and p.get("summonerId")})
+            return game
         elif response.status_code == 404: # Not in game
-            return None 
+            if puuid:
+                self.cache.cache_not_in_game(puuid)
+            return None
         return None
 
-    def get_all_match_ids(self, puuid, n_wins, n_losses):
-        """모든 랭크 게임의 Match ID를 수집합니다."""
-        # 캐시 확인
-        cached_ids = self.cache.get_cached_match_ids(puuid)
-        if cached_ids:
-            return cached_ids
-        
-        n_total = n_wins + n_losses
-        r = n_total // 100
-        other = n_total % 100
-        
-        all_games_id = []
-        
-        # 100개씩 끊어서 호출
-        for i in range(r + 1):
-            start = i * 100
-            count = 100 if i != r else other
-            
-            if count == 0: continue
-            
-            url = f"{self.base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
-            params = {"type": "", "start": start, "count": count}
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            
-            if response.status_code == 200:
-                all_games_id.extend(response.json())
-                time.sleep(0.05)
+    def get_match_ids(self, puuid, start=0, count=20, after=None):
+        """매치 ID를 최신순으로 start부터 count개 가져옵니다. {"match_ids", "start", "count", "has_more", "next_cursor"}를 반환
+
+        전적 전체를 다시 받지 않고, 캐시된 매치 ID 인덱스에 새 매치만 앞에 붙이고(증분 동기화)
+        인덱스보다 오래된 페이지를 요청할 때만 이전 매치를 이어서 받습니다.
+        after(커서: 이전 페이지의 next_cursor)를 주면 그 매치 다음부터 가져오고, 커서가 인덱스에 없으면 None을 반환합니다.
+        """
+        if after is not None:
+            start = match_index.start_after(self._match_index(puuid, 0, 0), after)
+            if start is None:
+                return None
+        return match_index.page_of(self._match_index(puuid, start, count), start, count)
+
+    def _match_index(self, puuid, start, count):
+        """start부터 count개를 덮도록 동기화된 매치 ID 인덱스"""
+        index = self.cache.get_cached_match_index(puuid) or match_index.empty_index()
+        original = index
+
+        if match_index.needs_sync(index):
+            new_ids = []
+            for page in range(match_index.MAX_SYNC_PAGES):
+                data = self._get_match_ids_page(puuid, match_index.newer_page_params(index, page))
+                if data is None:
+                    break
+                fresh, more = match_index.take_newer(index, data)
+                new_ids.extend(fresh)
+                if not more:
+                    index = match_index.merge_newer(index, new_ids)
+                    break
             else:
-                print(f"Match ID 수집 중 에러: {response.status_code}")
-                break
-        
-        # 캐시 저장
-        self.cache.cache_match_ids(puuid, all_games_id)
-        return all_games_id
+                index = match_index.merge_newer(index, new_ids, connected=False)
 
-    def get_match_detail(self, match_id):
-        """개별 매치의 상세 정보(KDA, 아이템, 결과 등)를 가져옵니다."""
-        # 캐시 확인
-        cached_detail = self.cache.get_cached_match_detail(match_id)
-        if cached_detail:
-            return cached_detail
+        # 요청한 페이지가 인덱스 범위를 벗어날 때만 이전 매치를 이어서 받음 (과거 기록 조회 우선순위)
+        with priority(Priority.BACKFILL):
+            while match_index.needs_older(index, start, count):
+                data = self._get_match_ids_page(puuid, match_index.older_page_params(index))
+                if data is None:
+                    break
+                older = match_index.merge_older(index, data)
+                if len(older["ids"]) == len(index["ids"]) and not older["complete"]:
+                    break
+                index = older
+
+        if index is not original:
+            self.cache.cache_match_index(puuid, index)
+        return index
+
+    def _get_match_ids_page(self, puuid, params):
+        """매치 ID 한 페이지 (실패 시 None)"""
+        url = f"{self.base_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        response = self._get(url, "match-v5.getMatchIdsByPUUID", params=params)
+        if response.status_code == 200:
+            return response.json()
+        print(f"Match ID 수집 중 에러: {response.status_code}")
+        return None
+
+    def get_match_detail(self, match_id, use_cache=True):
+        """개별 매치의 상세 정보(KDA, 아이템, 결과 등)를 화면에 필요한 필드만 남긴 축약본으로 가져옵니다."""
+        # 캐시 확인 (use_cache=False이면 호출자가 일괄로 조회/저장)
+        if use_cache:
+            cached_detail = self.cache.get_cached_match_detail(match_id)
+            if cached_detail:
+                return cached_detail
         
         url = f"{self.base_url}/lol/match/v5/matches/{match_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url, "match-v5.getMatch")
         if response.status_code == 200:
-            detail = response.json()
+            detail = project_match(response.json())
             # 캐시 저장
-            self.cache.cache_match_detail(match_id, detail)
+            if use_cache:
+                self.cache.cache_match_detail(match_id, detail)
             return detail
         return None
 
     def get_match_details_batch(self, match_ids):
         """매치 ID 리스트를 받아 상세 정보 리스트를 반환합니다."""
+        # 너무 많은 데이터를 한 번에 처리하면 서버가 느려지므로 
+        # 일단 테스트용으로 최근 20개 정도만 처리하도록 제한하는 것을 추천합니다.
+        match_ids = match_ids[:20]
+
+        # 캐시 적중분은 한 번의 왕복(MGET)으로 가져오고 나머지만 API로 요청
+        cached = self.cache.get_cached_match_details(match_ids)
+        fetched = {}
         details = []
         for match_id in match_ids:
-            detail = self.get_match_detail(match_id)
+            detail = cached.get(match_id)
+            if detail is None:
+                with priority(Priority.FANOUT):
+                    detail = self.get_match_detail(match_id, use_cache=False)
+                if detail:
+                    fetched[match_id] = detail
             if detail:
-                # 분석에 필요한 핵심 정보만 추출 (메모리 절약)
-                info = detail.get('info', {})
-                details.append({
-                    "matchId": match_id,
-                    "gameMode": info.get("gameMode"),
-                    "gameDuration": info.get("gameDuration"),
-                    "participants": info.get("participants", []) # KDA, 챔피언 정보 등 포함
-                })
-            
-            # Riot API 호출 제한을 준수하기 위해 약간의 지연을 둡니다 (0.05초)
-            time.sleep(0.05) 
-            
-            # 너무 많은 데이터를 한 번에 처리하면 서버가 느려지므로 
-            # 일단 테스트용으로 최근 20개 정도만 처리하도록 제한하는 것을 추천합니다.
-            if len(details) >= 20: break 
-            
-        return details
\ No newline at end of file
+                details.append(detail)
+
+        if fetched:
+            self.cache.cache_match_details(fetched)
+        return details
+
+
+class ThreadedRiotAPI:
+    """동기 RiotAPI를 스레드 풀에서 실행해 AsyncRiotAPI와 같은 인터페이스를 제공하는 어댑터.
+
+    aiohttp를 사용할 수 없는 환경에서도 이벤트 루프를 막지 않도록 모든 호출을 현재 우선순위의
+    스레드 풀로 넘깁니다 (asyncio.to_thread처럼 contextvars를 이어받음). session 인자는 인터페이스 호환용이며 사용하지 않습니다.
+    """
+
+    def __init__(self, client: RiotAPI):
+        self.client = client
+        self.cache = client.cache
+
+    async def _run(self, fn, *args):
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(_executor(current_priority()), functools.partial(context.run, fn, *args))
+
+    async def get_puuid_by_riot_id_async(self, session, game_name, tag_line):
+        return await self._run(self.client.get_puuid_by_riot_id, game_name, tag_line)
+
+    async def get_league_info_async(self, session, puuid):
+        return await self._run(self.client.get_league_info, puuid)
+
+    async def get_summoner_id_by_puuid_async(self, session, puuid):
+        return await self._run(self.client._get_summoner_id_by_puuid, puuid)
+
+    async def get_active_game_async(self, session, encrypted_summoner_id, puuid=None):
+        return await self._run(self.client.get_active_game_by_summoner_id, encrypted_summoner_id, puuid)
+
+    async def get_recent_match_ids_async(self, session, puuid, count=1):
+        return await self._run(self.client.get_recent_match_ids, puuid, count)
+
+    async def get_match_timeline_async(self, session, match_id):
+        return await self._run(self.client.get_match_timeline, match_id)
+
+    async def get_match_analysis_async(self, session, match_id):
+        return await self._run(self.client.get_match_analysis, match_id)
+
+    async def get_match_detail_async(self, session, match_id):
+        return await self._run(self.client.get_match_detail, match_id)
+
+    async def get_match_ids_async(self, session, puuid, start=0, count=20, after=None):
+        return await self._run(self.client.get_match_ids, puuid, start, count, after)
+
+    async def get_match_details_batch_async(self, session, match_ids, limit=20):
+        with priority(Priority.FANOUT):
+            return await self._run(self.client.get_match_details_batch, match_ids[:limit])
+
+    async def iter_match_details_async(self, session, match_ids, limit=20):
+        """매치 상세를 준비되는 대로 (index, 상세)로 내보냄. 캐시 적중분을 먼저, 나머지는 동기 배치처럼 하나씩 요청"""
+        match_ids = match_ids[:limit]
+        cached = await self._run(self.client.cache.get_cached_match_details, match_ids)
+        fetched = {}
+        try:
+            for index, match_id in enumerate(match_ids):
+                if match_id in cached:
+                    yield index, cached[match_id]
+            for index, match_id in enumerate(match_ids):
+                if match_id in cached:
+                    continue
+                with priority(Priority.FANOUT):
+                    detail = await self._run(self.client.get_match_detail, match_id, False)
+                if detail:
+                    fetched[match_id] = detail
+                    yield index, detail
+        finally:
+            if fetched:
+                await self._run(self.client.cache.cache_match_details, fetched)
@@ -0,0 +1,116 @@
+"""분석기 벤치마크: 이전 프레임 단위 루프 vs 열 단위 배열 벡터 연산.
+
+합성 40분 타임라인(축약본) 여러 개에 대해 타임라인 한 개를 분석하는 시간을 비교합니다.
+before는 이전 analyze_game의 루프(프레임마다 np.array + np.linalg.norm)를 참가자 10명에게 각각 돌린 것,
+after는 timeline_to_arrays로 한 번 변환한 뒤 10명을 함께 계산한 것입니다.
+두 결과가 같은지도 함께 확인합니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_analyzer.py --timelines 50 --minutes 40
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+import map_zones  # noqa: E402
+from analyzer import analyze_arrays, timeline_to_arrays  # noqa: E402
+from match_projection import project_timeline  # noqa: E402
+from synthetic_data import make_timeline  # noqa: E402
+
+
+def legacy_analyze(timeline_data, participant_id="1"):
+    """이전 analyze_game의 계산 부분 (출력/예외 처리 제외)"""
+    frames = timeline_data['info']['frames']
+    positions = []
+    death_timestamps = []
+    for frame in frames:
+        p_frame = frame['participantFrames'].get(participant_id)
+        if p_frame:
+            positions.append(p_frame['position'])
+        for event in frame['events']:
+            if event.get('type') == 'CHAMPION_SPECIAL_KILL' or event.get('type') == 'CHAMPION_KILL':
+                if event.get('victimId') == int(participant_id):
+                    death_timestamps.append(event['timestamp'])
+
+    dragon_pos = np.array([9800, 4400])
+    at_objective = 0
+    for pos in positions:
+        p = np.array([pos['x'], pos['y']])
+        if np.linalg.norm(p - dragon_pos) < 2000:
+            at_objective += 1
+
+    tilt_score = 0
+    if len(death_timestamps) > 2:
+        intervals = np.diff(death_timestamps)
+        tilt_score = np.std(intervals) / 1000
+
+    return {
+        "macro_score": (at_objective / len(frames)) * 100 if frames else 0,
+        "tilt_index": tilt_score,
+        "positions": positions[:20],
+    }
+
+
+def legacy_all(timeline_data):
+    return {str(pid): legacy_analyze(timeline_data, str(pid)) for pid in range(1, 11)}
+
+
+def vectorized_all(timeline_data):
+    return analyze_arrays(timeline_to_arrays(timeline_data))
+
+
+def same_result(a, b) -> bool:
+    return (np.isclose(a["macro_score"], b["macro_score"]) and np.isclose(a["tilt_index"], b["tilt_index"])
+            and a["positions"] == b["positions"])
+
+
+def classify_zones(arrays):
+    return map_zones.zone_ids(arrays.positions), map_zones.objective_ids(arrays.positions), map_zones.tower_ids(arrays.positions)
+
+
+def per_timeline_ms(fn, timelines, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for timeline in timelines:
+            fn(timeline)
+    return (time.perf_counter() - started) / (repeat * len(timelines)) * 1000
+
+
+def main(n_timelines: int, minutes: int, repeat: int):
+    timelines = [project_timeline(make_timeline(f"KR_{i}", minutes=minutes)) for i in range(n_timelines)]
+
+    mismatches = 0
+    for timeline in timelines:
+        before, after = legacy_all(timeline), vectorized_all(timeline)
+        mismatches += sum(1 for pid in before if not same_result(before[pid], after[pid]))
+
+    print(f"\n=== {n_timelines} timelines x {minutes}분, repeat={repeat} ===")
+    print(f"결과 불일치: {mismatches}/{n_timelines * 10}")
+    rows = [
+        ("before 10명", legacy_all),
+        ("before 1명", lambda t: legacy_analyze(t, "1")),
+        ("after  10명", vectorized_all),
+        ("  변환만", timeline_to_arrays),
+    ]
+    arrays = [timeline_to_arrays(timeline) for timeline in timelines]
+    baseline = None
+    for name, fn in rows + [("  지역 분류만", classify_zones)]:
+        ms = per_timeline_ms(fn, arrays if fn is classify_zones else timelines, repeat)
+        baseline = baseline or ms
+        print(f"{name:<14}{ms:>9.3f} ms/timeline  (x{baseline / ms:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석기 벤치마크")
+    parser.add_argument("--timelines", type=int, default=50)
+    parser.add_argument("--minutes", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.timelines, args.minutes, args.repeat)
@@ -0,0 +1,66 @@
+"""여러 매치 일괄 분석 벤치마크: 스레드 풀 vs 프로세스 풀(analysis_pool).
+
+합성 타임라인 N개를 동시에 analyze_match에 넘겨 전체 소요 시간과, 그동안 이벤트 루프가
+얼마나 막혔는지(10ms 주기 타이머의 최대 지연)를 비교합니다. 프로세스 풀은 코어 수만큼
+병렬로 분석하고 이벤트 루프는 결과를 주고받는 일만 합니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_batch_analysis.py --matches 20 --minutes 40
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+import analysis_pool  # noqa: E402
+from analyzer import analyze_match  # noqa: E402
+from match_projection import project_timeline  # noqa: E402
+from synthetic_data import make_timeline  # noqa: E402
+
+
+async def loop_lag_monitor(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """interval마다 깨어나며 예정보다 늦어진 최대 시간(ms)을 기록"""
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst * 1000
+
+
+async def run_batch(name: str, timelines, submit):
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(loop_lag_monitor(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(timeline) for timeline in timelines))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await monitor
+    print(f"{name:<10}{elapsed * 1000:>10.0f} ms{worst_lag:>14.1f} ms")
+
+
+async def main(n_matches: int, minutes: int, repeat: int):
+    timelines = [project_timeline(make_timeline(f"KR_{i}", minutes=minutes)) for i in range(n_matches)]
+    # 워커 프로세스 기동 비용은 앱 수명 동안 한 번이므로 측정에서 제외
+    await analysis_pool.run(analyze_match, timelines[0])
+
+    print(f"\n=== {n_matches} matches x {minutes}분, workers={analysis_pool.ANALYSIS_WORKERS}, cpu={os.cpu_count()} ===")
+    print(f"{'mode':<10}{'elapsed':>13}{'max loop lag':>17}")
+    for _ in range(repeat):
+        await run_batch("thread", timelines, lambda t: asyncio.to_thread(analyze_match, t))
+        await run_batch("process", timelines, lambda t: analysis_pool.run(analyze_match, t))
+    analysis_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일괄 분석 벤치마크")
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--minutes", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.matches, args.minutes, args.repeat))
@@ -0,0 +1,68 @@
+"""캐시 코덱 마이크로 벤치마크.
+
+실제 응답과 같은 구조의 합성 매치/타임라인(원본 및 축약본)에 대해
+직렬화 방식 x 압축 방식별 인코딩/디코딩 시간과 저장 바이트를 비교합니다.
+legacy는 이전 CacheManager의 json.dumps(default=str) 텍스트 저장 방식입니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_cache_codec.py --repeat 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+import cache_codec  # noqa: E402
+from cache_codec import CacheCodec  # noqa: E402
+from match_projection import project_match, project_timeline  # noqa: E402
+from synthetic_data import make_match, make_timeline  # noqa: E402
+
+
+def timed(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6  # µs
+
+
+def bench_fixture(name: str, value, repeat: int):
+    print(f"\n[{name}]")
+    print(f"{'codec':<18}{'bytes':>10}{'ratio':>8}{'encode(µs)':>13}{'decode(µs)':>13}")
+
+    legacy = json.dumps(value, default=str)
+    legacy_size = len(legacy.encode("utf-8"))
+    enc = timed(lambda: json.dumps(value, default=str), repeat)
+    dec = timed(lambda: json.loads(legacy), repeat)
+    print(f"{'legacy json':<18}{legacy_size:>10}{1.0:>8.2f}{enc:>13.0f}{dec:>13.0f}")
+
+    serializers = ["json"] + (["msgpack"] if cache_codec.msgpack is not None else [])
+    compressions = ["none", "zlib"] + (["zstd"] if cache_codec.zstandard is not None else [])
+    for serializer in serializers:
+        for compression in compressions:
+            codec = CacheCodec(serializer=serializer, compression=compression, compress_threshold=0)
+            payload = codec.encode(value)
+            assert codec.decode(payload) is not None
+            enc = timed(lambda: codec.encode(value), repeat)
+            dec = timed(lambda: codec.decode(payload), repeat)
+            label = f"{serializer}+{compression}"
+            print(f"{label:<18}{len(payload):>10}{legacy_size / len(payload):>8.2f}{enc:>13.0f}{dec:>13.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="캐시 코덱 마이크로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"orjson={'yes' if cache_codec.orjson else 'no'} msgpack={'yes' if cache_codec.msgpack else 'no'} "
+          f"zstandard={'yes' if cache_codec.zstandard else 'no'}")
+    raw_match = make_match("KR_7000000001")
+    raw_timeline = make_timeline("KR_7000000001", minutes=35)
+    bench_fixture("match (raw)", raw_match, args.repeat)
+    bench_fixture("match (projection)", project_match(raw_match), args.repeat)
+    bench_fixture("timeline (raw)", raw_timeline, max(1, args.repeat // 5))
+    bench_fixture("timeline (projection)", project_timeline(raw_timeline), args.repeat)
@@ -0,0 +1,136 @@
+"""/analyze-user 동시성 벤치마크.
+
+로컬 Riot 스텁 서버를 띄운 뒤 N명의 사용자가 동시에 analyze_user를 호출할 때의
+지연 시간 분포(p50/p95/p99)를 측정합니다.
+
+모드:
+    async     AsyncRiotAPI (aiohttp) - 기본 경로
+    threaded  ThreadedRiotAPI - 동기 RiotAPI를 스레드 풀에서 실행
+    blocking  이전 동작 재현 - 동기 RiotAPI를 이벤트 루프에서 직접 호출
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_concurrency.py --users 50 --mode async
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-BENCHMARK")
+
+from riot_stub_server import start_stub_server  # noqa: E402
+
+
+class BlockingRiotAPI:
+    """이전 main.py처럼 async 엔드포인트 안에서 동기 RiotAPI를 바로 호출하는 어댑터 (비교 기준용)"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get_puuid_by_riot_id_async(self, session, game_name, tag_line):
+        return self.client.get_puuid_by_riot_id(game_name, tag_line)
+
+    async def get_league_info_async(self, session, puuid):
+        return self.client.get_league_info(puuid)
+
+    async def get_recent_match_ids_async(self, session, puuid, count=1):
+        return self.client.get_recent_match_ids(puuid, count)
+
+    async def get_match_timeline_async(self, session, match_id):
+        return self.client.get_match_timeline(match_id)
+
+    async def get_match_analysis_async(self, session, match_id):
+        return self.client.get_match_analysis(match_id)
+
+    async def get_match_detail_async(self, session, match_id):
+        return self.client.get_match_detail(match_id)
+
+    async def get_match_ids_async(self, session, puuid, start=0, count=20, after=None):
+        return self.client.get_match_ids(puuid, start, count, after)
+
+    async def get_match_details_batch_async(self, session, match_ids, limit=20):
+        return self.client.get_match_details_batch(match_ids[:limit])
+
+
+def start_stub_in_thread(latency: float):
+    """스텁 서버를 별도 스레드의 이벤트 루프에서 실행 (blocking 모드가 서버까지 막지 않도록)"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    runner, base_url = asyncio.run_coroutine_threadsafe(start_stub_server(latency=latency), loop).result()
+    return loop, runner, base_url
+
+
+def stop_stub(loop, runner):
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def succeeded(result) -> bool:
+    """analyze_user 결과가 정상 응답인지 (응답 캐시를 거치면 직렬화된 Response)"""
+    if hasattr(result, "body"):
+        return result.status_code == 200 and "error" not in (json.loads(result.body) or {})
+    return isinstance(result, dict) and "error" not in result
+
+
+def build_client(mode: str, base_url: str, rate_limit: str):
+    from rate_limiter import RateLimitScheduler
+    from riot_api import RiotAPI, ThreadedRiotAPI
+    api_key = os.environ["RIOT_API_KEY"]
+    scheduler = RateLimitScheduler(app_rate_limit=rate_limit)
+    if mode == "async":
+        from async_riot_api import AsyncRiotAPI
+        return AsyncRiotAPI(api_key, base_url=base_url, platform_url=base_url, scheduler=scheduler)
+    sync_client = RiotAPI(api_key, base_url=base_url, platform_url=base_url, scheduler=scheduler)
+    if mode == "threaded":
+        return ThreadedRiotAPI(sync_client)
+    return BlockingRiotAPI(sync_client)
+
+
+async def run(users: int, mode: str, latency: float, rate_limit: str):
+    import http_pool
+    import main
+    from cache_manager import close_async_pools
+
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    try:
+        main.async_riot_client = build_client(mode, base_url, rate_limit)
+
+        async def one_user(i: int):
+            started = time.perf_counter()
+            result = await main.analyze_user(f"BenchUser{i}#KR1")
+            elapsed = time.perf_counter() - started
+            return elapsed, succeeded(result)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one_user(i) for i in range(users)))
+        wall = time.perf_counter() - started
+    finally:
+        await http_pool.shutdown()
+        await close_async_pools()
+        stop_stub(stub_loop, runner)
+
+    latencies = np.array([r[0] for r in results]) * 1000
+    ok = sum(1 for r in results if r[1])
+    print(f"\n=== mode={mode} users={users} stub_latency={latency * 1000:.0f}ms ===")
+    print(f"성공: {ok}/{users}, 전체 소요: {wall:.2f}s")
+    print(f"p50: {np.percentile(latencies, 50):.0f}ms  p95: {np.percentile(latencies, 95):.0f}ms  "
+          f"p99: {np.percentile(latencies, 99):.0f}ms  max: {latencies.max():.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/analyze-user 동시성 벤치마크")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--mode", choices=["async", "threaded", "blocking"], default="async")
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 서버 응답 지연 (초)")
+    parser.add_argument("--rate-limit", default="100000:1",
+                        help="클라이언트 Rate Limit (기본값은 사실상 무제한, 동시성만 측정)")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.mode, args.latency, args.rate_limit))
@@ -0,0 +1,159 @@
+"""참가자 enrichment 벤치마크: 매번 dict/URL을 만드는 이전 루프 vs 미리 만든 레코드 참조.
+
+/analyze-user 한 응답(매치 20개 x 참가자 10명)의 match_details를 만드는 CPU 시간과,
+FastAPI 기본 직렬화(jsonable_encoder + json.dumps) / orjson 직렬화 시간을 비교합니다.
+Data Dragon 표는 실제 크기(주문 16개, 아이템 약 650개, 챔피언 약 170개)의 합성 데이터를 씁니다.
+두 방식의 결과가 같은지도 함께 확인합니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_enrichment.py --matches 20 --repeat 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+import ddragon  # noqa: E402
+import enrichment  # noqa: E402
+from match_projection import project_match  # noqa: E402
+from synthetic_data import CHAMPIONS, ITEM_IDS, SPELL_IDS, make_match  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    jsonable_encoder = None  # type: ignore[assignment]
+
+
+def make_tables() -> ddragon.DDragonTables:
+    spell_ids = SPELL_IDS + [1, 3, 6, 13, 30, 31, 32, 39, 54, 55]
+    summoner_data = {f"Summoner{key}": {"id": f"Summoner{key}", "key": str(key), "name": f"주문{key}",
+                                        "image": {"full": f"Summoner{key}.png"}} for key in spell_ids}
+    item_ids = sorted(set(ITEM_IDS) | set(range(1000, 1650)))
+    item_data = {str(item_id): {"name": f"아이템{item_id}"} for item_id in item_ids}
+    champion_names = CHAMPIONS + [f"Champ{i}" for i in range(150)]
+    champion_data = {name: {"id": name, "key": str(key), "name": name} for key, name in enumerate(champion_names, start=1)}
+    return ddragon.build_tables("14.1.1", summoner_data, item_data, champion_data)
+
+
+def legacy_details(dd: ddragon.DDragonTables, matches, puuid):
+    """이전 analyze_user의 참가자/밴 처리 루프"""
+    champion_id_to_name = {int(info["key"]): info["id"] for info in dd.champions.values()}
+    processed_matches = []
+    for match in matches:
+        my_stats = next((p for p in match['participants'] if p['puuid'] == puuid), None)
+        participants_list = []
+        for p in match['participants']:
+            summoner_spell_1_id = str(p.get("summoner1Id"))
+            summoner_spell_2_id = str(p.get("summoner2Id"))
+            spell1_info = dd.summoner_spells.get(summoner_spell_1_id)
+            spell2_info = dd.summoner_spells.get(summoner_spell_2_id)
+            processed_spell1 = {
+                "id": summoner_spell_1_id,
+                "name": spell1_info['name'] if spell1_info else "Unknown",
+                "icon": f"https://ddragon.leagueoflegends.com/cdn/{dd.version}/img/spell/{spell1_info['image']['full']}" if spell1_info and 'image' in spell1_info else ""
+            }
+            processed_spell2 = {
+                "id": summoner_spell_2_id,
+                "name": spell2_info['name'] if spell2_info else "Unknown",
+                "icon": f"https://ddragon.leagueoflegends.com/cdn/{dd.version}/img/spell/{spell2_info['image']['full']}" if spell2_info and 'image' in spell2_info else ""
+            }
+            item_ids = [p.get(f"item{i}") for i in range(7)]
+            processed_items = []
+            for item_id in item_ids:
+                if item_id and item_id != 0:
+                    item_info = dd.items.get(str(item_id))
+                    if item_info:
+                        processed_items.append({
+                            "id": item_id,
+                            "name": item_info.get('name'),
+                            "icon": f"https://ddragon.leagueoflegends.com/cdn/{dd.version}/img/item/{item_id}.png"
+                        })
+                    else:
+                        processed_items.append({"id": item_id, "name": "Unknown Item", "icon": ""})
+                else:
+                    processed_items.append(None)
+            participants_list.append({
+                "puuid": p.get("puuid"), "teamId": p.get("teamId"), "win": p.get("win"),
+                "championName": p.get("championName"), "teamPosition": p.get("teamPosition"),
+                "summonerName": f"{p.get('riotIdGameName')} #{p.get('riotIdTagline')}",
+                "kda_str": f"{p.get('kills')}/{p.get('deaths')}/{p.get('assists')}",
+                "kda_score": p.get("challenges", {}).get("kda", 0), "visionScore": p.get("visionScore"),
+                "wards": f"{p.get('wardsKilled')}/{p.get('wardsPlaced')}",
+                "cs": p.get("totalMinionsKilled") + p.get("neutralMinionsKilled", 0),
+                "damage": p.get("totalDamageDealtToChampions"), "gold": p.get("goldEarned"),
+                "kills": p.get('kills'), "deaths": p.get('deaths'), "assists": p.get('assists'),
+                "summonerSpell1": processed_spell1, "summonerSpell2": processed_spell2, "items": processed_items,
+            })
+        processed_teams = []
+        for team in match.get('teams', []):
+            processed_bans = []
+            for ban in team.get('bans', []):
+                ban_champion_id = ban.get('championId', -1)
+                name = "Unknown" if ban_champion_id == -1 else champion_id_to_name.get(ban_champion_id, "Unknown")
+                processed_bans.append({**ban, "championName": name})
+            processed_teams.append({**team, "bans": processed_bans})
+        processed_matches.append({"matchId": match['matchId'], "my_stats": {"win": my_stats['win']},
+                                  "participants": participants_list, "teams": processed_teams})
+    return processed_matches
+
+
+def enriched_details(enr: enrichment.Enrichment, matches, puuid):
+    processed_matches = []
+    for match in matches:
+        my_stats = next((p for p in match['participants'] if p['puuid'] == puuid), None)
+        participants_list = [enrichment.match_participant(enr, p) for p in match['participants']]
+        processed_teams = enrichment.match_teams(enr, match.get('teams', []))
+        processed_matches.append({"matchId": match['matchId'], "my_stats": {"win": my_stats['win']},
+                                  "participants": participants_list, "teams": processed_teams})
+    return processed_matches
+
+
+def per_call_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main(n_matches: int, repeat: int):
+    dd = make_tables()
+    enr = enrichment.build(dd)
+    puuid = "bench-puuid"
+    matches = [project_match(make_match(f"KR_{i}", [puuid] + [f"p{i}-{k}" for k in range(9)])) for i in range(n_matches)]
+
+    before, after = legacy_details(dd, matches, puuid), enriched_details(enr, matches, puuid)
+    print(f"\n=== {n_matches} matches/response, repeat={repeat} ===")
+    print(f"결과 일치: {before == after}")
+
+    serializers = [("json.dumps", lambda body: json.dumps(body, ensure_ascii=False))]
+    if jsonable_encoder is not None:
+        serializers.insert(0, ("FastAPI 기본", lambda body: json.dumps(jsonable_encoder(body), ensure_ascii=False)))
+    if orjson is not None:
+        serializers.append(("orjson", orjson.dumps))
+
+    print(f"{'':<14}{'before':>12}{'after':>12}")
+    build_before = per_call_ms(lambda: legacy_details(dd, matches, puuid), repeat)
+    build_after = per_call_ms(lambda: enriched_details(enr, matches, puuid), repeat)
+    print(f"{'응답 구성':<14}{build_before:>9.3f} ms{build_after:>9.3f} ms  (x{build_before / build_after:.2f})")
+    for name, serialize in serializers:
+        ser_before = per_call_ms(lambda: serialize(before), repeat)
+        ser_after = per_call_ms(lambda: serialize(after), repeat)
+        print(f"{name:<14}{ser_before:>9.3f} ms{ser_after:>9.3f} ms  (x{ser_before / ser_after:.2f})")
+    print(f"레코드 생성 (Data Dragon 로드당 1회): {per_call_ms(lambda: enrichment.build(dd), 20):.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="참가자 enrichment 벤치마크")
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.matches, args.repeat)
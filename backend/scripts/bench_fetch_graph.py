@@ -0,0 +1,78 @@
+"""/analyze-user, /current-game의 단계별 소요 시간(Server-Timing)과 critical path 벤치마크.
+
+캐시가 빈 새 소환사로 요청해 Server-Timing 헤더의 단계별 소요 시간을 모으고, 단계 시간의 합(직렬로 호출했을 때의
+지연)과 실제 전체 시간(total)을 비교합니다. 의존 관계가 없는 단계가 동시에 실행되면 total은 합보다 작고
+가장 긴 의존 경로의 시간에 가까워집니다.
+
+서버 없이 엔드포인트 함수를 직접 호출하고, Redis는 닫힌 포트를 써서 인메모리 캐시만 씁니다.
+
+실행 (backend 디렉터리에서):
+    REDIS_PORT=6399 python scripts/bench_fetch_graph.py --users 5 --latency 0.08
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "bench-key")
+
+from bench_concurrency import build_client, start_stub_in_thread, stop_stub  # noqa: E402
+
+
+def parse_server_timing(header: str) -> dict:
+    timings = {}
+    for entry in header.split(","):
+        name, _, duration = entry.strip().partition(";dur=")
+        timings[name] = float(duration)
+    return timings
+
+
+def report(name: str, samples: list):
+    stages = defaultdict(list)
+    for timings in samples:
+        for stage, duration in timings.items():
+            stages[stage].append(duration)
+    print(f"\n[{name}] {len(samples)}회 평균")
+    for stage, durations in stages.items():
+        if stage != "total":
+            print(f"  {stage:<16}{sum(durations) / len(durations):>9.0f} ms")
+    serial = sum(sum(d for s, d in timings.items() if s != "total") for timings in samples) / len(samples)
+    total = sum(timings["total"] for timings in samples) / len(samples)
+    print(f"  {'단계 합(직렬)':<14}{serial:>9.0f} ms")
+    print(f"  {'total':<16}{total:>9.0f} ms  (x{serial / total:.2f})")
+
+
+async def run(users: int, latency: float, mode: str):
+    import http_pool
+    import main
+    from cache_manager import close_async_pools
+
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    try:
+        main.async_riot_client = build_client(mode, base_url, "20000:1")
+        analyze, first_screen = [], []
+        for i in range(users):
+            response = await main.analyze_user(f"GraphUser{i}#KR1")
+            analyze.append(parse_server_timing(response.headers["Server-Timing"]))
+            response = await main.analyze_user(f"GraphFirst{i}#KR1", limit=10, fields="league,analysis,match_details.my_stats")
+            first_screen.append(parse_server_timing(response.headers["Server-Timing"]))
+        print(f"\n=== mode={mode} stub_latency={latency * 1000:.0f}ms ===")
+        report("/analyze-user (limit=20, 전체 필드)", analyze)
+        report("/analyze-user (limit=10, fields)", first_screen)
+    finally:
+        await http_pool.shutdown()
+        await close_async_pools()
+        stop_stub(stub_loop, runner)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server-Timing 단계별 소요 시간 벤치마크")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 응답 지연(초)")
+    parser.add_argument("--mode", choices=["async", "threaded"], default="async")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.latency, args.mode))
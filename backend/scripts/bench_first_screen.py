@@ -0,0 +1,86 @@
+"""/analyze-user 첫 화면 응답 크기/시간 벤치마크.
+
+이전 형식(매치 20개 x 참가자 10명 + 팀 전체를 한 번에)과 첫 화면용 요청(?limit=10&fields=...,
+참가자/팀은 드롭다운을 펼칠 때 /match-details로 조회)의 응답 바이트와 응답 시간을 비교합니다.
+각 방식은 캐시가 빈 새 소환사로 측정(cold)하고, 같은 요청을 다시 보내 응답 캐시 적중(warm)도 잽니다.
+이어서 "더보기"(?cursor=)와 매치 하나 펼치기(/match-details)의 비용도 함께 출력합니다.
+
+서버 없이 엔드포인트 함수를 직접 호출하므로 본문 전송 시간은 포함하지 않습니다 (응답은 스트리밍하지
+않으므로 핸들러 시간이 곧 첫 바이트까지의 시간). Redis는 닫힌 포트를 써서 인메모리 캐시만 씁니다.
+
+실행 (backend 디렉터리에서):
+    REDIS_PORT=6399 python scripts/bench_first_screen.py --latency 0.08
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "bench-key")
+
+from bench_concurrency import build_client, start_stub_in_thread, stop_stub  # noqa: E402
+from bench_enrichment import make_tables  # noqa: E402
+
+# 프론트엔드 첫 화면(요약 카드)이 쓰는 필드
+FIRST_SCREEN_FIELDS = ",".join([
+    "user_info", "league", "total_matches", "analysis", "has_more_matches", "next_cursor",
+    "match_details.matchId", "match_details.gameMode", "match_details.queueId", "match_details.queueType",
+    "match_details.gameDuration", "match_details.my_stats",
+])
+
+
+async def timed(call):
+    started = time.perf_counter()
+    response = await call()
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.status_code == 200, response
+    return elapsed, len(response.body), response
+
+
+async def run(latency: float):
+    import ddragon
+    import http_pool
+    import main
+    from cache_manager import close_async_pools
+
+    ddragon._current = make_tables()
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    try:
+        main.async_riot_client = build_client("async", base_url, "20000:1")
+        cases = [
+            ("이전 형식 (limit=20, 전체 필드)", dict()),
+            ("첫 화면 (limit=10, fields)", dict(limit=10, fields=FIRST_SCREEN_FIELDS)),
+        ]
+        print(f"\n=== stub_latency={latency * 1000:.0f}ms ===")
+        print(f"{'':<34}{'bytes':>10}{'cold':>12}{'warm':>12}")
+        for i, (name, params) in enumerate(cases):
+            full_id = f"FirstScreen{i}#KR1"
+            cold, size, response = await timed(lambda: main.analyze_user(full_id, **params))
+            warm, _, _ = await timed(lambda: main.analyze_user(full_id, **params))
+            print(f"{name:<34}{size:>10,}{cold:>9.0f} ms{warm:>9.2f} ms")
+
+        # 첫 화면 이후: 더보기, 매치 하나 펼치기 (매치 상세는 첫 화면에서 이미 캐시됨)
+        body = json.loads(response.body)
+        cursor = body["next_cursor"]
+        more, size, _ = await timed(lambda: main.analyze_user("FirstScreen1#KR1", cursor=cursor, limit=10,
+                                                              fields=FIRST_SCREEN_FIELDS))
+        print(f"{'더보기 (cursor, limit=10)':<34}{size:>10,}{more:>9.0f} ms")
+        match_id = body["match_details"][0]["matchId"]
+        expand, size, _ = await timed(lambda: main.get_match_details(match_id))
+        print(f"{'펼치기 (/match-details)':<34}{size:>10,}{expand:>9.0f} ms")
+    finally:
+        await http_pool.shutdown()
+        await close_async_pools()
+        stop_stub(stub_loop, runner)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/analyze-user 첫 화면 응답 크기/시간 벤치마크")
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 응답 지연(초)")
+    args = parser.parse_args()
+    asyncio.run(run(args.latency))
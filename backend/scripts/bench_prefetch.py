@@ -0,0 +1,88 @@
+"""백그라운드 prefetch 벤치마크: 콜드 /analyze-user vs prefetch가 미리 만든 응답.
+
+콜드 소환사는 그대로 요청하고, 다른 소환사는 /track으로 등록해 prefetch 워커가 응답을 만든 뒤 요청합니다.
+prefetch한 소환사의 요청은 Server-Timing에 응답 캐시 적중(계정/매치 ID 확인)만 남아야 합니다.
+prefetch 중에 대화형 요청을 보내 BackgroundScheduler가 Rate Limit 예산을 양보하는지도 확인합니다.
+
+서버 없이 엔드포인트 함수를 직접 호출하고, Redis는 닫힌 포트를 써서 인메모리 캐시만 씁니다.
+
+실행 (backend 디렉터리에서):
+    REDIS_PORT=6399 python scripts/bench_prefetch.py --users 4 --latency 0.08
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "bench-key")
+
+from bench_concurrency import build_client, start_stub_in_thread, stop_stub  # noqa: E402
+
+
+async def timed_request(main, full_id: str):
+    started = time.perf_counter()
+    response = await main.analyze_user(full_id)
+    return (time.perf_counter() - started) * 1000, response.headers.get("Server-Timing", "")
+
+
+async def run(users: int, latency: float, mode: str):
+    import http_pool
+    import main
+    import prefetch
+    from cache_manager import close_async_pools
+    from rate_limiter import BackgroundScheduler
+
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    try:
+        main.async_riot_client = build_client(mode, base_url, "20:1")
+        background = build_client(mode, base_url, "20:1")
+        scheduler = main.async_riot_client.rate_limiter if mode == "async" else main.async_riot_client.client.rate_limiter
+        # 같은 예산(스케줄러)과 캐시를 쓰는 prefetch 클라이언트
+        if mode == "async":
+            background.rate_limiter = BackgroundScheduler(scheduler, prefetch.RESERVE)
+            background.cache = main.async_riot_client.cache
+            background.flight = main.async_riot_client.flight
+        else:
+            background.client.rate_limiter = BackgroundScheduler(scheduler, prefetch.RESERVE)
+            background.client.cache = background.cache = main.async_riot_client.cache
+        main.prefetch_client = background
+        main.prefetcher = prefetch.Prefetcher(main.prefetch_player)
+
+        print(f"\n=== mode={mode} stub_latency={latency * 1000:.0f}ms users={users} ===")
+        cold = [await timed_request(main, f"ColdUser{i}#KR1") for i in range(users)]
+
+        for i in range(users):
+            await main.track_player(f"WarmUser{i}#KR1")
+        started = time.perf_counter()
+        worker = asyncio.ensure_future(main.prefetcher.run())
+        # prefetch가 도는 동안의 대화형 요청 (BackgroundScheduler가 양보해야 함)
+        interactive = [await timed_request(main, f"DuringPrefetch{i}#KR1") for i in range(2)]
+        while main.prefetcher.warmed + main.prefetcher.errors < users:
+            await asyncio.sleep(0.05)
+        prefetch_ms = (time.perf_counter() - started) * 1000
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        warm = [await timed_request(main, f"WarmUser{i}#KR1") for i in range(users)]
+
+        average = lambda samples: sum(ms for ms, _ in samples) / len(samples)
+        print(f"콜드 /analyze-user          {average(cold):>8.0f} ms   {cold[0][1]}")
+        print(f"prefetch 중 대화형 요청      {average(interactive):>8.0f} ms")
+        print(f"prefetch 후 /analyze-user   {average(warm):>8.0f} ms   {warm[0][1]}")
+        print(f"prefetch {users}명 소요       {prefetch_ms:>8.0f} ms   {await main.prefetcher.stats()}")
+    finally:
+        await http_pool.shutdown()
+        await close_async_pools()
+        stop_stub(stub_loop, runner)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="백그라운드 prefetch 벤치마크")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 응답 지연(초)")
+    parser.add_argument("--mode", choices=["async", "threaded"], default="async")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.latency, args.mode))
@@ -0,0 +1,96 @@
+"""우선순위 큐 벤치마크: 혼합 부하에서 가벼운 /current-game의 지연 (우선순위 적용 vs 도착 순서).
+
+한 클라이언트(heavy)가 /analyze-trends(타임라인 대량 조회)와 새 소환사 /analyze-user(매치 상세 다건 조회)를
+계속 보내는 동안, 다른 클라이언트(light)가 새 소환사의 /current-game(단건 조회 3번)을 일정 간격으로 보내고
+그 지연의 p50/p95/max를 잽니다. Rate Limit 예산(기본 20:1)이 모자란 상황에서 우선순위가 없으면
+/current-game이 앞서 쌓인 다건 조회 뒤에 줄을 섭니다.
+
+서버 없이 엔드포인트 함수를 직접 호출하고, Redis는 닫힌 포트를 써서 인메모리 캐시만 씁니다.
+스텁 서버가 같은 프로세스에서 큰 타임라인을 만들므로(GIL) 이벤트 루프가 가끔 멈추며, 그 영향은 max에 섞입니다.
+
+실행 (backend 디렉터리에서):
+    REDIS_PORT=6399 python scripts/bench_priority.py --lookups 15 --latency 0.08
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "bench-key")
+
+from bench_concurrency import build_client, start_stub_in_thread, stop_stub  # noqa: E402
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def heavy_load(main, round_id: str, stop: asyncio.Event):
+    i = 0
+    while not stop.is_set():
+        response = await main.analyze_trends(f"Trend{round_id}{i}#KR1", count=40)
+        async for _ in response.body_iterator:
+            if stop.is_set():
+                break
+        await main.analyze_user(f"Heavy{round_id}{i}#KR1")
+        i += 1
+
+
+async def light_lookups(main, round_id: str, lookups: int, interval: float):
+    latencies = []
+    for i in range(lookups):
+        started = time.perf_counter()
+        await main.get_current_game(f"Light{round_id}{i}#KR1")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def run(lookups: int, latency: float, rate_limit: str, mode: str):
+    import http_pool
+    import main
+    import rate_limiter
+    from cache_manager import close_async_pools
+
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    try:
+        print(f"\n=== mode={mode} stub_latency={latency * 1000:.0f}ms rate_limit={rate_limit} ===")
+        for prioritize in (False, True):
+            main.async_riot_client = build_client(mode, base_url, rate_limit)
+            client = main.async_riot_client if mode == "async" else main.async_riot_client.client
+            client.rate_limiter.prioritize = prioritize
+            await main.warm_redis()  # 첫 Redis 연결 시도(닫힌 포트) 시간을 빼고 잼
+            round_id = "P" if prioritize else "F"
+
+            stop = asyncio.Event()
+            with rate_limiter.client_scope("heavy"):
+                heavy = asyncio.ensure_future(heavy_load(main, round_id, stop))
+            await asyncio.sleep(1.0)  # 다건 조회가 먼저 쌓이게 함
+            with rate_limiter.client_scope("light"):
+                latencies = await asyncio.ensure_future(light_lookups(main, round_id, lookups, 0.3))
+            stop.set()
+            heavy.cancel()
+            await asyncio.gather(heavy, return_exceptions=True)
+
+            name = "우선순위 + 공정 분배" if prioritize else "도착 순서"
+            print(f"{name:<16} /current-game p50={percentile(latencies, 0.5):>6.0f} ms  "
+                  f"p95={percentile(latencies, 0.95):>6.0f} ms  max={max(latencies):>6.0f} ms")
+    finally:
+        await http_pool.shutdown()
+        await close_async_pools()
+        stop_stub(stub_loop, runner)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="혼합 부하에서 우선순위 큐 효과 벤치마크")
+    parser.add_argument("--lookups", type=int, default=15)
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 응답 지연(초)")
+    parser.add_argument("--rate-limit", default="20:1")
+    parser.add_argument("--mode", choices=["async", "threaded"], default="async")
+    args = parser.parse_args()
+    asyncio.run(run(args.lookups, args.latency, args.rate_limit, args.mode))
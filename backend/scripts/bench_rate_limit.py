@@ -0,0 +1,63 @@
+"""Rate Limit 스케줄러 검증 스크립트.
+
+Rate Limit을 강제하는 로컬 스텁 서버에 AsyncRiotAPI로 매치 상세 요청을 몰아 보내고,
+서버가 거절(429)한 횟수와 실제 처리량을 이론상 최대 처리량과 비교합니다.
+--initial-limit으로 스케줄러 초기 제한값을 느슨하게 주면, 응답 헤더로 제한을 학습하고
+429를 재시도로 복구하는지 확인할 수 있습니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_rate_limit.py --requests 120 --app-limit 10:1,60:10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+from async_riot_api import AsyncRiotAPI  # noqa: E402
+from rate_limiter import RateLimitScheduler, parse_rate_limits  # noqa: E402
+from riot_stub_server import start_stub_server  # noqa: E402
+
+
+def theoretical_seconds(n_requests: int, limit_header: str) -> float:
+    """고정 윈도우 제한에서 n_requests를 처리하는 데 필요한 최소 시간 (대략)"""
+    return max((n_requests - 1) // count * seconds for count, seconds in parse_rate_limits(limit_header))
+
+
+async def run(n_requests: int, app_limit: str, method_limit: str, latency: float, initial_limit: str):
+    runner, base_url = await start_stub_server(latency=latency, app_limit=app_limit, method_limit=method_limit)
+    try:
+        scheduler = RateLimitScheduler(app_rate_limit=initial_limit or app_limit)
+        client = AsyncRiotAPI("RGAPI-BENCHMARK", base_url=base_url, platform_url=base_url, scheduler=scheduler)
+        client.cache.redis_client = None  # 캐시 없이 매 요청을 서버로 보냄
+
+        async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(client.get_match_detail_async(session, f"KR_{i}") for i in range(n_requests)))
+            elapsed = time.perf_counter() - started
+    finally:
+        stats = runner.app["stats"]
+        await runner.cleanup()
+
+    ok = sum(1 for r in results if r)
+    print(f"\n=== requests={n_requests} app_limit={app_limit} method_limit={method_limit or '-'} ===")
+    print(f"성공: {ok}/{n_requests}, 서버 수신: {stats['requests']}, 429 거절: {stats['rejected']}")
+    print(f"소요: {elapsed:.2f}s (이론상 최소 약 {theoretical_seconds(n_requests, app_limit):.0f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate Limit 스케줄러 검증")
+    parser.add_argument("--requests", type=int, default=120)
+    parser.add_argument("--app-limit", default="10:1,60:10")
+    parser.add_argument("--method-limit", default="")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--initial-limit", default="",
+                        help="스케줄러 초기 제한값 (비우면 서버와 동일, 느슨하게 주면 헤더 학습/429 재시도를 확인)")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.app_limit, args.method_limit, args.latency, args.initial_limit))
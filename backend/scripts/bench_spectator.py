@@ -0,0 +1,86 @@
+"""현재 게임 폴링 벤치마크: 같은 게임 참가자 10명이 /current-game을 계속 새로고침할 때의 spectator 호출 수.
+
+스텁 서버의 "Live{그룹}P{번호}" 소환사는 같은 그룹 10명이 한 게임 중입니다. 참가자 10명과 게임 중이 아닌 소환사 1명이
+--interval마다 /current-game을 --duration 동안 요청하고, 스텁이 받은 Riot 호출 / spectator 호출 수와 지연을 셉니다
+(참가자 한 명이 먼저 게임을 조회해 둔 뒤부터 셈).
+spectator 호출은 게임 스냅샷이 ACTIVE_GAME_TTL마다 만료될 때 한 번(+ "게임 중 아님"은 NOT_IN_GAME_TTL마다 한 번)이어야 합니다.
+
+서버 없이 엔드포인트 함수를 직접 호출하고, Redis는 닫힌 포트를 써서 인메모리 캐시만 씁니다.
+
+실행 (backend 디렉터리에서):
+    REDIS_PORT=6399 python scripts/bench_spectator.py --duration 12 --ttl 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+os.environ.setdefault("RIOT_API_KEY", "bench-key")
+
+from bench_concurrency import build_client, start_stub_in_thread, stop_stub  # noqa: E402
+
+
+def percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def poll(main, full_id: str, duration: float, interval: float, latencies, statuses):
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        result = await main.get_current_game(full_id)
+        latencies.append((time.perf_counter() - started) * 1000)
+        body = json.loads(result.body) if hasattr(result, "body") else result
+        statuses[body.get("status", body.get("error"))] = statuses.get(body.get("status", body.get("error")), 0) + 1
+        await asyncio.sleep(interval)
+
+
+async def run(duration: float, interval: float, latency: float, mode: str):
+    import cache_manager
+    import http_pool
+    import main
+
+    stub_loop, runner, base_url = start_stub_in_thread(latency)
+    stats = runner.app["stats"]
+    try:
+        main.async_riot_client = build_client(mode, base_url, "20:1")
+        await main.warm_redis()
+        print(f"\n=== mode={mode} stub_latency={latency * 1000:.0f}ms duration={duration:.0f}s interval={interval}s "
+              f"ACTIVE_GAME_TTL={cache_manager.ACTIVE_GAME_TTL}s NOT_IN_GAME_TTL={cache_manager.NOT_IN_GAME_TTL}s ===")
+        latencies, statuses = [], {}
+        full_ids = [f"LiveG1P{i}#KR1" for i in range(10)] + ["Idle0#KR1"]
+        # 처음 한 명이 게임을 찾은 뒤 나머지가 들어옴 (아무도 gameId를 모를 때 10명이 동시에 오면 각자 조회)
+        await main.get_current_game(full_ids[0])
+        requests_before, spectator_before = stats["requests"], stats["spectator"]
+        await asyncio.gather(*(poll(main, full_id, duration, interval, latencies, statuses) for full_id in full_ids))
+
+        windows = duration / cache_manager.ACTIVE_GAME_TTL
+        print(f"/current-game 요청        {len(latencies):>6}   {statuses}")
+        print(f"Riot 호출 (전체)          {stats['requests'] - requests_before:>6}")
+        print(f"spectator 호출            {stats['spectator'] - spectator_before:>6}   "
+              f"(게임 스냅샷 윈도우 약 {windows:.1f}개 + 게임 중 아님)")
+        print(f"지연 p50={percentile(latencies, 0.5):.1f} ms  p95={percentile(latencies, 0.95):.1f} ms  "
+              f"max={max(latencies):.0f} ms")
+    finally:
+        await http_pool.shutdown()
+        await cache_manager.close_async_pools()
+        stop_stub(stub_loop, runner)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="현재 게임 폴링 시 spectator 캐시 효과 벤치마크")
+    parser.add_argument("--duration", type=float, default=12.0, help="폴링 시간(초)")
+    parser.add_argument("--interval", type=float, default=0.5, help="소환사마다 새로고침 간격(초)")
+    parser.add_argument("--ttl", type=int, default=None, help="ACTIVE_GAME_TTL(초), 주지 않으면 환경 변수/기본값")
+    parser.add_argument("--latency", type=float, default=0.08, help="스텁 응답 지연(초)")
+    parser.add_argument("--mode", choices=["async", "threaded"], default="async")
+    args = parser.parse_args()
+    if args.ttl is not None:
+        os.environ["ACTIVE_GAME_TTL"] = str(args.ttl)  # cache_manager를 import하기 전에 설정
+    asyncio.run(run(args.duration, args.interval, args.latency, args.mode))
@@ -0,0 +1,105 @@
+"""기동 시간 벤치마크: 프로세스 시작 -> main 임포트 -> 첫 응답 -> /ready.
+
+무료 티어 호스트는 유휴 시 잠들었다가 첫 요청에 다시 기동하므로, 새 파이썬 프로세스에서
+main을 임포트하고 lifespan을 시작한 뒤 GET /에 첫 응답이 나올 때까지의 시간을 잽니다.
+/ready가 있으면 200이 될 때까지의 시간(백그라운드 기동 준비 완료)도 함께 잽니다.
+서버(uvicorn) 없이 ASGI 앱을 직접 호출하므로 네트워크 소켓 비용은 포함하지 않습니다.
+
+Redis는 닫힌 포트, Data Dragon 스냅샷은 빈 임시 디렉터리를 기본으로 써서 최악의 경우(첫 배포, Redis 없음)를
+재현합니다. --app-dir로 다른 체크아웃(예: git worktree로 받은 이전 커밋의 backend)을 측정해 비교할 수 있습니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_startup.py --runs 5
+    python scripts/bench_startup.py --runs 5 --app-dir /tmp/old/backend
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def asgi_get(app, path: str) -> int:
+    """ASGI 앱에 GET 요청을 보내고 상태 코드를 반환"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+async def child(started: float, ready_timeout: float):
+    import main
+    imported = time.perf_counter()
+    timings = {"import_ms": (imported - started) * 1000}
+    async with main.app.router.lifespan_context(main.app):
+        await asgi_get(main.app, "/")
+        timings["first_response_ms"] = (time.perf_counter() - started) * 1000
+        deadline = time.perf_counter() + ready_timeout
+        while time.perf_counter() < deadline:
+            status = await asgi_get(main.app, "/ready")
+            if status == 404:  # /ready가 없는 이전 버전
+                break
+            if status == 200:
+                timings["ready_ms"] = (time.perf_counter() - started) * 1000
+                break
+            await asyncio.sleep(0.01)
+    print(json.dumps(timings))
+
+
+def run_once(app_dir: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"], cwd=app_dir, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs: int, app_dir: str, redis_port: int):
+    env = {
+        **os.environ,
+        "PYTHONPATH": app_dir,
+        "RIOT_API_KEY": os.environ.get("RIOT_API_KEY", "bench-key"),
+        "REDIS_HOST": "127.0.0.1",
+        "REDIS_PORT": str(redis_port),
+        "DDRAGON_SNAPSHOT_DIR": tempfile.mkdtemp(prefix="ddragon-bench-"),
+    }
+    env.pop("REDIS_URL", None)
+    results = [run_once(app_dir, env) for _ in range(runs)]
+
+    print(f"\n=== {app_dir} ({runs} runs, Redis 127.0.0.1:{redis_port}) ===")
+    for key in ("import_ms", "first_response_ms", "ready_ms"):
+        values = sorted(r[key] for r in results if key in r)
+        if values:
+            print(f"{key:<20} median {values[len(values) // 2]:>8.0f} ms   min {values[0]:>8.0f} ms   max {values[-1]:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기동 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app-dir", default=BACKEND_DIR, help="main.py가 있는 디렉터리")
+    parser.add_argument("--redis-port", type=int, default=6399, help="Redis 포트 (기본: 닫힌 포트)")
+    parser.add_argument("--ready-timeout", type=float, default=30.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child_started = time.perf_counter()
+        sys.path.insert(0, os.getcwd())
+        asyncio.run(child(child_started, args.ready_timeout))
+    else:
+        main(args.runs, os.path.abspath(args.app_dir), args.redis_port)
@@ -0,0 +1,69 @@
+"""타임라인 파싱 벤치마크: 전체 json.loads 후 축약 vs 스트리밍 파싱(ijson)으로 바로 축약.
+
+합성 원본 타임라인(JSON 바이트)을 두 방식으로 축약본으로 만들며 타임라인 한 개당 소요 시간과
+tracemalloc 기준 최대 메모리 사용량을 비교합니다. 두 결과가 같은지도 함께 확인합니다.
+ijson이 설치되어 있어야 스트리밍 쪽을 측정합니다.
+
+실행 (backend 디렉터리에서):
+    python scripts/bench_timeline_parse.py --minutes 40 --repeat 5
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+from match_projection import TimelineStreamProjector, ijson, project_timeline  # noqa: E402
+from synthetic_data import make_timeline  # noqa: E402
+
+
+def full_parse(raw: bytes):
+    return project_timeline(json.loads(raw))
+
+
+def stream_parse(raw: bytes):
+    projector = TimelineStreamProjector()
+    # 실제 응답처럼 파일 형태로 조금씩 읽도록 BytesIO로 넘김
+    for prefix, event, value in ijson.parse(io.BytesIO(raw), use_float=True):
+        projector.feed(prefix, event, value)
+    return projector.result()
+
+
+def measure(fn, raw: bytes, repeat: int):
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(raw)
+    return (time.perf_counter() - started) / repeat * 1000, peak / 1024 / 1024
+
+
+def main(minutes: int, repeat: int):
+    raw = json.dumps(make_timeline("KR_1", minutes=minutes)).encode()
+    print(f"\n=== 원본 {len(raw) / 1024 / 1024:.2f} MB ({minutes}분), repeat={repeat} ===")
+    if ijson is None:
+        print("ijson이 설치되어 있지 않아 전체 파싱만 측정합니다.")
+    else:
+        print(f"결과 일치: {full_parse(raw) == stream_parse(raw)}")
+    print(f"{'mode':<8}{'time':>12}{'peak memory':>16}")
+    for name, fn in (("full", full_parse), ("stream", stream_parse)):
+        if fn is stream_parse and ijson is None:
+            continue
+        ms, peak_mb = measure(fn, raw, repeat)
+        print(f"{name:<8}{ms:>9.1f} ms{peak_mb:>13.2f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="타임라인 파싱 벤치마크")
+    parser.add_argument("--minutes", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.minutes, args.repeat)
@@ -0,0 +1,189 @@
+"""로컬 Riot API 스텁 서버 (벤치마크용).
+
+account / league / summoner / spectator / match-v5 엔드포인트를 합성 데이터로 흉내 내며,
+모든 응답에 고정 지연(latency)을 넣어 실제 Riot 왕복 시간을 재현합니다.
+app_limit/method_limit을 주면 Riot과 같은 고정 윈도우 Rate Limit을 적용해
+X-App-Rate-Limit / X-Method-Rate-Limit(-Count) 헤더를 내려주고, 초과 시 429 + Retry-After를 반환합니다.
+
+단독 실행:
+    python scripts/riot_stub_server.py --port 8099 --latency 0.08 --app-limit 20:1,100:120
+"""
+import argparse
+import asyncio
+import math
+import os
+import re
+import sys
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic_data import make_match, make_puuids, make_timeline  # noqa: E402
+
+RANKED_GAMES = 230
+LIVE_SUMMONER = re.compile(r"^sid-puuid-Live(\w+?)P\d+-(.+)$")
+
+
+class FixedWindowLimiter:
+    """Riot 서버처럼 첫 요청 시점부터 시작하는 고정 윈도우로 요청 수를 세는 제한기"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        self.limits: List[Tuple[int, int]] = [tuple(int(v) for v in part.split(":")) for part in spec.split(",")]  # type: ignore[misc]
+        self.windows: Dict[int, List[float]] = {}  # seconds -> [윈도우 시작 시각, 요청 수]
+        self.rejected = 0
+
+    def hit(self, now: float) -> Optional[float]:
+        """요청 1회를 기록. 제한을 넘으면 Retry-After(초)를, 아니면 None을 반환"""
+        retry_after = None
+        for count, seconds in self.limits:
+            window = self.windows.get(seconds)
+            if window is None or now - window[0] >= seconds:
+                window = self.windows[seconds] = [now, 0]
+            if window[1] >= count:
+                retry_after = max(retry_after or 0, window[0] + seconds - now)
+        if retry_after is not None:
+            self.rejected += 1
+            return retry_after
+        for _, seconds in self.limits:
+            self.windows[seconds][1] += 1
+        return None
+
+    def count_header(self) -> str:
+        return ",".join(f"{int(self.windows.get(seconds, [0, 0])[1])}:{seconds}" for _, seconds in self.limits)
+
+
+def create_app(latency: float = 0.08, app_limit: Optional[str] = None, method_limit: Optional[str] = None) -> web.Application:
+    app_limiter = FixedWindowLimiter(app_limit) if app_limit else None
+    method_limiters: Dict[str, FixedWindowLimiter] = defaultdict(lambda: FixedWindowLimiter(method_limit or ""))
+    stats = {"requests": 0, "rejected": 0, "spectator": 0}
+    owners: Dict[str, str] = {}  # match_id -> 이 매치 ID를 조회한 puuid
+
+    @web.middleware
+    async def rate_limit(request: web.Request, handler):
+        stats["requests"] += 1
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        limiters = []
+        if app_limiter:
+            limiters.append(("X-App-Rate-Limit", app_limiter))
+        if method_limit:
+            limiters.append(("X-Method-Rate-Limit", method_limiters[route]))
+        now = time.monotonic()
+        retry_after = None
+        limit_type = None
+        for name, limiter in limiters:
+            blocked = limiter.hit(now)
+            if blocked is not None:
+                retry_after = max(retry_after or 0, blocked)
+                limit_type = limit_type or ("application" if name == "X-App-Rate-Limit" else "method")
+        headers = {}
+        for name, limiter in limiters:
+            headers[name] = limiter.spec
+            headers[f"{name}-Count"] = limiter.count_header()
+        if retry_after is not None:
+            stats["rejected"] += 1
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            headers["X-Rate-Limit-Type"] = limit_type
+            return web.json_response({"status": {"message": "Rate limit exceeded", "status_code": 429}},
+                                     status=429, headers=headers)
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    async def delay():
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    async def account(request: web.Request):
+        await delay()
+        name, tag = request.match_info["name"], request.match_info["tag"]
+        return web.json_response({"puuid": f"puuid-{name}-{tag}", "gameName": name, "tagLine": tag})
+
+    async def league(request: web.Request):
+        await delay()
+        return web.json_response([{
+            "queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "II", "leaguePoints": 42,
+            "wins": RANKED_GAMES // 2, "losses": RANKED_GAMES - RANKED_GAMES // 2,
+        }])
+
+    async def summoner(request: web.Request):
+        await delay()
+        puuid = request.match_info["puuid"]
+        return web.json_response({"id": f"sid-{puuid}", "puuid": puuid, "summonerLevel": 300})
+
+    async def spectator(request: web.Request):
+        await delay()
+        stats["spectator"] += 1
+        # "Live{그룹}P{번호}#태그" 소환사는 같은 그룹 10명이 한 게임 중 (그 밖의 소환사는 게임 중 아님)
+        live = LIVE_SUMMONER.match(request.match_info["summoner_id"])
+        if not live:
+            return web.json_response({"status": {"message": "Data not found", "status_code": 404}}, status=404)
+        group, tag = live.group(1), live.group(2)
+        participants = []
+        for i in range(10):
+            puuid = f"puuid-Live{group}P{i}-{tag}"
+            participants.append({"puuid": puuid, "summonerId": f"sid-{puuid}", "summonerName": f"Live{group}P{i}",
+                                 "championId": 1 + i, "teamId": 100 if i < 5 else 200, "spell1Id": 4, "spell2Id": 14})
+        return web.json_response({"gameId": 7_000_000 + zlib.crc32(group.encode()) % 1_000_000, "gameMode": "CLASSIC",
+                                  "gameType": "MATCHED", "gameStartTime": int(time.time() * 1000) - 600_000,
+                                  "mapId": 11, "gameQueueConfigId": 420, "participants": participants})
+
+    async def match_ids(request: web.Request):
+        await delay()
+        puuid = request.match_info["puuid"]
+        start = int(request.query.get("start", 0))
+        count = int(request.query.get("count", 20))
+        ids = [f"KR_{zlib.crc32(puuid.encode()) % 10_000_000 * 1000 + n}" for n in range(start, min(start + count, RANKED_GAMES))]
+        # 매치/타임라인 응답의 1번 참가자를 조회한 소환사로 채우기 위해 기록
+        owners.update((match_id, puuid) for match_id in ids)
+        return web.json_response(ids)
+
+    async def match(request: web.Request):
+        await delay()
+        match_id = request.match_info["match_id"]
+        return web.json_response(make_match(match_id, make_puuids(match_id, owners.get(match_id))))
+
+    async def timeline(request: web.Request):
+        await delay()
+        match_id = request.match_info["match_id"]
+        return web.json_response(make_timeline(match_id, make_puuids(match_id, owners.get(match_id))))
+
+    app = web.Application(middlewares=[rate_limit])
+    app["stats"] = stats
+    app.router.add_get("/riot/account/v1/accounts/by-riot-id/{name}/{tag}", account)
+    app.router.add_get("/lol/league/v4/entries/by-puuid/{puuid}", league)
+    app.router.add_get("/lol/summoner/v4/summoners/by-puuid/{puuid}", summoner)
+    app.router.add_get("/lol/spectator/v5/active-games/by-summoner/{summoner_id}", spectator)
+    app.router.add_get("/lol/match/v5/matches/by-puuid/{puuid}/ids", match_ids)
+    app.router.add_get("/lol/match/v5/matches/{match_id}/timeline", timeline)
+    app.router.add_get("/lol/match/v5/matches/{match_id}", match)
+    return app
+
+
+async def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.08,
+                            app_limit: Optional[str] = None, method_limit: Optional[str] = None):
+    """스텁 서버를 현재 이벤트 루프에서 시작하고 (runner, base_url)을 반환.
+
+    요청/거절 통계는 runner.app["stats"]에서 확인할 수 있습니다.
+    """
+    runner = web.AppRunner(create_app(latency, app_limit, method_limit))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://{host}:{bound_port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 Riot API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.08, help="응답 지연 (초)")
+    parser.add_argument("--app-limit", default=None, help="애플리케이션 Rate Limit (예: 20:1,100:120)")
+    parser.add_argument("--method-limit", default=None, help="메서드별 Rate Limit (예: 2000:10)")
+    args = parser.parse_args()
+    web.run_app(create_app(args.latency, args.app_limit, args.method_limit), host=args.host, port=args.port)
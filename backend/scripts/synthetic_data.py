@@ -0,0 +1,179 @@
+"""벤치마크/스텁 서버용 합성 Riot API 데이터 생성기.
+
+실제 match-v5 / timeline 응답과 같은 구조(필드 이름, 중첩, 대략적인 크기)를
+가지도록 만들며, 같은 match_id에는 항상 같은 데이터를 돌려줍니다.
+"""
+import random
+import zlib
+from typing import Dict, List, Optional
+
+CHAMPIONS = ["Ahri", "LeeSin", "Jinx", "Thresh", "Garen", "Ezreal", "Lux", "Yasuo", "Orianna", "Kaisa",
+             "Vi", "Leona", "Darius", "Syndra", "Graves", "Nautilus", "Ornn", "Viego", "Zeri", "Karma"]
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+ITEM_IDS = [1001, 1055, 3006, 3031, 3071, 3089, 3153, 3157, 3340, 3363, 3364, 6653, 6672, 6692]
+SPELL_IDS = [4, 7, 11, 12, 14, 21]
+
+
+def _rng(seed: str) -> random.Random:
+    return random.Random(zlib.crc32(seed.encode()))
+
+
+def make_puuids(match_id: str, owner_puuid: Optional[str] = None) -> List[str]:
+    """매치 참가자 10명의 PUUID 목록 (owner_puuid가 있으면 1번 참가자로 포함)"""
+    puuids = [f"puuid-{match_id}-{i}" for i in range(1, 11)]
+    if owner_puuid:
+        puuids[0] = owner_puuid
+    return puuids
+
+
+def make_match(match_id: str, puuids: Optional[List[str]] = None, duration: int = 1800) -> Dict:
+    """match-v5 /matches/{matchId} 형태의 합성 응답"""
+    rng = _rng(match_id)
+    puuids = puuids or make_puuids(match_id)
+    participants = []
+    for i, puuid in enumerate(puuids):
+        team_id = 100 if i < 5 else 200
+        kills, deaths, assists = rng.randint(0, 15), rng.randint(0, 12), rng.randint(0, 20)
+        participant = {
+            "participantId": i + 1,
+            "puuid": puuid,
+            "teamId": team_id,
+            "win": team_id == 100,
+            "championId": rng.randint(1, 900),
+            "championName": rng.choice(CHAMPIONS),
+            "teamPosition": POSITIONS[i % 5],
+            "individualPosition": POSITIONS[i % 5],
+            "summonerName": f"Player{i + 1}",
+            "riotIdGameName": f"Player{i + 1}",
+            "riotIdTagline": "KR1",
+            "kills": kills,
+            "deaths": deaths,
+            "assists": assists,
+            "visionScore": rng.randint(5, 80),
+            "wardsKilled": rng.randint(0, 10),
+            "wardsPlaced": rng.randint(2, 30),
+            "totalMinionsKilled": rng.randint(20, 250),
+            "neutralMinionsKilled": rng.randint(0, 150),
+            "totalDamageDealtToChampions": rng.randint(3000, 40000),
+            "goldEarned": rng.randint(6000, 18000),
+            "summoner1Id": rng.choice(SPELL_IDS),
+            "summoner2Id": 4,
+            "champLevel": rng.randint(10, 18),
+            "perks": {"statPerks": {"defense": 5002, "flex": 5008, "offense": 5005},
+                      "styles": [{"description": "primaryStyle", "style": 8100,
+                                  "selections": [{"perk": 8112 + k, "var1": rng.randint(0, 3000), "var2": 0, "var3": 0} for k in range(4)]},
+                                 {"description": "subStyle", "style": 8300,
+                                  "selections": [{"perk": 8304 + k, "var1": rng.randint(0, 50), "var2": 0, "var3": 0} for k in range(2)]}]},
+            "challenges": {name: round(rng.random() * 10, 4) for name in
+                           ["kda", "killParticipation", "damagePerMinute", "goldPerMinute", "visionScorePerMinute",
+                            "laneMinionsFirst10Minutes", "soloKills", "skillshotsHit", "skillshotsDodged",
+                            "turretPlatesTaken", "effectiveHealAndShielding", "teamDamagePercentage",
+                            "damageTakenOnTeamPercentage", "controlWardsPlaced", "wardTakedowns",
+                            "maxCsAdvantageOnLaneOpponent", "maxLevelLeadLaneOpponent", "junglerTakedownsNearDamagedEpicMonster",
+                            "abilityUses", "bountyGold", "buffsStolen", "dodgeSkillShotsSmallWindow"]},
+        }
+        for slot in range(7):
+            participant[f"item{slot}"] = rng.choice(ITEM_IDS) if slot < 6 and rng.random() > 0.15 else (3340 if slot == 6 else 0)
+        # 실제 응답에 포함되는, 서비스에서 쓰지 않는 통계 필드들
+        for stat in ["physicalDamageDealt", "magicDamageDealt", "trueDamageDealt", "totalHeal", "totalDamageTaken",
+                     "damageSelfMitigated", "timeCCingOthers", "totalTimeSpentDead", "longestTimeSpentLiving",
+                     "goldSpent", "turretKills", "inhibitorKills", "doubleKills", "tripleKills", "spell1Casts",
+                     "spell2Casts", "spell3Casts", "spell4Casts", "visionWardsBoughtInGame", "damageDealtToBuildings",
+                     "damageDealtToObjectives", "totalDamageShieldedOnTeammates", "consumablesPurchased"]:
+            participant[stat] = rng.randint(0, 50000)
+        participants.append(participant)
+
+    teams = []
+    for team_id in (100, 200):
+        teams.append({
+            "teamId": team_id,
+            "win": team_id == 100,
+            "bans": [{"championId": rng.randint(1, 900), "pickTurn": k + 1} for k in range(5)],
+            "objectives": {name: {"first": rng.random() > 0.5, "kills": rng.randint(0, 5)}
+                           for name in ["baron", "champion", "dragon", "horde", "inhibitor", "riftHerald", "tower"]},
+        })
+
+    return {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "endOfGameResult": "GameComplete",
+            "gameCreation": 1700000000000,
+            "gameDuration": duration,
+            "gameId": int(match_id.split("_")[-1]) if match_id.split("_")[-1].isdigit() else 1,
+            "gameMode": "CLASSIC",
+            "gameType": "MATCHED_GAME",
+            "gameVersion": "14.1.555.5555",
+            "mapId": 11,
+            "platformId": "KR",
+            "queueId": 420,
+            "participants": participants,
+            "teams": teams,
+        },
+    }
+
+
+def make_timeline(match_id: str, puuids: Optional[List[str]] = None, minutes: int = 30) -> Dict:
+    """match-v5 /matches/{matchId}/timeline 형태의 합성 응답 (1분 간격 프레임)"""
+    rng = _rng(match_id + ":timeline")
+    puuids = puuids or make_puuids(match_id)
+    frames = []
+    positions = {pid: [rng.randint(500, 14300), rng.randint(500, 14300)] for pid in range(1, 11)}
+    for minute in range(minutes + 1):
+        participant_frames = {}
+        for pid in range(1, 11):
+            pos = positions[pid]
+            pos[0] = min(14800, max(0, pos[0] + rng.randint(-1500, 1500)))
+            pos[1] = min(14800, max(0, pos[1] + rng.randint(-1500, 1500)))
+            participant_frames[str(pid)] = {
+                "participantId": pid,
+                "position": {"x": pos[0], "y": pos[1]},
+                "currentGold": rng.randint(0, 3000),
+                "totalGold": 500 + minute * rng.randint(250, 450),
+                "level": min(18, 1 + minute // 2),
+                "xp": minute * rng.randint(300, 500),
+                "minionsKilled": minute * rng.randint(3, 9),
+                "jungleMinionsKilled": minute * rng.randint(0, 5),
+                "timeEnemySpentControlled": rng.randint(0, 50000),
+                "championStats": {k: rng.randint(0, 500) for k in
+                                  ["abilityHaste", "abilityPower", "armor", "attackDamage", "attackSpeed", "health",
+                                   "healthMax", "magicResist", "movementSpeed", "power", "powerMax"]},
+                "damageStats": {k: rng.randint(0, 20000) for k in
+                                ["magicDamageDone", "physicalDamageDone", "totalDamageDone", "totalDamageTaken",
+                                 "trueDamageDone", "totalDamageDoneToChampions"]},
+            }
+        events = []
+        for _ in range(rng.randint(15, 40)):
+            timestamp = minute * 60000 + rng.randint(0, 59999)
+            kind = rng.random()
+            if kind < 0.55:
+                events.append({"type": "ITEM_PURCHASED", "timestamp": timestamp, "participantId": rng.randint(1, 10),
+                               "itemId": rng.choice(ITEM_IDS)})
+            elif kind < 0.75:
+                events.append({"type": "WARD_PLACED", "timestamp": timestamp, "creatorId": rng.randint(1, 10),
+                               "wardType": "YELLOW_TRINKET"})
+            elif kind < 0.85:
+                events.append({"type": "SKILL_LEVEL_UP", "timestamp": timestamp, "participantId": rng.randint(1, 10),
+                               "skillSlot": rng.randint(1, 4), "levelUpType": "NORMAL"})
+            elif minute > 1:
+                killer = rng.randint(1, 10)
+                victim = rng.choice([p for p in range(1, 11) if (p <= 5) != (killer <= 5)])
+                events.append({"type": "CHAMPION_KILL", "timestamp": timestamp, "killerId": killer, "victimId": victim,
+                               "assistingParticipantIds": [rng.randint(1, 10)], "bounty": 300, "shutdownBounty": 0,
+                               "position": {"x": rng.randint(0, 14800), "y": rng.randint(0, 14800)},
+                               "victimDamageReceived": [{"basic": False, "magicDamage": rng.randint(0, 900),
+                                                         "name": rng.choice(CHAMPIONS), "participantId": killer,
+                                                         "physicalDamage": rng.randint(0, 900), "spellName": "q",
+                                                         "spellSlot": 0, "trueDamage": 0, "type": "OTHER"}
+                                                        for _ in range(3)]})
+        events.sort(key=lambda e: e["timestamp"])
+        frames.append({"timestamp": minute * 60000, "participantFrames": participant_frames, "events": events})
+
+    return {
+        "metadata": {"dataVersion": "2", "matchId": match_id, "participants": puuids},
+        "info": {
+            "frameInterval": 60000,
+            "gameId": 1,
+            "participants": [{"participantId": i + 1, "puuid": puuid} for i, puuid in enumerate(puuids)],
+            "frames": frames,
+        },
+    }
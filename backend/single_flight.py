@@ -0,0 +1,122 @@
+"""동시 요청 병합(single-flight).
+
+같은 캐시 키에 대한 업스트림 호출이 이미 진행 중이면 새 호출을 만들지 않고
+진행 중인 결과를 함께 기다립니다. 인기 소환사가 동시에 여러 번 조회되어도
+Riot API 호출은 키당 한 번만 나가게 됩니다.
+
+SingleFlight는 프로세스(이벤트 루프) 안에서만 병합하고,
+RedisSingleFlight는 Redis 락을 이용해 여러 워커 사이에서도 병합합니다.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from cache_manager import AsyncCacheManager
+from rate_limiter import SharedPriority, shared_scope
+
+
+class _Flight:
+    """진행 중인 호출 하나와 그 결과를 기다리는 호출자 수, 호출자들 중 가장 높은 우선순위"""
+    __slots__ = ("task", "waiters", "priority")
+
+    def __init__(self, task: asyncio.Task, priority: SharedPriority):
+        self.task = task
+        self.waiters = 0
+        self.priority = priority
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[str, _Flight] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key에 대해 fn()을 한 번만 실행하고, 동시에 들어온 호출자들은 같은 결과를 받음
+
+        먼저 요청한 쪽이 취소되어도 다른 호출자가 기다리는 동안은 계속 실행하고, 기다리는 호출자가 모두
+        취소되면(클라이언트 연결 끊김 등) 호출도 취소해 아무도 받지 않을 결과에 Rate Limit 예산을 쓰지 않습니다.
+        호출의 Riot 요청은 기다리는 호출자 중 가장 높은 우선순위로 나갑니다: 추세 분석(BACKFILL)이 시작한 조회에
+        단건 조회가 합류하면 그 조회도 단건 조회 우선순위로 올라갑니다.
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            shared = SharedPriority()
+            with shared_scope(shared):
+                task = asyncio.ensure_future(self._run(key, fn))
+            flight = self._inflight[key] = _Flight(task, shared)
+            flight.task.add_done_callback(lambda _, flight=flight: self._forget(key, flight))
+        flight.waiters += 1
+        token = flight.priority.join()
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.priority.leave(token)
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def inflight_count(self) -> int:
+        return len(self._inflight)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await fn()
+
+
+class RedisSingleFlight(SingleFlight):
+    """Redis 락으로 워커 간에도 병합하는 single-flight.
+
+    락을 얻은 워커만 업스트림을 호출하고, 나머지는 결과가 같은 키로 캐시에 저장될 때까지
+    기다렸다가 캐시 값을 돌려줍니다. 결과를 같은 키로 캐시하지 않는 호출(배치 조회의 매치 상세, 매치 인덱스
+    동기화, 소환사 ID로 보는 관전 정보 등)은 락을 잡은 워커가 결과를 그 락의 토큰별 flight_result 키에
+    lock_ttl 동안 남겨 두므로, 그 락을 기다리던 워커만 결과를 받고 다시 호출하지 않습니다. 나중에 락을 잡은
+    워커는 이전 호출의 결과를 보지 않고 직접 호출합니다(예: 같은 소환사의 매치 인덱스를 더 과거까지 동기화).
+    락이 풀렸는데도 결과가 없거나(호출 실패) lock_ttl이 지나면 직접 호출합니다.
+    Redis를 쓸 수 없으면 프로세스 내 병합만 동작합니다.
+    """
+
+    def __init__(self, cache: AsyncCacheManager, lock_ttl: int = 10, poll_interval: float = 0.05):
+        super().__init__()
+        self.cache = cache
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = self.cache.generate_key("lock", key)
+        token = await self.cache.acquire_lock(lock_key, self.lock_ttl)
+        if token is not None:
+            try:
+                # 락을 얻기 직전에 다른 워커가 결과를 저장했을 수 있음
+                cached = await self.cache.get_cache(key)
+                if cached is not None:
+                    return cached
+                result = await fn()
+                if self.cache.is_available() and await self.cache.get_cache(key) is None:
+                    await self.cache.set_cache(self._result_key(key, token), {"value": result}, ttl=self.lock_ttl)
+                return result
+            finally:
+                await self.cache.release_lock(lock_key, token)
+
+        # 다른 워커가 가져오는 중: 결과가 올라올 때까지 대기
+        holder = await self.cache.lock_token(lock_key)
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            # 락을 먼저 확인: 결과를 남기고 락을 푼 직후라도 아래에서 결과를 봄
+            locked = await self.cache.is_locked(lock_key)
+            cached = await self.cache.get_cache(key)
+            if cached is not None:
+                return cached
+            if holder is not None:
+                published = await self.cache.get_cache(self._result_key(key, holder))
+                if published is not None:
+                    return published["value"]
+            if not locked:
+                break
+        return await fn()
+
+    def _result_key(self, key: str, token: str) -> str:
+        return self.cache.generate_key("flight_result", key, token)
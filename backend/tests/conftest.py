@@ -0,0 +1,15 @@
+"""backend 모듈과 scripts(스텁 서버)를 임포트할 수 있게 경로를 잡음.
+
+실행 (backend 디렉터리에서):
+    pip install -r requirements-dev.txt
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(TESTS_DIR)
+for path in (TESTS_DIR, BACKEND_DIR, os.path.join(BACKEND_DIR, "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+os.environ.setdefault("RIOT_API_KEY", "RGAPI-TEST")
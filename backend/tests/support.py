@@ -0,0 +1,36 @@
+"""테스트 공용 도우미: 같은 이벤트 루프에서 도는 Riot 스텁 서버와 인메모리 캐시만 쓰는 클라이언트.
+
+테스트는 asyncio.run으로 시나리오 코루틴을 실행하고, 스텁 서버는 그 루프 안에서 띄웁니다.
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from async_riot_api import AsyncRiotAPI
+from cache_manager import AsyncCacheManager, LocalCache
+from rate_limiter import RateLimitScheduler
+from riot_stub_server import start_stub_server
+
+
+@asynccontextmanager
+async def stub_server(latency: float = 0.0, app_limit: Optional[str] = None,
+                      method_limit: Optional[str] = None) -> AsyncIterator[Tuple[Dict[str, Any], str]]:
+    """(요청 통계, base_url). 통계는 스텁이 받은 요청 수("requests"), 429로 거절한 수("rejected") 등"""
+    runner, base_url = await start_stub_server(latency=latency, app_limit=app_limit, method_limit=method_limit)
+    try:
+        yield runner.app["stats"], base_url
+    finally:
+        await runner.cleanup()
+
+
+def memory_cache() -> AsyncCacheManager:
+    """Redis 없이 테스트마다 새 인메모리 계층만 쓰는 캐시"""
+    cache = AsyncCacheManager(local_cache=LocalCache())
+    cache.redis_client = None
+    return cache
+
+
+def make_client(base_url: str, rate_limit: str = "100:1", scheduler: Optional[RateLimitScheduler] = None,
+                cache: Optional[AsyncCacheManager] = None) -> AsyncRiotAPI:
+    return AsyncRiotAPI("RGAPI-TEST", base_url=base_url, platform_url=base_url,
+                        scheduler=scheduler or RateLimitScheduler(app_rate_limit=rate_limit),
+                        cache=cache or memory_cache())
@@ -0,0 +1,68 @@
+"""/analyze-user와 /match-ids 응답: ETag/304, 커서 페이지, fields= 선택 (스텁 서버 상대)"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import http_pool
+from support import make_client, stub_server
+
+FIELDS = "user_info,match_ids,next_cursor,match_details.matchId"
+
+
+@asynccontextmanager
+async def app_client():
+    """main의 핸들러가 스텁 서버를 쓰도록 클라이언트를 바꿔 끼움 (stats, main)"""
+    import main
+
+    async with stub_server() as (stats, base_url):
+        main.async_riot_client = make_client(base_url)
+        try:
+            yield stats, main
+        finally:
+            main.async_riot_client = None
+            await http_pool.shutdown()
+
+
+def body_of(response):
+    return json.loads(response.body)
+
+
+def test_etag_revalidation_returns_304_without_riot_calls():
+    async def scenario():
+        async with app_client() as (stats, main):
+            first = await main.analyze_user("Etag#KR1", fields=FIELDS)
+            etag = first.headers["ETag"]
+            assert first.status_code == 200 and first.headers["Cache-Control"]
+            sent = stats["requests"]
+
+            revalidated = await main.analyze_user("Etag#KR1", fields=FIELDS, if_none_match=f'W/{etag}, "other"')
+            assert revalidated.status_code == 304 and revalidated.body == b""
+            assert revalidated.headers["ETag"] == etag
+            assert stats["requests"] == sent  # 계정/매치 ID는 캐시, 응답은 응답 캐시에서
+
+            stale = await main.analyze_user("Etag#KR1", fields=FIELDS, if_none_match='"other"')
+            assert stale.status_code == 200 and stale.body == first.body
+
+    asyncio.run(scenario())
+
+
+def test_fields_projection_and_cursor_pages():
+    async def scenario():
+        async with app_client() as (stats, main):
+            first = body_of(await main.analyze_user("Pager#KR1", limit=5, fields=FIELDS))
+            assert set(first) == {"user_info", "match_ids", "next_cursor", "match_details"}
+            assert first["match_details"] == [{"matchId": m} for m in first["match_ids"]]
+            assert first["next_cursor"] == first["match_ids"][-1]
+
+            second = body_of(await main.analyze_user("Pager#KR1", limit=5, cursor=first["next_cursor"], fields=FIELDS))
+            assert set(second) == {"match_ids", "next_cursor", "match_details"}
+            assert len(second["match_ids"]) == 5 and not set(second["match_ids"]) & set(first["match_ids"])
+
+            # /match-ids도 같은 인덱스와 커서를 씀
+            ids = await main.get_match_ids("Pager#KR1", count=10)
+            assert ids["match_ids"] == first["match_ids"] + second["match_ids"]
+            following = await main.get_match_ids("Pager#KR1", count=10, cursor=ids["next_cursor"])
+            assert following["start"] == 10 and following["match_ids"][0] not in ids["match_ids"]
+            assert await main.get_match_ids("Pager#KR1", cursor="KR_unknown") == {"error": main.CURSOR_EXPIRED}
+
+    asyncio.run(scenario())
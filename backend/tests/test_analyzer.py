@@ -0,0 +1,26 @@
+"""타임라인 분석기: 벡터화한 계산은 이전 analyze_game(프레임 루프)과 같은 점수를 냄"""
+from analyzer import analyze_arrays, timeline_to_arrays
+from bench_analyzer import legacy_all, same_result
+from match_projection import project_timeline
+from synthetic_data import make_timeline
+
+
+def frame(timestamp: int, x: int, y: int):
+    return {"timestamp": timestamp, "events": [],
+            "participantFrames": {str(pid): {"position": {"x": x, "y": y}} for pid in range(1, 11)}}
+
+
+def test_matches_legacy_analysis():
+    for i in range(5):
+        timeline = project_timeline(make_timeline(f"KR_{i}", minutes=30))
+        before, after = legacy_all(timeline), analyze_arrays(timeline_to_arrays(timeline))
+        assert all(same_result(before[pid], after[pid]) for pid in before)
+
+
+def test_macro_score_counts_dragon_area_only():
+    # 4프레임 중 드래곤 둥지 1, 바론 둥지 2 (바론 관여는 objective_presence에만 반영)
+    timeline = {"info": {"frames": [frame(0, 1000, 1000), frame(60_000, 9800, 4400),
+                                    frame(120_000, 5000, 10400), frame(1_500_000, 5000, 10400)]}}
+    result = analyze_arrays(timeline_to_arrays(timeline))["1"]
+    assert result["macro_score"] == 25
+    assert result["objective_presence"] == {"dragon": 25.0, "herald": 25.0, "baron": 25.0}
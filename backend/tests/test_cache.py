@@ -0,0 +1,28 @@
+"""인메모리 캐시 계층: 용량은 저장된(인코딩된) 바이트 기준, 적중할 때마다 디코딩한 새 값을 돌려줌"""
+import asyncio
+
+from cache_manager import AsyncCacheManager, LocalCache
+
+
+def test_local_budget_counts_stored_bytes_and_evicts_oldest():
+    async def scenario():
+        cache = AsyncCacheManager(local_cache=LocalCache(max_bytes=4096))
+        cache.redis_client = None
+        detail = {"participants": [{"puuid": f"p{i}", "kills": i} for i in range(10)]}
+        await cache.set_cache("detail:1", detail)
+        stored = cache.local_cache.stats()["bytes"]
+        assert stored == len(cache.codec.encode(detail))
+
+        hit = await cache.get_cache("detail:1")
+        assert hit == detail
+        hit["participants"].clear()  # 반환값을 수정해도 캐시에는 영향 없음
+        assert await cache.get_cache("detail:1") == detail
+
+        for i in range(2, 40):
+            await cache.set_cache(f"detail:{i}", detail)
+        stats = cache.local_cache.stats()
+        assert stats["bytes"] <= 4096 and stats["evictions"] > 0
+        assert await cache.get_cache("detail:1") is None
+        assert await cache.get_cache("detail:39") == detail
+
+    asyncio.run(scenario())
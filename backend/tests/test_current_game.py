@@ -0,0 +1,53 @@
+"""현재 게임 조회: 참가자들이 gameId별 스냅샷과 응답을 함께 쓰고, 끝난 게임은 다시 조회하지 않음"""
+import asyncio
+
+import aiohttp
+
+import http_pool
+from support import make_client, stub_server
+
+
+def test_stale_pointer_to_ended_game_calls_spectator_once():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url)
+            # 끝난 게임을 가리키는 포인터만 남고 스냅샷은 만료된 상태
+            await client.cache.cache_active_game_pointers({"gameId": 123, "participants": [{"puuid": "puuid-Idle-KR1"}]})
+            async with aiohttp.ClientSession() as session:
+                assert await client.get_active_game_async(session, "sid-puuid-Idle-KR1", "puuid-Idle-KR1") is None
+                assert stats["spectator"] == 1
+                # 게임 중 아님을 캐시했으므로 다음 조회는 spectator를 호출하지 않음
+                assert await client.get_active_game_async(session, "sid-puuid-Idle-KR1", "puuid-Idle-KR1") is None
+                assert stats["spectator"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_participants_share_snapshot_and_response():
+    import main
+
+    async def scenario():
+        built = []
+        build_current_game = main.build_current_game
+
+        async def counting_build(*args):
+            built.append(1)
+            return await build_current_game(*args)
+
+        async with stub_server() as (stats, base_url):
+            main.async_riot_client = make_client(base_url)
+            main.build_current_game = counting_build
+            try:
+                first = await main.get_current_game("LiveBP0#KR1")
+                second = await main.get_current_game("LiveBP1#KR1")
+                assert stats["spectator"] == 1
+                assert len(built) == 1  # 다른 참가자의 조회도 같은 응답 캐시 항목을 씀
+                assert first.headers["ETag"] == second.headers["ETag"]
+                not_modified = await main.get_current_game("LiveBP2#KR1", if_none_match=first.headers["ETag"])
+                assert not_modified.status_code == 304
+            finally:
+                main.build_current_game = build_current_game
+                main.async_riot_client = None
+                await http_pool.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+"""매치 ID 인덱스: 새 매치만 앞에 붙이고, 오래된 페이지는 요청할 때만 이어서 받으며 중복 없이 병합"""
+import asyncio
+
+import aiohttp
+
+import match_index
+from support import make_client, stub_server
+
+PUUID = "puuid-Indexed-KR1"
+
+
+def test_pages_extend_index_only_when_requested():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url)
+            async with aiohttp.ClientSession() as session:
+                first = await client.get_match_ids_async(session, PUUID, start=0, count=20)
+                assert first["count"] == 20 and first["has_more"]
+                assert stats["requests"] == 1  # 첫 인덱스는 한 페이지(100개)만
+                assert (await client.get_match_ids_async(session, PUUID, start=40, count=20))["start"] == 40
+                assert stats["requests"] == 1  # 인덱스 안의 페이지는 캐시로
+
+                older = await client.get_match_ids_async(session, PUUID, start=150, count=20)
+                assert stats["requests"] == 2  # 범위를 벗어난 페이지만 이어서 받음
+                last = await client.get_match_ids_async(session, PUUID, start=220, count=20)
+                assert last["count"] == 10 and not last["has_more"] and last["next_cursor"] is None
+                index = await client.cache.get_cached_match_index(PUUID)
+                assert index["complete"] and len(index["ids"]) == len(set(index["ids"])) == 230
+                assert older["match_ids"] == index["ids"][150:170]
+
+    asyncio.run(scenario())
+
+
+def test_sync_prepends_only_new_matches():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url)
+            async with aiohttp.ClientSession() as session:
+                await client.get_match_ids_async(session, PUUID, start=0, count=20)
+                latest = (await client.cache.get_cached_match_index(PUUID))["ids"]
+                # 마지막 동기화 뒤에 5판을 더 한 상태: 인덱스에는 그 전 매치만 있고 동기화 주기가 지남
+                await client.cache.cache_match_index(PUUID, {"ids": latest[5:], "complete": False, "synced_at": 1})
+                sent = stats["requests"]
+
+                page = await client.get_match_ids_async(session, PUUID, start=0, count=20)
+                assert page["match_ids"] == latest[:20]
+                assert stats["requests"] == sent + 1  # 새 매치 확인 한 번 (이미 아는 매치를 만나면 멈춤)
+                assert (await client.cache.get_cached_match_index(PUUID))["ids"] == latest
+
+    asyncio.run(scenario())
+
+
+def test_merge_skips_known_matches():
+    index = {"ids": ["m5", "m4", "m3"], "complete": False, "synced_at": 10}
+    fresh, more = match_index.take_newer(index, ["m7", "m6", "m5", "m4"])
+    assert (fresh, more) == (["m7", "m6"], False)
+    assert match_index.merge_newer(index, fresh, now=20)["ids"] == ["m7", "m6", "m5", "m4", "m3"]
+    # 그 사이 새 매치가 생겨 오프셋이 밀린 이전 페이지도 중복 없이 붙음
+    older = match_index.merge_older(index, ["m3", "m2", "m1"])
+    assert older["ids"] == ["m5", "m4", "m3", "m2", "m1"] and older["complete"]
+    # 새 매치가 너무 많아 이어지지 않으면 인덱스를 새로 시작
+    assert match_index.merge_newer(index, ["m9"], connected=False, now=20) == {"ids": ["m9"], "complete": False, "synced_at": 20}
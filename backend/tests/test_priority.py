@@ -0,0 +1,177 @@
+"""우선순위 큐와 취소: 기다리던 호출은 요청이 취소되면 줄에서 빠지고 Riot에 보내지 않음"""
+import asyncio
+
+import aiohttp
+
+import http_pool
+from rate_limiter import BackgroundScheduler, Priority, RateLimitScheduler, client_scope, priority
+from support import make_client, stub_server
+
+
+def no_waiters(scheduler) -> bool:
+    return not any(scheduler.waiting().values())
+
+
+def test_dispatches_by_priority_then_fairly_across_clients():
+    async def scenario():
+        scheduler = RateLimitScheduler(app_rate_limit="4:1")
+        order = []
+
+        async def call(name: str, level: Priority, client: str):
+            with client_scope(client), priority(level):
+                await scheduler.acquire("kr", "m")
+            order.append(name)
+
+        for _ in range(4):
+            await scheduler.acquire("kr", "m")  # 이번 윈도우 예산을 다 씀
+        # heavy가 다건 조회 3건을 먼저 쌓고, 그 뒤에 light의 다건 조회와 단건 조회가 들어옴
+        tasks = [asyncio.ensure_future(call(f"heavy{i}", Priority.FANOUT, "heavy")) for i in range(3)]
+        tasks.append(asyncio.ensure_future(call("light", Priority.FANOUT, "light")))
+        tasks.append(asyncio.ensure_future(call("interactive", Priority.INTERACTIVE, "light")))
+        await asyncio.sleep(0.05)
+        assert scheduler.waiting() == {"interactive": 1, "fanout": 4, "backfill": 0, "prefetch": 0}
+        # 같은 제한에 막힌 요청 중 하나만 깨어날 시각을 가짐 (나머지는 폴링하지 않고 잠듦)
+        assert sum(1 for waiter in scheduler._heap if waiter.wake_at is not None) <= 2
+        await asyncio.gather(*tasks)
+        # 단건 조회가 먼저, 다건 조회는 먼저 쌓인 heavy와 light가 번갈아
+        assert order == ["interactive", "heavy0", "light", "heavy1", "heavy2"]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_lookup_leaves_queue_and_is_never_sent():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, rate_limit="1:1")
+            async with aiohttp.ClientSession() as session:
+                await client.get_puuid_by_riot_id_async(session, "First", "KR1")  # 1초 예산을 다 씀
+                sent = stats["requests"]
+                lookup = asyncio.ensure_future(client.get_puuid_by_riot_id_async(session, "Second", "KR1"))
+                await asyncio.sleep(0.1)
+                assert client.rate_limiter.waiting()["interactive"] == 1
+
+                lookup.cancel()
+                await asyncio.gather(lookup, return_exceptions=True)
+                await asyncio.sleep(0.05)  # 병합된 호출(single-flight Task)의 취소가 끝날 때까지
+                assert no_waiters(client.rate_limiter)
+                assert client.flight.inflight_count() == 0
+                await asyncio.sleep(1.2)  # 예산이 다시 생겨도 보내지 않음
+                assert stats["requests"] == sent
+
+    asyncio.run(scenario())
+
+
+def test_coalesced_lookup_keeps_running_while_another_caller_waits():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, rate_limit="1:1")
+            async with aiohttp.ClientSession() as session:
+                await client.get_puuid_by_riot_id_async(session, "First", "KR1")
+                first = asyncio.ensure_future(client.get_puuid_by_riot_id_async(session, "Shared", "KR1"))
+                second = asyncio.ensure_future(client.get_puuid_by_riot_id_async(session, "Shared", "KR1"))
+                await asyncio.sleep(0.1)
+                first.cancel()  # 먼저 요청한 쪽만 취소: 나머지 호출자를 위해 계속 진행
+                assert await second == "puuid-Shared-KR1"
+                assert stats["requests"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_joining_caller_raises_coalesced_lookup_priority():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, rate_limit="4:1")
+            async with aiohttp.ClientSession() as session:
+                await asyncio.gather(*(client.get_puuid_by_riot_id_async(session, f"User{i}", "KR1") for i in range(4)))
+
+                async def backfill():
+                    with priority(Priority.BACKFILL):
+                        return await client.get_puuid_by_riot_id_async(session, "Shared", "KR1")
+
+                background = asyncio.ensure_future(backfill())
+                await asyncio.sleep(0.05)
+                assert client.rate_limiter.waiting()["backfill"] == 1
+                # 단건 조회가 같은 호출에 합류하면 그 호출의 Riot 요청도 단건 조회 우선순위로 올라감
+                interactive = asyncio.ensure_future(client.get_puuid_by_riot_id_async(session, "Shared", "KR1"))
+                await asyncio.sleep(0.05)
+                assert client.rate_limiter.waiting() == {"interactive": 1, "fanout": 0, "backfill": 0, "prefetch": 0}
+                # 합류한 호출자가 빠지면 다시 내려감
+                interactive.cancel()
+                await asyncio.gather(interactive, return_exceptions=True)
+                assert client.rate_limiter.waiting()["backfill"] == 1
+                assert await background == "puuid-Shared-KR1"
+
+    asyncio.run(scenario())
+
+
+def test_prefetch_and_user_lookup_share_one_call():
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, rate_limit="4:1")
+            # main.create_clients처럼 같은 예산, 캐시, single-flight를 쓰는 prefetch 클라이언트
+            background = make_client(base_url, scheduler=BackgroundScheduler(client.rate_limiter), cache=client.cache)
+            background.flight = client.flight
+            async with aiohttp.ClientSession() as session:
+                await asyncio.gather(*(client.get_puuid_by_riot_id_async(session, f"User{i}", "KR1") for i in range(4)))
+                sent = stats["requests"]
+
+                async def prefetch():
+                    with priority(Priority.PREFETCH):
+                        return await background.get_puuid_by_riot_id_async(session, "Shared", "KR1")
+
+                warm = asyncio.ensure_future(prefetch())
+                await asyncio.sleep(0.05)
+                assert client.rate_limiter.waiting()["prefetch"] == 1
+                # 사용자 요청은 prefetch가 시작한 호출에 합류하고, 그 호출은 단건 조회 우선순위로 올라감
+                lookup = asyncio.ensure_future(client.get_puuid_by_riot_id_async(session, "Shared", "KR1"))
+                await asyncio.sleep(0.05)
+                assert client.rate_limiter.waiting()["interactive"] == 1
+                assert await asyncio.gather(warm, lookup) == ["puuid-Shared-KR1"] * 2
+                assert stats["requests"] == sent + 1
+
+    asyncio.run(scenario())
+
+
+def test_client_disconnect_cancels_handler_and_queued_riot_calls():
+    import main
+
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, rate_limit="1:1")
+            main.async_riot_client = client
+            try:
+                await main.get_current_game("First#KR1")  # 예산을 다 씀
+                sent = stats["requests"]
+                disconnected = asyncio.Event()
+                messages = []
+
+                async def receive():
+                    if not messages:
+                        messages.append("request")
+                        return {"type": "http.request", "body": b"", "more_body": False}
+                    await disconnected.wait()
+                    return {"type": "http.disconnect"}
+
+                async def send(message):
+                    messages.append(message)
+
+                scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                         "scheme": "http", "path": "/current-game/Second#KR1", "raw_path": b"/current-game/Second%23KR1",
+                         "query_string": b"", "root_path": "", "headers": [], "client": ("10.0.0.1", 1234),
+                         "server": ("test", 80)}
+                request = asyncio.ensure_future(main.app(scope, receive, send))
+                await asyncio.sleep(0.1)
+                assert client.rate_limiter.waiting()["interactive"] == 1
+
+                disconnected.set()
+                await request
+                await asyncio.sleep(0.05)
+                assert no_waiters(client.rate_limiter)
+                await asyncio.sleep(1.2)
+                assert stats["requests"] == sent
+                assert messages == ["request"]  # 응답을 보내지 않음
+            finally:
+                main.async_riot_client = None
+                await http_pool.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+"""Rate Limit 스케줄러: 응답 헤더로 제한 학습, 429 + Retry-After 재시도 (제한을 강제하는 스텁 서버 상대)"""
+import asyncio
+import time
+
+import aiohttp
+
+from rate_limiter import RateLimitScheduler, parse_rate_limits
+from support import make_client, stub_server
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("20:1,100:120") == [(20, 1), (100, 120)]
+    assert parse_rate_limits("20:1,oops") == [(20, 1)]
+    assert parse_rate_limits(None) == []
+
+
+def test_penalize_blocks_bucket_for_retry_after():
+    scheduler = RateLimitScheduler(app_rate_limit="100:1")
+    assert scheduler.try_acquire("kr", "m") == 0
+    delay = scheduler.penalize("kr", "m", {"Retry-After": "2", "X-Rate-Limit-Type": "application"}, attempt=0)
+    assert delay == 2
+    assert 1.5 < scheduler.try_acquire("kr", "other-method") <= 2  # 애플리케이션 제한은 모든 메서드를 막음
+
+
+def test_penalize_without_retry_after_backs_off_exponentially():
+    scheduler = RateLimitScheduler(app_rate_limit="100:1")
+    assert scheduler.penalize("kr", "m", {}, attempt=0) == 1
+    assert scheduler.penalize("kr", "m", {}, attempt=2) == 4
+    assert scheduler.try_acquire("kr", "m") == 0  # 제한 종류를 모르면 다른 요청은 막지 않음
+
+
+def test_retries_429_and_learns_limits_from_headers():
+    async def scenario():
+        # 스케줄러는 100:1로 알고 시작하지만 서버는 3:1만 허용 -> 첫 묶음은 429, 헤더로 배운 뒤 재시도로 모두 성공
+        async with stub_server(app_limit="3:1") as (stats, base_url):
+            client = make_client(base_url, rate_limit="100:1")
+            async with aiohttp.ClientSession() as session:
+                puuids = await asyncio.gather(*(client.get_puuid_by_riot_id_async(session, f"User{i}", "KR1")
+                                                for i in range(8)))
+            assert puuids == [f"puuid-User{i}-KR1" for i in range(8)]
+            assert stats["rejected"] >= 1
+
+    asyncio.run(scenario())
+
+
+def test_stays_within_learned_limits():
+    async def scenario():
+        async with stub_server(app_limit="10:1", method_limit="3:1") as (stats, base_url):
+            client = make_client(base_url, rate_limit="100:1")
+            async with aiohttp.ClientSession() as session:
+                # 첫 응답의 X-App-Rate-Limit / X-Method-Rate-Limit(-Count) 헤더로 제한을 배움
+                await client.get_puuid_by_riot_id_async(session, "Warmup", "KR1")
+                started = time.monotonic()
+                puuids = await asyncio.gather(*(client.get_puuid_by_riot_id_async(session, f"User{i}", "KR1")
+                                                for i in range(6)))
+                elapsed = time.monotonic() - started
+            assert all(puuids)
+            assert stats["rejected"] == 0
+            assert elapsed >= 1.0  # 메서드 제한 3:1 -> 6건(+워밍업 1건)은 최소 두 번째 윈도우까지 걸림
+
+    asyncio.run(scenario())
@@ -0,0 +1,27 @@
+"""공정 분배에 쓰는 클라이언트 구분: X-Forwarded-For는 신뢰하는 프록시에서 온 요청만 봄"""
+from request_context import client_key, parse_proxies
+
+PROXIES = parse_proxies("10.0.0.0/8,127.0.0.1,oops")
+
+
+def scope(peer: str, *forwarded: str):
+    return {"client": (peer, 1234), "headers": [(b"x-forwarded-for", value.encode()) for value in forwarded]}
+
+
+def test_uses_peer_address_by_default():
+    assert client_key(scope("203.0.113.7", "198.51.100.1"), proxies=[]) == "203.0.113.7"
+    assert client_key({"headers": []}, proxies=[]) == ""
+
+
+def test_ignores_forwarded_for_from_untrusted_peer():
+    assert client_key(scope("203.0.113.7", "198.51.100.1"), proxies=PROXIES) == "203.0.113.7"
+
+
+def test_takes_rightmost_untrusted_hop_from_trusted_proxy():
+    # 클라이언트가 첫 주소를 꾸며도 프록시가 덧붙인 실제 주소를 씀
+    assert client_key(scope("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.1"), proxies=PROXIES) == "198.51.100.1"
+    # 여러 줄의 헤더는 이어서 봄
+    assert client_key(scope("127.0.0.1", "1.2.3.4", "198.51.100.9"), proxies=PROXIES) == "198.51.100.9"
+    # 모두 신뢰하는 프록시면 가장 왼쪽 주소
+    assert client_key(scope("127.0.0.1", "10.1.1.1, 10.2.2.2"), proxies=PROXIES) == "10.1.1.1"
+    assert client_key(scope("127.0.0.1"), proxies=PROXIES) == "127.0.0.1"
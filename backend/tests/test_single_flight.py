@@ -0,0 +1,114 @@
+"""single-flight: 같은 키의 동시 조회는 Riot 호출 한 번으로 병합 (프로세스 안, Redis 락으로 워커 간)"""
+import asyncio
+
+import aiohttp
+import pytest
+
+from cache_manager import AsyncCacheManager, LocalCache
+from single_flight import RedisSingleFlight
+from support import make_client, memory_cache, stub_server
+
+
+def fake_redis_server():
+    """워커들이 함께 쓰는 Redis (fakeredis). 락 해제 스크립트(EVAL)에 lupa가 필요하며, 없으면 테스트를 건너뜀"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeServer()
+
+
+def worker_cache(server) -> AsyncCacheManager:
+    """워커 하나의 캐시: 인메모리 계층은 따로, Redis(fakeredis)는 워커끼리 공유"""
+    import fakeredis
+
+    cache = AsyncCacheManager(local_cache=LocalCache())
+    cache.redis_client = fakeredis.FakeAsyncRedis(server=server)
+    return cache
+
+
+def test_concurrent_lookups_share_one_call():
+    async def scenario():
+        async with stub_server(latency=0.1) as (stats, base_url):
+            client = make_client(base_url)
+            async with aiohttp.ClientSession() as session:
+                puuids = await asyncio.gather(*(client.get_puuid_by_riot_id_async(session, "Popular", "KR1")
+                                                for _ in range(5)))
+                assert puuids == ["puuid-Popular-KR1"] * 5
+                assert stats["requests"] == 1
+                assert client.flight.inflight_count() == 0
+                # 끝난 뒤의 조회는 캐시 적중
+                assert await client.get_puuid_by_riot_id_async(session, "Popular", "KR1") == "puuid-Popular-KR1"
+                assert stats["requests"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_workers_share_result_not_cached_under_flight_key():
+    server = fake_redis_server()
+
+    async def scenario():
+        async with stub_server(latency=0.2) as (stats, base_url):
+            # 소환사 ID로 보는 관전 정보는 gameId 키로 캐시하거나(게임 중) 아무것도 캐시하지 않음(게임 중 아님)
+            first = make_client(base_url, cache=worker_cache(server))
+            second = make_client(base_url, cache=worker_cache(server))
+            async with aiohttp.ClientSession() as session:
+                results = await asyncio.gather(
+                    first.get_active_game_async(session, "sid-puuid-Idle-KR1"),
+                    second.get_active_game_async(session, "sid-puuid-Idle-KR1"),
+                    first.get_active_game_async(session, "sid-puuid-LiveAP0-KR1"),
+                    second.get_active_game_async(session, "sid-puuid-LiveAP0-KR1"))
+            assert results[:2] == [None, None]
+            assert results[2]["gameId"] == results[3]["gameId"]
+            assert stats["spectator"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_waiter_gets_published_result_instead_of_calling_again():
+    server = fake_redis_server()
+
+    async def scenario():
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {"synced": len(calls)}
+
+        first, second = RedisSingleFlight(worker_cache(server)), RedisSingleFlight(worker_cache(server))
+        assert await asyncio.gather(first.do("sync:p", fetch), second.do("sync:p", fetch)) == [{"synced": 1}] * 2
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_later_call_on_same_key_runs_its_own_work():
+    server = fake_redis_server()
+
+    async def scenario():
+        async with stub_server() as (stats, base_url):
+            client = make_client(base_url, cache=worker_cache(server))
+            async with aiohttp.ClientSession() as session:
+                first = await client.get_match_ids_async(session, "puuid-Pager-KR1", start=0, count=20)
+                # lock_ttl 안에 이어서 요청한 이전 페이지: 방금 끝난 첫 페이지 동기화의 결과를 재사용하지 않고 이어서 받음
+                older = await client.get_match_ids_async(session, "puuid-Pager-KR1", start=100, count=20)
+                assert first["count"] == older["count"] == 20
+                assert older["next_cursor"] == older["match_ids"][-1] and older["has_more"]
+                assert stats["requests"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_memory_only_cache_runs_each_worker_call():
+    async def scenario():
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return None
+
+        flight = RedisSingleFlight(memory_cache())
+        assert await flight.do("sync:p", fetch) is None
+        assert await flight.do("sync:p", fetch) is None
+        assert len(calls) == 2  # Redis가 없으면 결과를 남기지 않음 (끝난 호출의 결과를 다시 쓰지 않음)
+
+    asyncio.run(scenario())
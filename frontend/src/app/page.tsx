@@ -80,8 +80,15 @@ interface MatchDetail {
   queueType: string; // Add queueType
   gameDuration: number;
   my_stats: MyStats;
+  participants?: Participant[]; // 첫 화면 요청에서는 빠짐 (펼칠 때 /match-details로 조회)
+  teams?: TeamDetail[]; // Add teams data
+}
+
+// /match-details/{matchId} 응답 (참가자 10명 + 팀 상세)
+interface MatchBreakdown {
+  matchId: string;
   participants: Participant[];
-  teams: TeamDetail[]; // Add teams data
+  teams: TeamDetail[];
 }
 
 interface LeagueInfo {
@@ -108,10 +115,31 @@ interface AnalysisData {
   league: LeagueInfo[];
   total_matches?: number;
   match_ids?: string[];
-  analysis: Analysis;
+  has_more_matches?: boolean;
+  next_cursor?: string | null; // 다음 매치 페이지 커서 (?cursor=)
+  analysis?: Analysis; // 스트리밍 중에는 마지막에 도착
   match_details: MatchDetail[];
 }
 
+// /analyze-user/{id}/stream 이벤트 (NDJSON 한 줄에 하나)
+type StreamEvent =
+  | { type: 'user_info'; user_info: AnalysisData['user_info'] }
+  | ({ type: 'league' | 'page' } & Partial<AnalysisData>)
+  | { type: 'match'; index: number; match: MatchDetail }
+  | { type: 'analysis'; analysis: Analysis }
+  | { type: 'done'; server_timing?: string }
+  | { type: 'error'; error: string };
+
+const API_BASE = 'https://lol-ai-project.onrender.com';
+const MATCH_PAGE_SIZE = 10;
+// 매치 요약 카드에 필요한 필드만 요청 (참가자/팀 상세는 카드를 펼칠 때 따로 조회)
+const MATCH_CARD_FIELDS = ['matchId', 'gameMode', 'queueId', 'queueType', 'gameDuration', 'my_stats']
+  .map(field => `match_details.${field}`);
+const FIRST_SCREEN_FIELDS = [
+  'user_info', 'league', 'total_matches', 'analysis', 'has_more_matches', 'next_cursor', ...MATCH_CARD_FIELDS,
+].join(',');
+const MORE_MATCHES_FIELDS = ['has_more_matches', 'next_cursor', ...MATCH_CARD_FIELDS].join(',');
+
 // Helper 함수들 - 컴포넌트 외부 선언]
 const formatNumber = (num: number | undefined): string => (num ? num.toLocaleString() : '0');
 
@@ -229,11 +257,91 @@ export default function Home() {
   const [expandedMatchId, setExpandedMatchId] = useState<string | null>(null);
   const [loadingProgress, setLoadingProgress] = useState(0);
   const [loadingStage, setLoadingStage] = useState('');
-  const [visibleMatches, setVisibleMatches] = useState(10);
+  const [queriedId, setQueriedId] = useState(''); // 더보기 요청에 쓸 (인코딩된) Riot ID
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [breakdowns, setBreakdowns] = useState<Record<string, MatchBreakdown>>({});
 
-  // 매치 클릭 시 토글 함수
+  // 매치 클릭 시 토글 함수 (처음 펼칠 때 참가자/팀 상세를 조회)
   const toggleMatch = (id: string) => {
     setExpandedMatchId(prev => prev === id ? null : id);
+    if (expandedMatchId !== id && !breakdowns[id]) {
+      fetchBreakdown(id);
+    }
+  };
+
+  const fetchBreakdown = async (matchId: string) => {
+    try {
+      const res = await fetch(`${API_BASE}/match-details/${encodeURIComponent(matchId)}`);
+      const data = await res.json();
+      if (!data.error) {
+        setBreakdowns(prev => ({ ...prev, [matchId]: data }));
+      }
+    } catch (err) {
+      console.error("매치 상세 조회 실패:", err);
+    }
+  };
+
+  const handleStreamEvent = (event: StreamEvent) => {
+    switch (event.type) {
+      case 'user_info':
+        setAnalysis({ user_info: event.user_info, league: [], match_details: [] });
+        setLoadingProgress(20);
+        setLoadingStage('전적 불러오는 중...');
+        break;
+      case 'league':
+      case 'page': {
+        const { type: _eventType, ...fields } = event;
+        setAnalysis(prev => prev && { ...prev, ...fields });
+        break;
+      }
+      case 'match':
+        // 매치는 도착 순서대로 오므로 최신순 위치(index)에 넣음 (아직 도착하지 않은 앞자리는 빈 칸으로 남음)
+        setAnalysis(prev => {
+          if (!prev) return prev;
+          const matches = [...prev.match_details];
+          matches[event.index] = event.match;
+          return { ...prev, match_details: matches };
+        });
+        setLoadingProgress(prev => Math.min(prev + 6, 85));
+        setLoadingStage('AI 분석 중...');
+        break;
+      case 'analysis':
+        setAnalysis(prev => prev && { ...prev, analysis: event.analysis });
+        break;
+      case 'done':
+        // 가져오지 못한 매치 자리(빈 칸) 정리
+        setAnalysis(prev => prev && { ...prev, match_details: prev.match_details.filter(Boolean) });
+        setLoadingProgress(100);
+        break;
+      case 'error':
+        setError(event.error);
+        break;
+    }
+  };
+
+  // 더보기: 마지막 매치 다음 페이지를 커서로 조회해 뒤에 붙임
+  const fetchMoreMatches = async () => {
+    if (!analysis?.next_cursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const params = new URLSearchParams({ cursor: analysis.next_cursor, limit: String(MATCH_PAGE_SIZE), fields: MORE_MATCHES_FIELDS });
+      const res = await fetch(`${API_BASE}/analyze-user/${queriedId}?${params}`);
+      const data = await res.json();
+      if (data.error) {
+        setError(data.error);
+        return;
+      }
+      setAnalysis(prev => prev && {
+        ...prev,
+        match_details: [...prev.match_details, ...(data.match_details ?? [])],
+        has_more_matches: data.has_more_matches,
+        next_cursor: data.next_cursor,
+      });
+    } catch (err) {
+      setError("서버와 통신 중 오류가 발생했습니다.");
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
   const fetchAnalysis = async () => {
@@ -251,30 +359,32 @@ export default function Home() {
     try {
       const encodedId = encodeURIComponent(riotId);
 
-      // 진행 상황 시뮬레이션
-      const progressInterval = setInterval(() => {
-        setLoadingProgress(prev => {
-          if (prev < 30) return prev + 5;
-          if (prev < 60) return prev + 3;
-          if (prev < 90) return prev + 2;
-          return prev;
-        });
-      }, 200);
-
-      const res = await fetch(`https://lol-ai-project.onrender.com/analyze-user/${encodedId}`);
-      clearInterval(progressInterval);
-      setLoadingProgress(90);
-      setLoadingStage('데이터 분석 완료...');
-
-      const data = await res.json();
-      setLoadingProgress(100);
+      // 준비되는 대로 한 줄씩 오는 스트림을 받아 화면을 점진적으로 그림 (사용자 정보 -> 티어 -> 매치 -> AI 분석)
+      const params = new URLSearchParams({ limit: String(MATCH_PAGE_SIZE), fields: FIRST_SCREEN_FIELDS });
+      const res = await fetch(`${API_BASE}/analyze-user/${encodedId}/stream?${params}`);
+      if (!res.body || res.headers.get('content-type')?.includes('application/json')) {
+        // 스트림 시작 전 오류 (Riot ID 형식 등)
+        const data = await res.json();
+        setError(data.error ?? "서버와 통신 중 오류가 발생했습니다.");
+        return;
+      }
 
-      if (data.error) {
-        setError(data.error);
-      } else {
-        setAnalysis(data);
-        setExpandedMatchId(null);
-        setVisibleMatches(10); // 새 분석 시 보이는 매치 수 초기화
+      setQueriedId(encodedId);
+      setExpandedMatchId(null);
+      setBreakdowns({}); // 새 분석 시 펼쳐 본 매치 상세 초기화
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        for (const line of lines) {
+          if (line.trim()) handleStreamEvent(JSON.parse(line));
+        }
       }
     } catch (err) {
       setError("서버와 통신 중 오류가 발생했습니다.");
@@ -388,15 +498,20 @@ export default function Home() {
 
           {analysis && (
             <section className="mt-12 space-y-4">
-              <h3 className="text-2xl font-bold mb-6 text-gray-900 dark:text-gray-100">최근 20게임 상세 분석</h3>
+              <h3 className="text-2xl font-bold mb-6 text-gray-900 dark:text-gray-100">최근 게임 상세 분석</h3>
 
-              {analysis.match_details.slice(0, visibleMatches).map((match, matchIndex) => {
+              {/* 스트리밍 중에는 뒤 매치가 먼저 도착해 앞자리가 비어 있을 수 있으므로 채워진 칸만 그림 */}
+              {analysis.match_details.filter(Boolean).map((match, matchIndex) => {
                 const myStats = match.my_stats;
                 const matchKey = String(match.matchId ?? `match-${matchIndex}`);
+                // 참가자/팀 상세는 펼칠 때 조회한 값 (응답에 이미 있으면 그대로 사용)
+                const breakdown = breakdowns[matchKey];
+                const participants = breakdown?.participants ?? match.participants;
+                const teams = breakdown?.teams ?? match.teams;
 
                 // 팀별 데이터 분리 (순서 유지를 위해 filter 사용)
-                const blueTeam = match.participants.slice(0, 5);
-                const redTeam = match.participants.slice(5, 10);
+                const blueTeam = participants?.slice(0, 5) ?? [];
+                const redTeam = participants?.slice(5, 10) ?? [];
 
                 // 팀별 총 KDA 계산 함수
                 const getTeamKDA = (players: Participant[]) => {
@@ -444,9 +559,14 @@ export default function Home() {
                       </div>
                     )} */}
                     {/* [상세 드롭다운 테이블] */}
-                    {expandedMatchId === matchKey && (
+                    {expandedMatchId === matchKey && !participants && (
+                      <div className="bg-white dark:bg-gray-800 border-x border-b rounded-b-2xl p-4 text-center text-sm text-gray-500 dark:text-gray-400">
+                        상세 정보를 불러오는 중...
+                      </div>
+                    )}
+                    {expandedMatchId === matchKey && participants && (
                       <div className="bg-white dark:bg-gray-800 border-x border-b rounded-b-2xl overflow-hidden shadow-inner animate-in fade-in slide-in-from-top-2 duration-300">
-                        {match.teams?.map((team) => (
+                        {teams?.map((team) => (
                           <div key={team.teamId} className={`p-4 ${team.win ? 'bg-blue-50/50 dark:bg-blue-900/50' : 'bg-red-50/50 dark:bg-red-900/50'} border-b dark:border-gray-700`}>
                             <h4 className={`text-sm font-bold ${team.win ? 'text-blue-700 dark:text-blue-200' : 'text-red-700 dark:text-red-200'} mb-2`}>
                               {team.teamId === 100 ? '블루팀' : '레드팀'} — {team.win ? '승리' : '패배'}
@@ -492,7 +612,7 @@ export default function Home() {
                           </thead>
                           <tbody>
                             {/* 전체 참가자 10명을 순서대로 렌더링 */}
-                            {match.participants.map((p, idx) => {
+                            {participants.map((p, idx) => {
                               const isBlueTeam = idx < 5;
                               const isTeamFirstRow = idx === 0 || idx === 5;
                               const currentTeamPlayers = isBlueTeam ? blueTeam : redTeam;
@@ -594,17 +714,25 @@ export default function Home() {
             </section>
           )}
 
-          {analysis && analysis.match_details && analysis.match_details.length > visibleMatches && (
+          {analysis && analysis.has_more_matches && analysis.next_cursor && (
             <div className="mt-8 text-center">
               <button
-                onClick={() => setVisibleMatches(prev => prev + 10)}
-                className="px-8 py-3 rounded-lg font-bold text-white bg-gray-700 hover:bg-gray-800 transition-colors shadow-md"
+                onClick={fetchMoreMatches}
+                disabled={loadingMore}
+                className={`px-8 py-3 rounded-lg font-bold text-white transition-colors shadow-md ${loadingMore ? 'bg-gray-400' : 'bg-gray-700 hover:bg-gray-800'}`}
               >
-                더보기
+                {loadingMore ? '불러오는 중...' : '더보기'}
               </button>
             </div>
           )}
 
+          {!analysis.analysis && loading && (
+            <div className="p-6 bg-white border rounded-2xl shadow-sm text-center text-gray-500 dark:bg-gray-800 dark:border-gray-700 dark:text-gray-400">
+              AI 매크로/멘탈 진단 중...
+            </div>
+          )}
+
+          {analysis.analysis && (
           <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
             {/* 2. 매크로 분석 카드 */}
             <div className="p-6 bg-white border rounded-2xl shadow-lg border-t-4 border-t-blue-500 dark:bg-gray-800 dark:border-gray-700 dark:border-t-blue-700">
@@ -657,6 +785,7 @@ export default function Home() {
               </p>
             </div>
           </div>
+          )}
         </div>
       )}
     </div>